@@ -1,19 +1,74 @@
 from django.contrib import admin
+from django.db import transaction
+from django.urls import reverse
+from django.utils.html import format_html
+from django.utils.text import Truncator
+from utils import EstimatedCountPaginator, recount_comments
 
-from .constants import EXTRA_VALUE
+from .caching import purge_commented_pages
+from .constants import EXCERPT_WORDS, EXTRA_VALUE
+from .exports import export_response
 from .models import Category, Comment, Location, Post
+from .search import match_comments, match_posts
 
 
 class PostInline(admin.StackedInline):
+    """
+    Добавление публикаций со страницы категории
+    или местоположения. Существующие публикации
+    не выводятся: их может быть слишком много,
+    список доступен по ссылке posts_link.
+    """
     model = Post
     extra = EXTRA_VALUE
+    raw_id_fields = ('author', 'category', 'location')
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).none()
+
+
+class PostsLinkMixin:
+    """
+    Ссылка на постраничный список публикаций,
+    отфильтрованный по объекту.
+    """
+    readonly_fields = ('posts_link',)
+    posts_lookup = None
+
+    @admin.display(description='Публикации')
+    def posts_link(self, obj):
+        if obj.pk is None:
+            return None
+        return format_html(
+            '<a href="{}?{}={}">Список публикаций</a>',
+            reverse('admin:blog_post_changelist'),
+            self.posts_lookup,
+            obj.pk
+        )
+
+
+class ExportMixin:
+    """
+    Потоковая выгрузка выбранных объектов.
+    Для выгрузки только изменённых объектов
+    список фильтруется по updated_at.
+    """
+    actions = ('export_csv', 'export_jsonl')
+
+    @admin.action(description='Выгрузить в CSV')
+    def export_csv(self, request, queryset):
+        return export_response(queryset, 'csv')
+
+    @admin.action(description='Выгрузить в JSON Lines')
+    def export_jsonl(self, request, queryset):
+        return export_response(queryset, 'jsonl')
 
 
 @admin.register(Post)
-class PostAdmin(admin.ModelAdmin):
+class PostAdmin(ExportMixin, admin.ModelAdmin):
     list_display = (
         'title',
-        'text',
+        'excerpt',
         'pub_date',
         'is_published',
         'author',
@@ -22,25 +77,36 @@ class PostAdmin(admin.ModelAdmin):
     )
     list_editable = (
         'is_published',
-        'category',
     )
+    list_select_related = ('author', 'category', 'location')
+    autocomplete_fields = ('author', 'category', 'location')
     search_fields = ('title',)
-    list_filter = ('category',)
+    list_filter = ('category', 'updated_at')
     list_display_links = ('title',)
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+    def get_search_results(self, request, queryset, search_term):
+        """Поиск по полнотекстовому индексу заголовков и текстов."""
+        if not search_term:
+            return queryset, False
+        return match_posts(queryset, search_term), False
 
 
 @admin.register(Category)
-class CategoryAdmin(admin.ModelAdmin):
+class CategoryAdmin(PostsLinkMixin, admin.ModelAdmin):
     inlines = (
         PostInline,
     )
     list_display = (
         'title',
     )
+    search_fields = ('title',)
+    posts_lookup = 'category__id__exact'
 
 
 @admin.register(Location)
-class LocationAdmin(admin.ModelAdmin):
+class LocationAdmin(PostsLinkMixin, admin.ModelAdmin):
     inlines = (
         PostInline,
     )
@@ -54,18 +120,58 @@ class LocationAdmin(admin.ModelAdmin):
     )
     search_fields = ('name',)
     list_filter = ('created_at',)
+    posts_lookup = 'location__id__exact'
 
 
 @admin.register(Comment)
-class CommentAdmin(admin.ModelAdmin):
+class CommentAdmin(ExportMixin, admin.ModelAdmin):
     list_display = (
-        'text',
+        'short_text',
         'post',
         'author',
         'created_at'
     )
-    search_fields = ('author',)
-    list_filter = ('created_at',)
+    list_select_related = ('post', 'author')
+    autocomplete_fields = ('post', 'author')
+    search_fields = ('text',)
+    list_filter = ('created_at', 'updated_at')
+    date_hierarchy = 'created_at'
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+    def get_search_results(self, request, queryset, search_term):
+        """
+        Поиск по имени автора и по индексу
+        полнотекстового поиска текстов.
+        """
+        if not search_term:
+            return queryset, False
+        return match_comments(queryset, search_term), False
+
+    @admin.display(description='Текст комментария')
+    def short_text(self, obj):
+        return Truncator(obj.text).words(EXCERPT_WORDS)
+
+    def save_model(self, request, obj, form, change):
+        post_ids = {obj.post_id}
+        if change and 'post' in form.changed_data:
+            post_ids.add(form.initial['post'])
+        with transaction.atomic():
+            super().save_model(request, obj, form, change)
+            recount_comments(Post.objects.filter(pk__in=post_ids))
+
+    def delete_model(self, request, obj):
+        with transaction.atomic():
+            super().delete_model(request, obj)
+            recount_comments(Post.objects.filter(pk=obj.post_id))
+            purge_commented_pages((obj.post_id,))
+
+    def delete_queryset(self, request, queryset):
+        post_ids = set(queryset.values_list('post_id', flat=True))
+        with transaction.atomic():
+            super().delete_queryset(request, queryset)
+            recount_comments(Post.objects.filter(pk__in=post_ids))
+            purge_commented_pages(post_ids)
 
 
 admin.site.empty_value_display = 'Не задано'
@@ -0,0 +1,299 @@
+import hashlib
+import time
+from datetime import datetime, timedelta
+from functools import wraps
+from uuid import uuid4
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Min
+from django.utils import timezone
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from django.views.decorators.http import condition
+
+from .constants import FEED_COUNT_TIMEOUT
+from .models import Category, Post, User
+
+FEED_COUNT_GENERATION_KEY = 'feed_count:generation'
+PAGE_CACHE_GENERATION_KEY = 'page_cache:generation'
+PAGE_CACHE_PARAMS = ('page', 'after', 'before')
+
+
+def _feed_count_generation():
+    """
+    Поколение кэша счётчиков лент.
+    Смена поколения сбрасывает счётчики всех лент сразу.
+    """
+    return cache.get_or_set(
+        FEED_COUNT_GENERATION_KEY, uuid4().hex, timeout=None
+    )
+
+
+def feed_count_key(feed, pk=None, owner=False):
+    """
+    Ключ кэша количества публикаций в ленте:
+    общей ('global'), категории ('category')
+    или автора ('author').
+    """
+    key = f'feed_count:{_feed_count_generation()}:{feed}'
+    if pk is not None:
+        key = f'{key}:{pk}'
+    if owner:
+        key = f'{key}:owner'
+    return key
+
+
+def publication_timeout(timeout):
+    """
+    Время жизни закэшированных данных лент.
+    Не превышает времени до ближайшей
+    отложенной публикации.
+    """
+    now = timezone.now()
+    next_pub_date = Post.objects.filter(
+        is_published=True, pub_date__gt=now
+    ).aggregate(next_pub_date=Min('pub_date'))['next_pub_date']
+    if next_pub_date is None:
+        return timeout
+    return min(
+        timeout, max(int((next_pub_date - now).total_seconds()) + 1, 1)
+    )
+
+
+def feed_count_timeout():
+    """Время жизни счётчика ленты."""
+    return publication_timeout(FEED_COUNT_TIMEOUT)
+
+
+def invalidate_feed_counts(category_ids=(), author_ids=()):
+    """
+    Сброс счётчиков общей ленты и лент
+    переданных категорий и авторов.
+    """
+    keys = [feed_count_key('global')]
+    keys.extend(
+        feed_count_key('category', pk)
+        for pk in set(category_ids) if pk is not None
+    )
+    for pk in set(author_ids):
+        keys.append(feed_count_key('author', pk))
+        keys.append(feed_count_key('author', pk, owner=True))
+    cache.delete_many(keys)
+
+
+def invalidate_all_feed_counts():
+    """Сброс счётчиков всех лент."""
+    cache.set(FEED_COUNT_GENERATION_KEY, uuid4().hex, timeout=None)
+
+
+def _page_cache_version_key(group):
+    return f'page_cache_version:{group}'
+
+
+def _page_version_token():
+    """Версия группы страниц — время её последнего изменения."""
+    return f'{time.time():.6f}'
+
+
+def page_versions(group):
+    """
+    Поколение кэша страниц и версия группы.
+    Отсутствующие в кэше версии считаются
+    изменёнными в текущий момент.
+    """
+    keys = (PAGE_CACHE_GENERATION_KEY, _page_cache_version_key(group))
+    versions = cache.get_many(keys)
+    missing = {
+        key: _page_version_token() for key in keys if key not in versions
+    }
+    if missing:
+        cache.set_many(missing, timeout=None)
+        versions.update(missing)
+    return tuple(versions[key] for key in keys)
+
+
+def page_cache_key(request, group):
+    """
+    Ключ кэша страницы: группа страниц с её версией,
+    путь и параметры пагинации запроса.
+    """
+    generation, version = page_versions(group)
+    params = '&'.join(
+        f'{name}={request.GET[name]}'
+        for name in PAGE_CACHE_PARAMS if name in request.GET
+    )
+    url_hash = hashlib.md5(
+        f'{request.path}?{params}'.encode()
+    ).hexdigest()
+    return f'page_cache:{generation}:{group}:{version}:{url_hash}'
+
+
+def cache_anonymous_page(group):
+    """
+    Декоратор кэширования страниц для анонимных пользователей.
+    `group` — шаблон имени группы страниц, например 'post:{pk}',
+    по которому страницы сбрасываются при изменении контента.
+    Включается настройкой BLOG_PAGE_CACHE_TIMEOUT.
+    """
+    def decorator(view_func):
+        @wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            timeout = settings.BLOG_PAGE_CACHE_TIMEOUT
+            if (
+                not timeout
+                or request.method not in ('GET', 'HEAD')
+                or request.user.is_authenticated
+            ):
+                response = view_func(request, *args, **kwargs)
+                patch_vary_headers(response, ('Cookie',))
+                if request.user.is_authenticated:
+                    patch_cache_control(response, private=True)
+                return response
+
+            key = page_cache_key(request, group.format(**kwargs))
+            response = cache.get(key)
+            if response is not None:
+                return response
+
+            def store(response):
+                if (
+                    response.status_code != 200
+                    or response.cookies
+                    or request.META.get('CSRF_COOKIE_USED')
+                ):
+                    return
+                page_timeout = publication_timeout(timeout)
+                patch_cache_control(
+                    response, public=True, max_age=page_timeout
+                )
+                cache.set(key, response, page_timeout)
+
+            response = view_func(request, *args, **kwargs)
+            patch_vary_headers(response, ('Cookie',))
+            if getattr(response, 'is_rendered', True):
+                store(response)
+            else:
+                response.add_post_render_callback(store)
+            return response
+        return wrapper
+    return decorator
+
+
+def _version_stamp(token):
+    """Время изменения по версии группы страниц."""
+    return datetime.fromtimestamp(float(token), tz=timezone.utc)
+
+
+def conditional_page(group, state):
+    """
+    Декоратор условных GET-запросов.
+    ETag и Last-Modified вычисляются по версиям группы
+    страниц `group` (как в cache_anonymous_page), которые
+    сигналы сдвигают при каждом изменении показанных
+    данных, в том числе при удалении и снятии с публикации,
+    и по `state(request, **kwargs)` — словарю из запроса
+    одной строки по индексу с тем, что меняется без
+    сигналов (наступившие даты публикации); None —
+    страницы нет. ETag авторизованных пользователей
+    зависит ещё и от сессии и CSRF-токена в формах
+    страницы, а Last-Modified им не отдаётся.
+    """
+    def page_state(request, kwargs):
+        if not hasattr(request, '_page_state'):
+            values = state(request, **kwargs)
+            request._page_state = values and (
+                page_versions(group.format(**kwargs)), values
+            )
+        return request._page_state
+
+    def etag(request, *args, **kwargs):
+        page = page_state(request, kwargs)
+        if not page:
+            return None
+        versions, values = page
+        parts = [*versions, *(str(values[name]) for name in sorted(values))]
+        if request.user.is_authenticated:
+            parts.extend((
+                str(request.user.pk),
+                request.session.session_key or '',
+                request.META.get('CSRF_COOKIE', ''),
+            ))
+        else:
+            parts.append('anonymous')
+        for name in PAGE_CACHE_PARAMS:
+            parts.append(request.GET.get(name, ''))
+        return hashlib.md5(':'.join(parts).encode()).hexdigest()
+
+    def last_modified(request, *args, **kwargs):
+        page = page_state(request, kwargs)
+        if request.user.is_authenticated or not page:
+            return None
+        versions, values = page
+        stamp = max(
+            *(_version_stamp(version) for version in versions),
+            *(value for value in values.values()
+              if isinstance(value, datetime)),
+        )
+        # Last-Modified точен до секунды: отметка текущей секунды
+        # не отдаётся, иначе изменение в ту же секунду
+        # не отличить по If-Modified-Since.
+        if stamp > timezone.now() - timedelta(seconds=1):
+            return None
+        return stamp
+
+    return condition(etag_func=etag, last_modified_func=last_modified)
+
+
+def purge_pages(groups):
+    """Сброс кэша и версий страниц переданных групп."""
+    cache.set_many(
+        {
+            _page_cache_version_key(group): _page_version_token()
+            for group in groups
+        },
+        timeout=None
+    )
+
+
+def purge_post_pages(post_ids, category_ids=(), author_ids=()):
+    """
+    Сброс кэша ленты, страниц категорий, профилей
+    авторов и страниц переданных публикаций.
+    """
+    groups = {'index'}
+    groups.update(f'post:{pk}' for pk in post_ids)
+    category_ids = set(category_ids) - {None}
+    if category_ids:
+        groups.update(
+            f'category:{slug}' for slug in Category.objects.filter(
+                pk__in=category_ids
+            ).values_list('slug', flat=True)
+        )
+    author_ids = set(author_ids) - {None}
+    if author_ids:
+        groups.update(
+            f'profile:{username}' for username in User.objects.filter(
+                pk__in=author_ids
+            ).values_list('username', flat=True)
+        )
+    purge_pages(groups)
+
+
+def purge_commented_pages(post_ids):
+    """
+    Сброс страниц публикаций с изменившимися
+    комментариями и лент, где показано их количество.
+    """
+    feeds = list(Post.objects.filter(pk__in=post_ids).values_list(
+        'category_id', 'author_id'
+    ))
+    purge_post_pages(
+        post_ids,
+        category_ids=[category_id for category_id, _ in feeds],
+        author_ids=[author_id for _, author_id in feeds],
+    )
+
+
+def purge_all_pages():
+    """Сброс кэша и версий всех страниц."""
+    cache.set(PAGE_CACHE_GENERATION_KEY, _page_version_token(), timeout=None)
@@ -0,0 +1,29 @@
+from django.conf import settings
+from django.core.checks import Error, Tags, Warning, register
+
+LOCAL_CACHE_BACKEND = 'django.core.cache.backends.locmem.LocMemCache'
+
+
+@register(Tags.caches)
+def check_shared_cache(app_configs, **kwargs):
+    """
+    Кэш процесса не видит сброса, выполненного в другом
+    процессе: счётчики лент устаревают, а кэш страниц
+    отдаёт устаревшие страницы.
+    """
+    backend = settings.CACHES.get('default', {}).get('BACKEND')
+    if backend != LOCAL_CACHE_BACKEND:
+        return []
+    if settings.BLOG_PAGE_CACHE_TIMEOUT:
+        return [Error(
+            'Кэш страниц блога требует общего для процессов кэша.',
+            hint='Укажите в CACHES общий кэш или отключите'
+            ' BLOG_PAGE_CACHE_TIMEOUT.',
+            id='blog.E001',
+        )]
+    return [Warning(
+        'Счётчики лент хранятся в кэше процесса и не сбрасываются'
+        ' при изменениях из других процессов.',
+        hint='Укажите в CACHES общий для процессов кэш.',
+        id='blog.W001',
+    )]
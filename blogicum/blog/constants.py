@@ -4,5 +4,50 @@ MAX_FIELD_LENGTH: int = 256
 """Количество записей на одной странице."""
 POSTS_ON_THE_PAGE: int = 10
 
+"""Количество слов в анонсе публикации."""
+EXCERPT_WORDS: int = 10
+
+"""Количество комментариев, загружаемых за один раз."""
+COMMENTS_ON_THE_PAGE: int = 10
+
 """Количество отображаемых пустых форм в админ-зоне."""
 EXTRA_VALUE: int = 0
+
+"""Количество страниц, до которого используется нумерованная пагинация."""
+NUMBERED_PAGES_LIMIT: int = 10
+
+"""Время хранения количества публикаций ленты в кэше, секунд."""
+FEED_COUNT_TIMEOUT: int = 15 * 60
+
+"""Ширины копий изображения публикации, пикселей."""
+IMAGE_RENDITION_WIDTHS: tuple = (320, 640, 1280)
+
+"""Ширина изображения в карточке публикации, пикселей."""
+IMAGE_CARD_WIDTH: int = 640
+
+"""Форматы копий изображения: расширение — (формат Pillow, параметры)."""
+IMAGE_RENDITION_FORMATS: dict = {
+    'webp': ('WEBP', {'quality': 80, 'method': 6}),
+    'jpg': ('JPEG', {'quality': 85, 'optimize': True, 'progressive': True}),
+}
+
+"""Максимальное количество слов в поисковом запросе."""
+SEARCH_MAX_TERMS: int = 8
+
+"""Длина фрагмента текста в результатах поиска, слов."""
+SEARCH_SNIPPET_TOKENS: int = 16
+
+"""Количество строк, с которого списки админки берут оценку количества."""
+ESTIMATED_COUNT_THRESHOLD: int = 100_000
+
+"""Количество строк, читаемых из базы за раз при выгрузке."""
+EXPORT_CHUNK_SIZE: int = 2000
+
+"""Количество объектов модели, вставляемых одним пакетом при загрузке."""
+IMPORT_BATCH_SIZE: int = 1000
+
+"""Размер части файла, читаемой за раз при загрузке, символов."""
+IMPORT_READ_SIZE: int = 64 * 1024
+
+"""Наибольший размер одного элемента выгрузки, символов."""
+IMPORT_MAX_ITEM_SIZE: int = 16 * 1024 * 1024
@@ -0,0 +1,109 @@
+import posixpath
+from io import BytesIO
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from PIL import Image, ImageOps
+
+from .constants import IMAGE_RENDITION_FORMATS, IMAGE_RENDITION_WIDTHS
+
+RENDITIONS_DIR = 'renditions'
+
+# Тег EXIF с ориентацией: значения 5–8 поворачивают
+# изображение на 90°, меняя местами ширину и высоту.
+EXIF_ORIENTATION = 0x0112
+ROTATED_ORIENTATIONS = (5, 6, 7, 8)
+
+
+def rendition_name(name, width, extension):
+    """
+    Имя файла копии изображения заданной ширины:
+    post_images/renditions/<имя>-<ширина>.<расширение>.
+    """
+    directory, filename = posixpath.split(name)
+    stem = posixpath.splitext(filename)[0]
+    return posixpath.join(
+        directory, RENDITIONS_DIR, f'{stem}-{width}.{extension}'
+    )
+
+
+def rendition_widths(source_width):
+    """
+    Ширины копий изображения шириной `source_width`:
+    ширины IMAGE_RENDITION_WIDTHS меньше исходной
+    и сама исходная, если она меньше наибольшей, —
+    иначе лучшим кандидатом srcset была бы
+    копия меньше оригинала.
+    """
+    widths = [
+        width for width in IMAGE_RENDITION_WIDTHS if width < source_width
+    ]
+    if source_width < max(IMAGE_RENDITION_WIDTHS):
+        widths.append(source_width)
+    return widths
+
+
+def _upright_width(image):
+    """Ширина изображения с учётом поворота из EXIF."""
+    if image.getexif().get(EXIF_ORIENTATION) in ROTATED_ORIENTATIONS:
+        return image.height
+    return image.width
+
+
+def _encode(image, pil_format, **options):
+    if pil_format == 'JPEG' and image.mode != 'RGB':
+        image = image.convert('RGB')
+    buffer = BytesIO()
+    image.save(buffer, pil_format, **options)
+    return ContentFile(buffer.getvalue())
+
+
+def generate_renditions(image_file, storage=default_storage):
+    """
+    Создаёт копии изображения ширин rendition_widths
+    во всех форматах IMAGE_RENDITION_FORMATS.
+    Изображение не увеличивается.
+    Возвращает список ширин созданных копий.
+    """
+    try:
+        image_file.open('rb')
+        with Image.open(image_file) as source:
+            source = ImageOps.exif_transpose(source)
+            if source.mode not in ('RGB', 'RGBA'):
+                source = source.convert('RGBA')
+            widths = []
+            for width in rendition_widths(source.width):
+                height = max(round(source.height * width / source.width), 1)
+                resized = source.resize(
+                    (width, height), Image.Resampling.LANCZOS
+                )
+                for extension, (pil_format, options) in (
+                    IMAGE_RENDITION_FORMATS.items()
+                ):
+                    name = rendition_name(image_file.name, width, extension)
+                    storage.delete(name)
+                    storage.save(name, _encode(resized, pil_format, **options))
+                widths.append(width)
+    except (OSError, ValueError):
+        return []
+    finally:
+        image_file.close()
+    return widths
+
+
+def delete_renditions(name, storage=default_storage):
+    """
+    Удаляет все копии изображения `name`.
+    Ширина копии по исходной ширине читается
+    из заголовка ещё не удалённого оригинала.
+    """
+    widths = set(IMAGE_RENDITION_WIDTHS)
+    try:
+        with storage.open(name, 'rb') as image_file:
+            with Image.open(image_file) as source:
+                widths.update(rendition_widths(_upright_width(source)))
+    except (OSError, ValueError):
+        pass
+    for width in widths:
+        for extension in IMAGE_RENDITION_FORMATS:
+            storage.delete(rendition_name(name, width, extension))
@@ -0,0 +1,279 @@
+import json
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+from core.jobs import enqueue
+from django.core.management.color import no_style
+from django.core.serializers.python import Deserializer
+from django.db import connection
+from utils import actual_comment_count
+
+from .constants import (IMPORT_BATCH_SIZE, IMPORT_MAX_ITEM_SIZE,
+                        IMPORT_READ_SIZE)
+from .models import Category, Comment, Location, Post, User
+from .search import rebuild_index, uses_fts
+from .signals import RECEIVERS
+
+# Модели в порядке загрузки: каждая ссылается только на предыдущие.
+IMPORT_MODELS = (Category, Location, User, Post, Comment)
+IMPORT_LABELS = {model._meta.label_lower: model for model in IMPORT_MODELS}
+
+JSON_WHITESPACE = ' \t\n\r'
+
+
+def _skip_whitespace(stream, buffer, position, chunk_size):
+    """
+    Пропуск пробелов с дочитыванием потока.
+    Возвращает буфер и позицию первого значимого символа.
+    """
+    while True:
+        while position < len(buffer) and buffer[position] in JSON_WHITESPACE:
+            position += 1
+        if position < len(buffer):
+            return buffer, position
+        buffer, position = stream.read(chunk_size), 0
+        if not buffer:
+            raise ValueError('Неожиданный конец JSON-массива.')
+
+
+def iter_json_array(
+    stream, chunk_size=IMPORT_READ_SIZE, max_item_size=IMPORT_MAX_ITEM_SIZE
+):
+    """
+    Элементы JSON-массива из потока по одному.
+    Поток читается частями по `chunk_size` символов,
+    в памяти держится только недоразобранный хвост.
+    Хвост длиннее `max_item_size` символов считается
+    повреждённым элементом: иначе ошибка в одном элементе
+    заставила бы дочитать в память весь файл.
+    """
+    decoder = json.JSONDecoder()
+    buffer, position = _skip_whitespace(stream, '', 0, chunk_size)
+    if buffer[position] != '[':
+        raise ValueError('Ожидается JSON-массив объектов.')
+    buffer, position = _skip_whitespace(
+        stream, buffer, position + 1, chunk_size
+    )
+    if buffer[position] == ']':
+        return
+    while True:
+        try:
+            item, position = decoder.raw_decode(buffer, position)
+        except json.JSONDecodeError:
+            if len(buffer) - position > max_item_size:
+                raise
+            chunk = stream.read(chunk_size)
+            if not chunk:
+                raise
+            buffer, position = buffer[position:] + chunk, 0
+            continue
+        yield item
+        buffer, position = _skip_whitespace(
+            stream, buffer, position, chunk_size
+        )
+        if buffer[position] == ']':
+            return
+        if buffer[position] != ',':
+            raise ValueError(
+                f'Ожидается «,» или «]», получено «{buffer[position]}».'
+            )
+        buffer, position = _skip_whitespace(
+            stream, buffer, position + 1, chunk_size
+        )
+
+
+@contextmanager
+def muted_signals():
+    """
+    Отключение обработчиков сигналов приложения
+    (blog.signals) на время загрузки. Обработчики
+    других приложений продолжают работать.
+    Действует на весь процесс, поэтому
+    предназначено только для команд загрузки.
+    """
+    for signal, func, sender in RECEIVERS:
+        signal.disconnect(func, sender=sender)
+    try:
+        yield
+    finally:
+        for signal, func, sender in RECEIVERS:
+            signal.connect(func, sender=sender)
+
+
+def _drop_schema_objects(models, object_type, exclude=()):
+    """
+    Удаление объектов схемы SQLite типа `object_type`
+    ('index' или 'trigger') у таблиц моделей, кроме
+    уникальных индексов, автоиндексов ограничений
+    и объектов с именами из `exclude`.
+    Возвращает команды их создания из sqlite_master.
+    """
+    if not uses_fts():
+        return []
+    tables = [model._meta.db_table for model in models]
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT name, sql FROM sqlite_master WHERE type = %s'
+            " AND sql IS NOT NULL AND sql NOT LIKE 'CREATE UNIQUE %%'"
+            f" AND tbl_name IN ({', '.join(['%s'] * len(tables))})",
+            [object_type, *tables]
+        )
+        objects = [
+            (name, sql) for name, sql in cursor.fetchall()
+            if name not in exclude
+        ]
+        for name, _ in objects:
+            cursor.execute(f'DROP {object_type.upper()} "{name}"')
+    return [sql for _, sql in objects]
+
+
+@contextmanager
+def disabled_indexes(models, schema_editor):
+    """
+    Удаление индексов моделей на время загрузки:
+    Meta.indexes, а на SQLite ещё индексов полей с db_index
+    и внешних ключей и триггеров поискового индекса.
+    Уникальные индексы и первичные ключи остаются:
+    они проверяют данные выгрузки.
+    Индексы создаются заново одним проходом и при ошибке,
+    поисковый индекс перестраивается целиком.
+    `schema_editor` — открытый редактор схемы: его транзакция
+    охватывает загрузку, и при ошибке удаление индексов
+    откатывается вместе с данными.
+    """
+    meta_names = {
+        index.name for model in models for index in model._meta.indexes
+    }
+    triggers = _drop_schema_objects(models, 'trigger')
+    field_indexes = _drop_schema_objects(models, 'index', exclude=meta_names)
+    for model in models:
+        for index in model._meta.indexes:
+            schema_editor.remove_index(model, index)
+    try:
+        yield
+    finally:
+        for model in models:
+            for index in model._meta.indexes:
+                schema_editor.add_index(model, index)
+        with connection.cursor() as cursor:
+            for sql in field_indexes + triggers:
+                cursor.execute(sql)
+    if triggers:
+        rebuild_index()
+
+
+class BulkImporter:
+    """
+    Пакетная загрузка объектов выгрузки dumpdata.
+    Объекты копятся по моделям и вставляются пакетами
+    по `batch_size`; перед пакетом модели вставляются
+    накопленные объекты моделей, на которые она ссылается.
+    Даты created_at и updated_at сохраняются
+    из выгрузки, как при loaddata.
+    """
+
+    def __init__(self, batch_size=IMPORT_BATCH_SIZE):
+        self.batch_size = batch_size
+        self.buffers = {model: [] for model in IMPORT_MODELS}
+        self.counts = Counter()
+        self.seconds = Counter()
+        self.skipped = Counter()
+        self.skipped_m2m = 0
+        self.commented_post_ids = set()
+        self.image_posts = []
+
+    def load(self, items):
+        """Загрузка элементов выгрузки; возвращает число объектов."""
+        wanted = self._filter(items)
+        for deserialized in Deserializer(wanted, ignorenonexistent=True):
+            self.add(deserialized)
+        for model in IMPORT_MODELS:
+            self._insert(model)
+        return sum(self.counts.values())
+
+    def _filter(self, items):
+        for item in items:
+            if item.get('model', '').lower() in IMPORT_LABELS:
+                yield item
+            else:
+                self.skipped[item.get('model')] += 1
+
+    def add(self, deserialized):
+        instance = deserialized.object
+        model = type(instance)
+        if any(deserialized.m2m_data.values()):
+            self.skipped_m2m += 1
+        self._prepare(instance)
+        buffer = self.buffers[model]
+        buffer.append(instance)
+        if len(buffer) >= self.batch_size:
+            for dependency in IMPORT_MODELS[:IMPORT_MODELS.index(model)]:
+                self._insert(dependency)
+            self._insert(model)
+
+    def _prepare(self, instance):
+        """
+        Заполняет то, что обычно делает save():
+        автоматические даты, отсутствующие в выгрузке,
+        анонс и HTML текста публикации.
+        """
+        for field in instance._meta.concrete_fields:
+            if (
+                (getattr(field, 'auto_now', False)
+                 or getattr(field, 'auto_now_add', False))
+                and getattr(instance, field.attname) is None
+            ):
+                setattr(instance, field.attname, field.pre_save(
+                    instance, add=True
+                ))
+        if isinstance(instance, Post):
+            instance.render_text()
+            instance.comment_count = 0
+            instance.image_renditions = []
+            if instance.image:
+                self.image_posts.append((instance.pk, instance.image.name))
+        elif isinstance(instance, Comment):
+            self.commented_post_ids.add(instance.post_id)
+
+    def _insert(self, model):
+        objs = self.buffers[model]
+        if not objs:
+            return
+        started = time.perf_counter()
+        fields = model._meta.concrete_fields
+        batch_size = min(
+            self.batch_size,
+            max(connection.ops.bulk_batch_size(fields, objs), 1)
+        )
+        manager = model._base_manager
+        for start in range(0, len(objs), batch_size):
+            manager._insert(
+                objs[start:start + batch_size], fields=fields, raw=True
+            )
+        self.seconds[model] += time.perf_counter() - started
+        self.counts[model] += len(objs)
+        self.buffers[model] = []
+
+    def finish(self):
+        """
+        Пересчёт счётчиков комментариев, сдвиг
+        последовательностей первичных ключей и постановка
+        в очередь копий изображений загруженных публикаций.
+        """
+        post_ids = sorted(self.commented_post_ids)
+        for start in range(0, len(post_ids), self.batch_size):
+            Post.objects.filter(
+                pk__in=post_ids[start:start + self.batch_size]
+            ).update(comment_count=actual_comment_count())
+        with connection.cursor() as cursor:
+            for sql in connection.ops.sequence_reset_sql(
+                no_style(), [model for model in IMPORT_MODELS
+                             if self.counts[model]]
+            ):
+                cursor.execute(sql)
+        for post_id, image in self.image_posts:
+            enqueue(
+                'blog.generate_image_renditions',
+                {'post_id': post_id, 'image': image}
+            )
@@ -0,0 +1,183 @@
+import json
+import subprocess
+import time
+from statistics import median
+
+from blog.models import Comment, Post
+from blog.urls import urlpatterns
+from core.instrumentation import collect_timings, percentile
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client
+from django.urls import reverse
+from django.utils import timezone
+
+
+def current_commit():
+    try:
+        return subprocess.run(
+            ('git', 'rev-parse', '--short', 'HEAD'),
+            capture_output=True, text=True, check=True,
+            cwd=settings.BASE_DIR,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+class Command(BaseCommand):
+    """
+    Нагрузочный тест всех адресов приложения blog:
+    задержка (перцентили), пропускная способность
+    и количество запросов к базе для анонимного
+    пользователя и автора публикации.
+    Результаты дописываются в BENCHMARK_RESULTS
+    с хэшем текущего коммита для сравнения.
+    """
+    help = 'Замеряет задержку и пропускную способность страниц blog.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--requests',
+            type=int,
+            default=50,
+            help='Количество замеряемых запросов к каждому адресу.'
+        )
+        parser.add_argument(
+            '--warmup',
+            type=int,
+            default=5,
+            help='Количество запросов прогрева перед замером.'
+        )
+        parser.add_argument(
+            '--cold',
+            action='store_true',
+            help='Очищать кэш перед каждым запросом.'
+        )
+        parser.add_argument('--label', default='')
+        parser.add_argument(
+            '--output',
+            default=None,
+            help='Файл результатов, по умолчанию BENCHMARK_RESULTS.'
+        )
+        parser.add_argument(
+            '--compare',
+            default=None,
+            metavar='COMMIT',
+            help='Сравнить p50 с результатами указанного коммита.'
+        )
+
+    def handle(self, *args, **options):
+        post = Post.objects.filter(
+            is_published=True,
+            category__is_published=True,
+            pub_date__lte=timezone.now(),
+        ).order_by('-comment_count', '-pk').select_related(
+            'author', 'category'
+        ).first()
+        if post is None:
+            raise CommandError(
+                'Нет опубликованных записей: заполните базу командой'
+                ' generate_data.'
+            )
+        comment = (
+            Comment.objects.filter(post=post, author=post.author).first()
+            or Comment.objects.filter(post=post).first()
+        )
+        url_kwargs = {
+            'pk': post.pk,
+            'category_slug': post.category.slug,
+            'username': post.author.username,
+            'comment_id': comment.pk if comment else 0,
+        }
+        author = Client(HTTP_HOST=settings.ALLOWED_HOSTS[0])
+        author.force_login(post.author)
+        clients = {
+            'anonymous': Client(HTTP_HOST=settings.ALLOWED_HOSTS[0]),
+            'author': author,
+        }
+
+        commit = current_commit()
+        results = []
+        for pattern in urlpatterns:
+            path = reverse(f'blog:{pattern.name}', kwargs={
+                name: url_kwargs[name] for name in pattern.pattern.converters
+            })
+            if pattern.name == 'search':
+                path = f'{path}?q=город'
+            for role, client in clients.items():
+                result = self.measure(client, path, options)
+                result.update(
+                    commit=commit,
+                    label=options['label'],
+                    time=timezone.now().isoformat(),
+                    url_name=pattern.name,
+                    role=role,
+                )
+                results.append(result)
+                self.stdout.write(
+                    f'{pattern.name:16} {role:9} {result["status"]}'
+                    f' p50={result["p50_ms"]:.1f}ms'
+                    f' p95={result["p95_ms"]:.1f}ms'
+                    f' {result["rps"]:.0f} rps'
+                    f' {result["queries"]} queries'
+                )
+
+        output = options['output'] or settings.BENCHMARK_RESULTS
+        if options['compare']:
+            self.compare(output, options['compare'], results)
+        with open(output, 'a', encoding='utf-8') as log:
+            for result in results:
+                log.write(json.dumps(result, ensure_ascii=False) + '\n')
+
+    def measure(self, client, path, options):
+        for _ in range(options['warmup']):
+            client.get(path)
+        durations = []
+        queries = []
+        started = time.perf_counter()
+        for _ in range(options['requests']):
+            if options['cold']:
+                cache.clear()
+            start = time.perf_counter()
+            with collect_timings() as timings:
+                response = client.get(path)
+            durations.append((time.perf_counter() - start) * 1000)
+            queries.append(timings.queries)
+        elapsed = time.perf_counter() - started
+        return {
+            'path': path,
+            'status': response.status_code,
+            'requests': options['requests'],
+            'p50_ms': percentile(durations, 50),
+            'p95_ms': percentile(durations, 95),
+            'max_ms': max(durations),
+            'rps': options['requests'] / elapsed,
+            'queries': median(queries),
+        }
+
+    def compare(self, output, commit, results):
+        """Сравнение с последним прогоном коммита `commit`."""
+        baseline = {}
+        try:
+            with open(output, encoding='utf-8') as log:
+                for line in log:
+                    sample = json.loads(line)
+                    if sample['commit'] == commit:
+                        baseline[sample['url_name'], sample['role']] = sample
+        except OSError:
+            pass
+        if not baseline:
+            self.stderr.write(f'Нет результатов для коммита {commit}.')
+            return
+        self.stdout.write(f'Сравнение p50 с {commit}:')
+        for result in results:
+            before = baseline.get((result['url_name'], result['role']))
+            if before is None:
+                continue
+            change = (result['p50_ms'] / before['p50_ms'] - 1) * 100
+            self.stdout.write(
+                f'{result["url_name"]:16} {result["role"]:9}'
+                f' {before["p50_ms"]:.1f} → {result["p50_ms"]:.1f}ms'
+                f' ({change:+.0f}%)'
+            )
@@ -0,0 +1,127 @@
+import asyncio
+import importlib
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from blog.models import Post
+from blog.urls import urlpatterns
+from core.instrumentation import percentile
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.test import AsyncClient, Client, override_settings
+from django.urls import clear_url_caches, reverse
+from django.utils import timezone
+
+URL_NAMES = ('index', 'post_detail', 'category_posts', 'profile')
+
+
+def reload_urlconf():
+    """Пересборка маршрутов после смены ASYNC_VIEWS."""
+    clear_url_caches()
+    importlib.reload(importlib.import_module('blog.urls'))
+    importlib.reload(importlib.import_module(settings.ROOT_URLCONF))
+
+
+class Command(BaseCommand):
+    """
+    Сравнение пропускной способности лент и страницы публикации
+    при одновременных запросах под WSGI (синхронные представления
+    в пуле потоков) и под ASGI (асинхронные представления,
+    ASYNC_VIEWS). Обработчики Django вызываются в процессе,
+    без сетевого сервера.
+    """
+    help = 'Сравнивает пропускную способность под WSGI и ASGI.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--requests',
+            type=int,
+            default=200,
+            help='Количество запросов к каждому адресу.'
+        )
+        parser.add_argument(
+            '--concurrency',
+            type=int,
+            default=16,
+            help='Количество одновременных запросов.'
+        )
+
+    def handle(self, *args, **options):
+        post = Post.objects.filter(
+            is_published=True,
+            category__is_published=True,
+            pub_date__lte=timezone.now(),
+        ).order_by('-comment_count', '-pk').select_related(
+            'author', 'category'
+        ).first()
+        if post is None:
+            raise CommandError(
+                'Нет опубликованных записей: заполните базу командой'
+                ' generate_data.'
+            )
+        url_kwargs = {
+            'pk': post.pk,
+            'category_slug': post.category.slug,
+            'username': post.author.username,
+        }
+        paths = {
+            pattern.name: reverse(f'blog:{pattern.name}', kwargs={
+                name: url_kwargs[name] for name in pattern.pattern.converters
+            })
+            for pattern in urlpatterns if pattern.name in URL_NAMES
+        }
+
+        # Замеры и поиск N+1 на время сравнения отключены:
+        # они добавляют одинаковые накладные расходы.
+        with override_settings(
+            ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'testserver'],
+            INSTRUMENTATION_ENABLED=False,
+            NPLUSONE_MODE=None,
+        ):
+            for name, path in paths.items():
+                results = {}
+                for mode in ('wsgi', 'asgi'):
+                    with override_settings(ASYNC_VIEWS=mode == 'asgi'):
+                        reload_urlconf()
+                        measure = getattr(self, f'measure_{mode}')
+                        results[mode] = measure(path, options)
+                    reload_urlconf()
+                for mode, (durations, elapsed) in results.items():
+                    self.stdout.write(
+                        f'{name:16} {mode:5}'
+                        f' p50={percentile(durations, 50):.1f}ms'
+                        f' p95={percentile(durations, 95):.1f}ms'
+                        f' {len(durations) / elapsed:.0f} rps'
+                    )
+
+    def measure_wsgi(self, path, options):
+        def get(_):
+            start = time.perf_counter()
+            Client().get(path)
+            return (time.perf_counter() - start) * 1000
+
+        with ThreadPoolExecutor(max_workers=options['concurrency']) as pool:
+            list(pool.map(get, range(options['concurrency'])))
+            started = time.perf_counter()
+            durations = list(pool.map(get, range(options['requests'])))
+        return durations, time.perf_counter() - started
+
+    def measure_asgi(self, path, options):
+        async def run():
+            client = AsyncClient()
+            limit = asyncio.Semaphore(options['concurrency'])
+
+            async def get(_):
+                async with limit:
+                    start = time.perf_counter()
+                    await client.get(path)
+                    return (time.perf_counter() - start) * 1000
+
+            await asyncio.gather(*map(get, range(options['concurrency'])))
+            started = time.perf_counter()
+            durations = await asyncio.gather(
+                *map(get, range(options['requests']))
+            )
+            return durations, time.perf_counter() - started
+
+        return asyncio.run(run())
@@ -0,0 +1,90 @@
+from datetime import datetime, time
+
+from blog.constants import EXPORT_CHUNK_SIZE
+from blog.exports import EXPORT_FORMATS, export_lines
+from blog.models import Comment, Post
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+MODELS = {'posts': Post, 'comments': Comment}
+
+
+class Command(BaseCommand):
+    """
+    Потоковая выгрузка публикаций или комментариев
+    с именами автора, категории и местоположения.
+    С --since выгружаются только объекты,
+    изменённые начиная с указанного момента.
+    """
+    help = 'Выгружает публикации или комментарии в CSV или JSON Lines.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('model', choices=MODELS)
+        parser.add_argument(
+            '--format',
+            choices=EXPORT_FORMATS,
+            default='csv',
+            help='Формат выгрузки.'
+        )
+        parser.add_argument(
+            '--since',
+            default=None,
+            help='Дата или дата и время в ISO 8601: выгрузить только'
+            ' изменённые с этого момента.'
+        )
+        parser.add_argument(
+            '--output',
+            default=None,
+            help='Файл выгрузки, по умолчанию стандартный вывод.'
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=EXPORT_CHUNK_SIZE,
+            help='Количество строк, читаемых из базы за раз.'
+        )
+
+    def parse_since(self, value):
+        """Момент --since с часовым поясом."""
+        try:
+            date = parse_date(value)
+            since = (
+                datetime.combine(date, time.min) if date
+                else parse_datetime(value)
+            )
+        except ValueError:
+            # Строка в формате ISO 8601, но дата не существует.
+            since = None
+        if since is None:
+            raise CommandError(
+                'Укажите --since в формате ISO 8601,'
+                ' например 2024-01-31 или 2024-01-31T12:00:00.'
+            )
+        if timezone.is_naive(since):
+            since = timezone.make_aware(since)
+        return since
+
+    def handle(self, *args, **options):
+        since = options['since']
+        if since is not None:
+            since = self.parse_since(since)
+        lines = export_lines(
+            MODELS[options['model']].objects.all(),
+            options['format'],
+            since=since,
+            chunk_size=options['chunk_size'],
+        )
+        path = options['output']
+        if path is None:
+            for line in lines:
+                self.stdout.write(line, ending='')
+            return
+        written = 0
+        with open(path, 'w', encoding='utf-8', newline='') as output:
+            for line in lines:
+                output.write(line)
+                written += 1
+        self.stdout.write(
+            self.style.SUCCESS(f'Записано строк в {path}: {written}')
+        )
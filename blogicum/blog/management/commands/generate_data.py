@@ -0,0 +1,235 @@
+import random
+import time
+from datetime import timedelta
+from itertools import accumulate
+from uuid import uuid4
+
+from blog.caching import invalidate_all_feed_counts, purge_all_pages
+from blog.models import Category, Comment, Location, Post, User
+from core.db import analyze
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+WORDS = (
+    'город река лес дорога утро вечер ночь солнце дождь ветер море гора'
+    ' поезд вокзал кофе книга друг встреча прогулка музей парк мост улица'
+    ' площадь осень зима весна лето снег туман берег остров озеро поле'
+    ' небо облако звезда дом окно свет тень путь карта история фото'
+).split()
+
+
+def sentence(rng, min_words, max_words):
+    words = rng.choices(WORDS, k=rng.randint(min_words, max_words))
+    return ' '.join(words).capitalize()
+
+
+def zipf_weights(count, skew):
+    """Накопленные веса распределения Ципфа для `count` элементов."""
+    return list(accumulate(1 / rank ** skew for rank in range(1, count + 1)))
+
+
+class Command(BaseCommand):
+    """
+    Генерация синтетических данных для нагрузочного
+    тестирования: пользователи, категории, местоположения,
+    публикации (в том числе снятые и отложенные)
+    и комментарии со смещённым распределением.
+    """
+    help = 'Заполняет базу синтетическими данными пакетными вставками.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=1000)
+        parser.add_argument('--categories', type=int, default=20)
+        parser.add_argument('--locations', type=int, default=200)
+        parser.add_argument('--posts', type=int, default=100_000)
+        parser.add_argument('--comments', type=int, default=1_000_000)
+        parser.add_argument(
+            '--unpublished',
+            type=float,
+            default=0.05,
+            help='Доля снятых с публикации записей и категорий.'
+        )
+        parser.add_argument(
+            '--scheduled',
+            type=float,
+            default=0.02,
+            help='Доля отложенных публикаций.'
+        )
+        parser.add_argument(
+            '--skew',
+            type=float,
+            default=1.1,
+            help='Показатель распределения Ципфа для авторов'
+            ' публикаций и комментариев к публикациям.'
+        )
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument('--seed', type=int, default=None)
+
+    def handle(self, *args, **options):
+        self.rng = random.Random(options['seed'])
+        self.batch_size = options['batch_size']
+        self.run = uuid4().hex[:6]
+        self.now = timezone.now()
+
+        users = self.create_users(options['users'])
+        categories = self.create_categories(
+            options['categories'], options['unpublished']
+        )
+        locations = self.create_locations(options['locations'])
+        post_ids = self.create_posts(
+            options['posts'], users, categories, locations, options
+        )
+        self.create_comments(options['comments'], post_ids, users, options)
+
+        analyze()
+        invalidate_all_feed_counts()
+        purge_all_pages()
+
+    def timed(self, label, count, insert):
+        start = time.perf_counter()
+        result = insert()
+        elapsed = time.perf_counter() - start
+        self.stdout.write(
+            f'{label}: {count} за {elapsed:.1f} с'
+            f' ({count / max(elapsed, 1e-9):.0f} строк/с)'
+        )
+        return result
+
+    def bulk_create(self, model, objects):
+        """Пакетная вставка из генератора объектов."""
+        batch = []
+        for obj in objects:
+            batch.append(obj)
+            if len(batch) == self.batch_size:
+                with transaction.atomic():
+                    model.objects.bulk_create(batch)
+                batch = []
+        if batch:
+            with transaction.atomic():
+                model.objects.bulk_create(batch)
+
+    def new_pks(self, model, insert):
+        """Первичные ключи объектов, вставленных в `insert`."""
+        last_pk = model.objects.order_by('-pk').values_list(
+            'pk', flat=True
+        ).first() or 0
+        insert()
+        return list(
+            model.objects.filter(pk__gt=last_pk).order_by('pk').values_list(
+                'pk', flat=True
+            )
+        )
+
+    def create_users(self, count):
+        password = make_password(None)
+        return self.timed('Пользователи', count, lambda: self.new_pks(
+            User, lambda: self.bulk_create(User, (
+                User(
+                    username=f'user_{self.run}_{i}',
+                    password=password,
+                    date_joined=self.now,
+                )
+                for i in range(count)
+            ))
+        ))
+
+    def create_categories(self, count, unpublished):
+        return self.timed('Категории', count, lambda: self.new_pks(
+            Category, lambda: self.bulk_create(Category, (
+                Category(
+                    title=sentence(self.rng, 1, 3),
+                    description=sentence(self.rng, 5, 20),
+                    slug=f'category-{self.run}-{i}',
+                    is_published=self.rng.random() >= unpublished,
+                )
+                for i in range(count)
+            ))
+        ))
+
+    def create_locations(self, count):
+        return self.timed('Местоположения', count, lambda: self.new_pks(
+            Location, lambda: self.bulk_create(Location, (
+                Location(name=sentence(self.rng, 1, 3))
+                for _ in range(count)
+            ))
+        ))
+
+    def make_post(self, i, author_id, categories, locations, options):
+        roll = self.rng.random()
+        if roll < options['scheduled']:
+            pub_date = self.now + timedelta(
+                minutes=self.rng.randint(1, 60 * 24 * 30)
+            )
+        else:
+            pub_date = self.now - timedelta(
+                minutes=self.rng.randint(1, 60 * 24 * 365 * 2)
+            )
+        post = Post(
+            title=f'{sentence(self.rng, 2, 6)} {self.run}-{i}',
+            text='\n'.join(
+                sentence(self.rng, 5, 30)
+                for _ in range(self.rng.randint(1, 10))
+            ),
+            pub_date=pub_date,
+            author_id=author_id,
+            category_id=self.rng.choice(categories),
+            location_id=(
+                self.rng.choice(locations)
+                if locations and self.rng.random() < 0.7 else None
+            ),
+            is_published=self.rng.random() >= options['unpublished'],
+        )
+        post.render_text()
+        return post
+
+    def create_posts(self, count, users, categories, locations, options):
+        authors = self.rng.choices(
+            users, cum_weights=zipf_weights(len(users), options['skew']),
+            k=count
+        )
+        return self.timed('Публикации', count, lambda: self.new_pks(
+            Post, lambda: self.bulk_create(Post, (
+                self.make_post(i, author, categories, locations, options)
+                for i, author in enumerate(authors)
+            ))
+        ))
+
+    def create_comments(self, count, post_ids, users, options):
+        if not post_ids:
+            return
+        posts = post_ids[:]
+        self.rng.shuffle(posts)
+        weights = zipf_weights(len(posts), options['skew'])
+        comment_counts = {}
+
+        def comments():
+            remaining = count
+            while remaining:
+                chunk = min(remaining, self.batch_size)
+                for post_id in self.rng.choices(
+                    posts, cum_weights=weights, k=chunk
+                ):
+                    comment_counts[post_id] = (
+                        comment_counts.get(post_id, 0) + 1
+                    )
+                    yield Comment(
+                        text=sentence(self.rng, 3, 25),
+                        post_id=post_id,
+                        author_id=self.rng.choice(users),
+                    )
+                remaining -= chunk
+
+        self.timed(
+            'Комментарии', count,
+            lambda: self.bulk_create(Comment, comments())
+        )
+        counters = [
+            Post(pk=pk, comment_count=comment_count)
+            for pk, comment_count in comment_counts.items()
+        ]
+        with transaction.atomic():
+            Post.objects.bulk_update(
+                counters, ('comment_count',), batch_size=self.batch_size
+            )
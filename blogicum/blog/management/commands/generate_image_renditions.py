@@ -0,0 +1,54 @@
+from blog.caching import purge_all_pages
+from blog.images import generate_renditions
+from blog.models import Post
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+
+class Command(BaseCommand):
+    """
+    Создание копий изображений публикаций,
+    загруженных до появления копий.
+    Кэш страниц сбрасывается один раз в конце.
+    """
+    help = 'Создаёт WebP/JPEG-копии Post.image пакетами.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=100,
+            help='Количество публикаций, обрабатываемых за один запрос.'
+        )
+        parser.add_argument(
+            '--missing',
+            action='store_true',
+            help='Обработать только публикации без копий изображения.'
+        )
+
+    def handle(self, *args, **options):
+        chunk_size = options['chunk_size']
+        posts = Post.objects.exclude(image='').only(
+            'pk', 'image', 'image_renditions', 'updated_at'
+        ).order_by('pk')
+        if options['missing']:
+            posts = posts.filter(image_renditions=[])
+        processed = 0
+        last_pk = 0
+        while True:
+            chunk = list(posts.filter(pk__gt=last_pk)[:chunk_size])
+            if not chunk:
+                break
+            for post in chunk:
+                post.image_renditions = generate_renditions(post.image)
+                post.updated_at = timezone.now()
+            Post.objects.bulk_update(
+                chunk, ('image_renditions', 'updated_at')
+            )
+            processed += len(chunk)
+            last_pk = chunk[-1].pk
+        if processed:
+            purge_all_pages()
+        self.stdout.write(
+            self.style.SUCCESS(f'Обработано изображений: {processed}')
+        )
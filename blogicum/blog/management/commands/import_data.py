@@ -0,0 +1,112 @@
+import sys
+import time
+from contextlib import ExitStack
+
+from blog.caching import invalidate_all_feed_counts, purge_all_pages
+from blog.constants import IMPORT_BATCH_SIZE
+from blog.imports import (IMPORT_MODELS, BulkImporter, disabled_indexes,
+                          iter_json_array, muted_signals)
+from core.db import analyze
+from django.core.management.base import BaseCommand, CommandError
+from django.core.serializers.base import DeserializationError
+from django.db import IntegrityError, connection, transaction
+
+
+class Command(BaseCommand):
+    """
+    Быстрая загрузка выгрузки dumpdata (db.json).
+    Файл разбирается потоково, объекты вставляются пакетами
+    в порядке зависимостей моделей в одной транзакции.
+    Объекты остальных моделей пропускаются.
+    Кэш лент и страниц сбрасывается один раз в конце.
+    """
+    help = (
+        'Загружает категории, места, пользователей, публикации'
+        ' и комментарии из JSON-выгрузки пакетами.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'path', help='Файл выгрузки или «-» для стандартного ввода.'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=IMPORT_BATCH_SIZE,
+            help='Количество объектов модели, вставляемых одним пакетом.'
+        )
+        parser.add_argument(
+            '--disable-signals',
+            action='store_true',
+            help='Отключить обработчики сигналов моделей на время загрузки.'
+        )
+        parser.add_argument(
+            '--disable-indexes',
+            action='store_true',
+            help='Удалить индексы на время загрузки и создать'
+            ' их заново после неё.'
+        )
+
+    def load(self, importer, options):
+        """
+        Загрузка выгрузки в одной транзакции.
+        """
+        with ExitStack() as stack:
+            if options['path'] == '-':
+                stream = sys.stdin
+            else:
+                stream = stack.enter_context(
+                    open(options['path'], encoding='utf-8')
+                )
+            if options['disable_signals']:
+                stack.enter_context(muted_signals())
+            if options['disable_indexes']:
+                # Редактор схемы SQLite отключает проверку внешних
+                # ключей до начала транзакции и проверяет их все
+                # одним запросом при выходе.
+                schema_editor = stack.enter_context(
+                    connection.schema_editor()
+                )
+            stack.enter_context(transaction.atomic())
+            # Индексы нужны пересчёту счётчиков в finish().
+            with ExitStack() as indexes:
+                if options['disable_indexes']:
+                    indexes.enter_context(
+                        disabled_indexes(IMPORT_MODELS, schema_editor)
+                    )
+                importer.load(iter_json_array(stream))
+            importer.finish()
+
+    def handle(self, *args, **options):
+        importer = BulkImporter(batch_size=options['batch_size'])
+        started = time.perf_counter()
+        try:
+            self.load(importer, options)
+        except (ValueError, DeserializationError, IntegrityError) as error:
+            raise CommandError(f'Некорректная выгрузка: {error}')
+        analyze()
+        invalidate_all_feed_counts()
+        purge_all_pages()
+        elapsed = time.perf_counter() - started
+
+        for model in IMPORT_MODELS:
+            count = importer.counts[model]
+            if not count:
+                continue
+            rate = count / max(importer.seconds[model], 1e-9)
+            self.stdout.write(
+                f'{model._meta.label_lower}: {count}'
+                f' ({rate:.0f} строк/с при вставке)'
+            )
+        for label, count in sorted(importer.skipped.items()):
+            self.stdout.write(f'Пропущено {label}: {count}')
+        if importer.skipped_m2m:
+            self.stderr.write(
+                'Связи многие-ко-многим не загружаются, пропущены'
+                f' у объектов: {importer.skipped_m2m}'
+            )
+        total = sum(importer.counts.values())
+        self.stdout.write(self.style.SUCCESS(
+            f'Загружено объектов: {total} за {elapsed:.2f} с'
+            f' ({total / max(elapsed, 1e-9):.0f} строк/с)'
+        ))
@@ -0,0 +1,19 @@
+from blog.search import rebuild_index, uses_fts
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    """
+    Перестроение поисковых индексов публикаций и комментариев,
+    например после изменения данных в обход триггеров.
+    """
+    help = (
+        'Перестраивает полнотекстовые индексы публикаций'
+        ' и комментариев (FTS5).'
+    )
+
+    def handle(self, *args, **options):
+        if not uses_fts():
+            raise CommandError('Индекс FTS5 доступен только для SQLite.')
+        rebuild_index()
+        self.stdout.write(self.style.SUCCESS('Поисковые индексы перестроены.'))
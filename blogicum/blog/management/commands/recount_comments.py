@@ -0,0 +1,44 @@
+from blog.caching import purge_all_pages
+from blog.models import Post
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from utils import recount_comments
+
+
+class Command(BaseCommand):
+    """
+    Пересчёт счётчиков комментариев
+    у публикаций, разошедшихся с
+    фактическим числом комментариев.
+    Кэш страниц сбрасывается один раз в конце.
+    """
+    help = 'Пересчитывает Post.comment_count пакетами.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=1000,
+            help='Количество публикаций, проверяемых за один запрос.'
+        )
+
+    def handle(self, *args, **options):
+        chunk_size = options['chunk_size']
+        fixed = 0
+        last_pk = 0
+        while True:
+            pks = list(
+                Post.objects.filter(pk__gt=last_pk).order_by('pk').values_list(
+                    'pk', flat=True
+                )[:chunk_size]
+            )
+            if not pks:
+                break
+            with transaction.atomic():
+                fixed += recount_comments(Post.objects.filter(pk__in=pks))
+            last_pk = pks[-1]
+        if fixed:
+            purge_all_pages()
+        self.stdout.write(
+            self.style.SUCCESS(f'Исправлено счётчиков: {fixed}')
+        )
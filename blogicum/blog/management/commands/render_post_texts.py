@@ -0,0 +1,53 @@
+from blog.caching import purge_all_pages
+from blog.models import Post
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+
+class Command(BaseCommand):
+    """
+    Заполнение анонсов и HTML текста
+    публикаций, сохранённых до их появления
+    или изменённых в обход Post.save().
+    Кэш страниц сбрасывается один раз в конце.
+    """
+    help = 'Пересчитывает Post.excerpt и Post.text_html пакетами.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=1000,
+            help='Количество публикаций, обновляемых за один запрос.'
+        )
+        parser.add_argument(
+            '--missing',
+            action='store_true',
+            help='Обработать только публикации без анонса.'
+        )
+
+    def handle(self, *args, **options):
+        chunk_size = options['chunk_size']
+        posts = Post.objects.only('pk', 'text').order_by('pk')
+        if options['missing']:
+            posts = posts.filter(excerpt='')
+        rendered = 0
+        last_pk = 0
+        while True:
+            chunk = list(posts.filter(pk__gt=last_pk)[:chunk_size])
+            if not chunk:
+                break
+            now = timezone.now()
+            for post in chunk:
+                post.render_text()
+                post.updated_at = now
+            Post.objects.bulk_update(
+                chunk, ('excerpt', 'text_html', 'updated_at')
+            )
+            rendered += len(chunk)
+            last_pk = chunk[-1].pk
+        if rendered:
+            purge_all_pages()
+        self.stdout.write(
+            self.style.SUCCESS(f'Обработано публикаций: {rendered}')
+        )
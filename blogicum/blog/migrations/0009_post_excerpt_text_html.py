@@ -0,0 +1,49 @@
+# Generated by Django 3.2.16 on 2026-10-18 03:12
+
+from django.db import migrations, models
+from django.template.defaultfilters import linebreaksbr
+from django.utils.text import Truncator
+
+# Значения на момент миграции: миграция не должна
+# зависеть от последующих изменений констант.
+EXCERPT_WORDS = 10
+CHUNK_SIZE = 1000
+
+
+def fill_post_texts(apps, schema_editor):
+    """Заполнение анонсов и HTML текста существующих публикаций."""
+    Post = apps.get_model('blog', 'Post')
+    posts = Post.objects.only('pk', 'text').order_by('pk')
+    last_pk = 0
+    while True:
+        chunk = list(posts.filter(pk__gt=last_pk)[:CHUNK_SIZE])
+        if not chunk:
+            break
+        for post in chunk:
+            post.excerpt = Truncator(post.text).words(
+                EXCERPT_WORDS, truncate=' …'
+            )
+            post.text_html = linebreaksbr(post.text, autoescape=True)
+        Post.objects.bulk_update(chunk, ('excerpt', 'text_html'))
+        last_pk = chunk[-1].pk
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0008_comment_post_created_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='excerpt',
+            field=models.TextField(blank=True, editable=False, verbose_name='Анонс'),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='text_html',
+            field=models.TextField(blank=True, editable=False, verbose_name='Текст в HTML'),
+        ),
+        migrations.RunPython(fill_post_texts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,70 @@
+# Generated by Django 3.2.16 on 2026-10-18 03:40
+
+from django.db import migrations, models
+
+CREATE_SQL = (
+    """
+    CREATE VIRTUAL TABLE blog_comment_search USING fts5(
+        text,
+        content='blog_comment', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER blog_comment_search_insert AFTER INSERT ON blog_comment
+    BEGIN
+        INSERT INTO blog_comment_search(rowid, text)
+        VALUES (new.id, new.text);
+    END
+    """,
+    """
+    CREATE TRIGGER blog_comment_search_delete AFTER DELETE ON blog_comment
+    BEGIN
+        INSERT INTO blog_comment_search(blog_comment_search, rowid, text)
+        VALUES ('delete', old.id, old.text);
+    END
+    """,
+    """
+    CREATE TRIGGER blog_comment_search_update
+    AFTER UPDATE OF text ON blog_comment BEGIN
+        INSERT INTO blog_comment_search(blog_comment_search, rowid, text)
+        VALUES ('delete', old.id, old.text);
+        INSERT INTO blog_comment_search(rowid, text)
+        VALUES (new.id, new.text);
+    END
+    """,
+    "INSERT INTO blog_comment_search(blog_comment_search) VALUES ('rebuild')",
+)
+
+DROP_SQL = (
+    'DROP TRIGGER IF EXISTS blog_comment_search_insert',
+    'DROP TRIGGER IF EXISTS blog_comment_search_delete',
+    'DROP TRIGGER IF EXISTS blog_comment_search_update',
+    'DROP TABLE IF EXISTS blog_comment_search',
+)
+
+
+def run_sql(statements):
+    def operation(apps, schema_editor):
+        if schema_editor.connection.vendor != 'sqlite':
+            return
+        for statement in statements:
+            schema_editor.execute(statement)
+    return operation
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0011_post_search_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(
+                fields=['created_at'], name='comment_created_idx'
+            ),
+        ),
+        migrations.RunPython(run_sql(CREATE_SQL), run_sql(DROP_SQL)),
+    ]
@@ -1,9 +1,13 @@
+from core.jobs import enqueue
 from core.models import DateTimeModel, PublishedModel
 from django.contrib.auth import get_user_model
 from django.db import models
+from django.template.defaultfilters import linebreaksbr
 from django.urls import reverse
+from django.utils.text import Truncator
 
-from .constants import MAX_FIELD_LENGTH
+from .constants import EXCERPT_WORDS, IMAGE_CARD_WIDTH, MAX_FIELD_LENGTH
+from .images import rendition_name
 
 User = get_user_model()
 
@@ -84,6 +88,21 @@ class Post(DateTimeModel, PublishedModel):
     image = models.ImageField(
         'Фото', blank=True, upload_to='post_images'
     )
+    image_renditions = models.JSONField(
+        'Ширины копий изображения',
+        default=list,
+        blank=True,
+        editable=False
+    )
+    comment_count = models.PositiveIntegerField(
+        'Количество комментариев',
+        default=0,
+        editable=False
+    )
+    excerpt = models.TextField('Анонс', blank=True, editable=False)
+    text_html = models.TextField(
+        'Текст в HTML', blank=True, editable=False
+    )
 
     class Meta:
         ordering = ['-pub_date']
@@ -97,6 +116,22 @@ class Post(DateTimeModel, PublishedModel):
                 name='Limiting the uniqueness of a publication',
             ),
         )
+        indexes = (
+            models.Index(
+                fields=('pub_date', 'id'),
+                name='post_feed_idx',
+                condition=models.Q(is_published=True),
+            ),
+            models.Index(
+                fields=('category', 'pub_date', 'id'),
+                name='post_category_feed_idx',
+                condition=models.Q(is_published=True),
+            ),
+            models.Index(
+                fields=('author', 'pub_date', 'id'),
+                name='post_author_feed_idx',
+            ),
+        )
 
     def __str__(self):
         return self.title
@@ -104,6 +139,68 @@ class Post(DateTimeModel, PublishedModel):
     def get_absolute_url(self):
         return reverse('blog:post_detail', kwargs={'pk': self.pk})
 
+    def render_text(self):
+        """
+        Заполняет анонс и HTML текста публикации,
+        которые выводятся в ленте и на странице публикации.
+        """
+        self.excerpt = Truncator(self.text).words(
+            EXCERPT_WORDS, truncate=' …'
+        )
+        self.text_html = linebreaksbr(self.text, autoescape=True)
+
+    def _image_rendition_url(self, width, extension):
+        return self.image.storage.url(
+            rendition_name(self.image.name, width, extension)
+        )
+
+    def _image_srcset(self, extension):
+        return ', '.join(
+            f'{self._image_rendition_url(width, extension)} {width}w'
+            for width in self.image_renditions
+        )
+
+    @property
+    def image_webp_srcset(self):
+        """srcset копий изображения в формате WebP."""
+        return self._image_srcset('webp')
+
+    @property
+    def image_jpeg_srcset(self):
+        """srcset копий изображения в формате JPEG."""
+        return self._image_srcset('jpg')
+
+    @property
+    def image_card_url(self):
+        """
+        Изображение для карточки: копия ширины карточки
+        или ближайшая меньшая, без копий — оригинал.
+        """
+        widths = [
+            width for width in self.image_renditions
+            if width <= IMAGE_CARD_WIDTH
+        ]
+        if not widths:
+            return self.image.url
+        return self._image_rendition_url(max(widths), 'jpg')
+
+    def save(self, *args, update_fields=None, **kwargs):
+        if update_fields is None or 'text' in update_fields:
+            self.render_text()
+            if update_fields is not None:
+                update_fields = {*update_fields, 'excerpt', 'text_html'}
+        image_uploaded = bool(self.image) and not self.image._committed
+        if not self.image or image_uploaded:
+            self.image_renditions = []
+            if update_fields is not None and 'image' in update_fields:
+                update_fields = {*update_fields, 'image_renditions'}
+        super().save(*args, update_fields=update_fields, **kwargs)
+        if image_uploaded:
+            enqueue(
+                'blog.generate_image_renditions',
+                {'post_id': self.pk, 'image': self.image.name}
+            )
+
 
 class Comment(DateTimeModel):
     """
@@ -126,6 +223,16 @@ class Comment(DateTimeModel):
         ordering = ('created_at',)
         verbose_name = 'комментарий'
         verbose_name_plural = 'Комментарии'
+        indexes = (
+            models.Index(
+                fields=('post', 'created_at', 'id'),
+                name='comment_post_created_idx',
+            ),
+            models.Index(
+                fields=('created_at',),
+                name='comment_created_idx',
+            ),
+        )
 
     def __str__(self):
         return self.text
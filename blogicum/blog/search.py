@@ -0,0 +1,119 @@
+import re
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+from django.utils.html import escape
+from django.utils.safestring import mark_safe
+
+from .constants import SEARCH_MAX_TERMS, SEARCH_SNIPPET_TOKENS
+
+SEARCH_TABLE = 'blog_post_search'
+COMMENT_SEARCH_TABLE = 'blog_comment_search'
+
+# Границы совпадения в сниппете: управляющие символы,
+# которых нет в тексте публикаций, заменяются на <mark>
+# после экранирования текста.
+MATCH_START = '\x02'
+MATCH_END = '\x03'
+
+
+def fts_query(text):
+    """
+    Запрос FTS5 из пользовательского ввода:
+    все слова обязательны, каждое ищется по префиксу.
+    Синтаксис FTS5 во вводе не интерпретируется.
+    """
+    terms = re.findall(r'\w+', text)[:SEARCH_MAX_TERMS]
+    return ' '.join(f'"{term}"*' for term in terms)
+
+
+def uses_fts():
+    return connection.vendor == 'sqlite'
+
+
+def fts_rowids(table, query):
+    """Подзапрос rowid строк поискового индекса `table`."""
+    return RawSQL(f'SELECT rowid FROM {table} WHERE {table} MATCH %s', [query])
+
+
+def match_posts(queryset, text):
+    """Публикации выборки, найденные по заголовку и тексту."""
+    query = fts_query(text)
+    if not query:
+        return queryset.none()
+    if not uses_fts():
+        return queryset.filter(
+            Q(title__icontains=text) | Q(text__icontains=text)
+        )
+    return queryset.filter(id__in=fts_rowids(SEARCH_TABLE, query))
+
+
+def match_comments(queryset, text):
+    """
+    Комментарии выборки, написанные пользователем
+    с именем `text` (уникальный индекс username)
+    или найденные по тексту.
+    """
+    username = text.strip()
+    query = fts_query(text)
+    if not uses_fts():
+        return queryset.filter(
+            Q(author__username=username) | Q(text__icontains=text)
+        )
+    condition = Q(author__in=get_user_model().objects.filter(
+        username=username
+    ).values('id'))
+    if query:
+        condition |= Q(id__in=fts_rowids(COMMENT_SEARCH_TABLE, query))
+    return queryset.filter(condition)
+
+
+def search_posts(queryset, text):
+    """
+    Публикации выборки, найденные по заголовку и тексту,
+    в порядке релевантности (совпадения в заголовке
+    весят больше) с фрагментом текста `search_snippet`.
+    """
+    query = fts_query(text)
+    if not query:
+        return queryset.none()
+    if not uses_fts():
+        return match_posts(queryset, text)
+    return queryset.extra(
+        select={
+            'search_rank': f'bm25({SEARCH_TABLE}, 10.0, 1.0)',
+            'search_snippet': (
+                f"snippet({SEARCH_TABLE}, 1, %s, %s, '…', %s)"
+            ),
+        },
+        select_params=(MATCH_START, MATCH_END, SEARCH_SNIPPET_TOKENS),
+        tables=[SEARCH_TABLE],
+        where=[
+            f'{SEARCH_TABLE}.rowid = blog_post.id',
+            f'{SEARCH_TABLE} MATCH %s',
+        ],
+        params=[query],
+    ).order_by('search_rank', '-pub_date')
+
+
+def highlight(snippet):
+    """HTML сниппета с выделенными совпадениями."""
+    return mark_safe(
+        escape(snippet)
+        .replace(MATCH_START, '<mark>')
+        .replace(MATCH_END, '</mark>')
+    )
+
+
+def rebuild_index():
+    """Полное перестроение поисковых индексов."""
+    with connection.cursor() as cursor:
+        for table in (SEARCH_TABLE, COMMENT_SEARCH_TABLE):
+            cursor.execute(
+                f"INSERT INTO {table}({table}) VALUES ('rebuild')"
+            )
+            cursor.execute(
+                f"INSERT INTO {table}({table}) VALUES ('optimize')"
+            )
@@ -0,0 +1,163 @@
+from django.db import transaction
+from django.db.models.signals import (post_delete, post_init, post_save,
+                                      pre_delete)
+from django.utils import timezone
+from utils import recount_comments
+
+from .caching import (invalidate_all_feed_counts, invalidate_feed_counts,
+                      purge_all_pages, purge_commented_pages,
+                      purge_post_pages)
+from .images import delete_renditions
+from .models import Category, Comment, Location, Post, User
+
+# Обработчики приложения: (сигнал, обработчик, модель).
+RECEIVERS = []
+
+
+def receiver(signal, sender):
+    """
+    Подключение обработчика, как django.dispatch.receiver,
+    с запоминанием в RECEIVERS: на время загрузки
+    их отключает blog.imports.muted_signals.
+    """
+    def decorator(func):
+        signal.connect(func, sender=sender)
+        RECEIVERS.append((signal, func, sender))
+        return func
+    return decorator
+
+
+@receiver(post_init, sender=Post)
+def remember_post_feeds(sender, instance, **kwargs):
+    """
+    Запоминает ленты, в которые публикация
+    входила на момент загрузки из базы.
+    """
+    instance._initial_feeds = (
+        instance.__dict__.get('category_id'),
+        instance.__dict__.get('author_id'),
+    )
+
+
+@receiver(post_init, sender=Post)
+def remember_post_image(sender, instance, **kwargs):
+    image = instance.__dict__.get('image')
+    instance._initial_image = getattr(image, 'name', image)
+
+
+@receiver(post_save, sender=Post)
+def delete_replaced_renditions(sender, instance, **kwargs):
+    """
+    Копии заменённого или удалённого изображения
+    удаляются после фиксации транзакции.
+    """
+    if 'image' not in instance.__dict__:
+        return
+    initial_image = instance._initial_image
+    instance._initial_image = instance.image.name
+    if initial_image and initial_image != instance.image.name:
+        transaction.on_commit(lambda: delete_renditions(initial_image))
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+def reset_post_caches(sender, instance, **kwargs):
+    """
+    Сброс счётчиков лент и кэша страниц,
+    затронутых изменением или удалением публикации.
+    """
+    initial_category_id, initial_author_id = instance._initial_feeds
+    category_ids = (initial_category_id, instance.category_id)
+    author_ids = {initial_author_id, instance.author_id} - {None}
+    invalidate_feed_counts(category_ids=category_ids, author_ids=author_ids)
+    purge_post_pages(
+        (instance.pk,), category_ids=category_ids, author_ids=author_ids
+    )
+    instance._initial_feeds = (instance.category_id, instance.author_id)
+
+
+@receiver(post_save, sender=Comment)
+def reset_commented_post_caches(sender, instance, created, **kwargs):
+    """
+    Комментарии видны на странице публикации,
+    их количество — в лентах. Удаление комментариев
+    сбрасывает кэш явно (purge_commented_pages): обработчик
+    post_delete отключил бы быстрое каскадное удаление.
+    Правка комментария сдвигает updated_at публикации,
+    как добавление и удаление (change_comment_count).
+    """
+    if not created:
+        Post.objects.filter(pk=instance.post_id).update(
+            updated_at=timezone.now()
+        )
+    purge_commented_pages((instance.post_id,))
+
+
+@receiver(post_init, sender=Category)
+def remember_category_state(sender, instance, **kwargs):
+    instance._initial_is_published = instance.__dict__.get('is_published')
+
+
+@receiver(post_save, sender=Category)
+def reset_category_caches(sender, instance, created, **kwargs):
+    """
+    Снятие категории с публикации и возврат
+    меняют состав всех лент.
+    """
+    toggled = instance.is_published != instance._initial_is_published
+    instance._initial_is_published = instance.is_published
+    if created:
+        return
+    if toggled:
+        invalidate_all_feed_counts()
+    purge_all_pages()
+
+
+@receiver(post_delete, sender=Category)
+def reset_caches_on_category_delete(sender, instance, **kwargs):
+    invalidate_all_feed_counts()
+    purge_all_pages()
+
+
+@receiver(post_save, sender=Location)
+@receiver(post_delete, sender=Location)
+def reset_location_caches(sender, instance, **kwargs):
+    purge_all_pages()
+
+
+@receiver(post_save, sender=User)
+def reset_author_caches(
+    sender, instance, created, update_fields=None, **kwargs
+):
+    """
+    Страницы показывают имя автора;
+    обновление только даты входа их не меняет.
+    """
+    if created:
+        return
+    if update_fields is None or 'username' in update_fields:
+        purge_all_pages()
+
+
+@receiver(pre_delete, sender=User)
+def remember_commented_posts(sender, instance, **kwargs):
+    """
+    Комментарии пользователя к чужим публикациям
+    удаляются каскадом в обход счётчика комментариев.
+    """
+    instance._commented_post_ids = sorted(set(
+        Comment.objects.filter(author=instance).exclude(
+            post__author=instance
+        ).values_list('post_id', flat=True)
+    ))
+
+
+@receiver(post_delete, sender=User)
+def recount_commented_posts(sender, instance, **kwargs):
+    """
+    Пересчёт выполняется в транзакции удаления пользователя.
+    """
+    post_ids = getattr(instance, '_commented_post_ids', None)
+    if post_ids:
+        recount_comments(Post.objects.filter(pk__in=post_ids))
+        purge_commented_pages(post_ids)
@@ -0,0 +1,28 @@
+from core.db import immediate_atomic
+from core.jobs import task
+from utils import recount_comments
+
+from .caching import purge_commented_pages
+from .images import generate_renditions
+from .models import Post
+
+
+@task('blog.generate_image_renditions')
+def generate_image_renditions(post_id, image):
+    """
+    Создание копий загруженного изображения публикации.
+    Пропускается, если изображение успели заменить.
+    """
+    post = Post.objects.filter(pk=post_id, image=image).first()
+    if post is None:
+        return
+    post.image_renditions = generate_renditions(post.image)
+    post.save(update_fields=('image_renditions', 'updated_at'))
+
+
+@task('blog.recount_comments')
+def recount_post_comments(post_ids):
+    """Пересчёт счётчиков комментариев публикаций."""
+    with immediate_atomic():
+        recount_comments(Post.objects.filter(pk__in=post_ids))
+        purge_commented_pages(post_ids)
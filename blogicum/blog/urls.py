@@ -1,19 +1,32 @@
 from blog import views
+from core.offload import offload
+from django.conf import settings
 from django.urls import path
 
 app_name = 'blog'
 
+
+def read_view(view):
+    """
+    Представления чтения лент и публикаций
+    под ASGI (ASYNC_VIEWS) выполняются асинхронно.
+    """
+    return offload(view) if settings.ASYNC_VIEWS else view
+
+
 urlpatterns = [
-    path('', views.PostListView.as_view(), name='index'),
+    path('', read_view(views.PostListView.as_view()), name='index'),
     path(
         'posts/<int:pk>/',
-        views.PostDetailView.as_view(),
+        read_view(views.PostDetailView.as_view()),
         name='post_detail'
     ),
     path(
-        'category/<slug:category_slug>/', views.category_posts,
+        'category/<slug:category_slug>/',
+        read_view(views.category_posts),
         name='category_posts'
     ),
+    path('search/', views.search, name='search'),
     path('posts/create/', views.PostCreateView.as_view(), name='create_post'),
     path(
         'posts/<int:pk>/edit/',
@@ -28,9 +41,14 @@ urlpatterns = [
     ),
     path(
         'profile/<username>/',
-        views.ProfileListView.as_view(),
+        read_view(views.ProfileListView.as_view()),
         name='profile'
     ),
+    path(
+        'posts/<int:pk>/comments/',
+        views.post_comments,
+        name='post_comments'
+    ),
     path(
         'posts/<int:pk>/comment/',
         views.add_comment,
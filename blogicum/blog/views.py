@@ -1,55 +1,128 @@
 from datetime import datetime, timezone
+from urllib.parse import urlencode
 
+from core.db import immediate_atomic
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.db.models import Count
+from django.core.paginator import Paginator
 from django.http import Http404, HttpRequest, HttpResponse
 from django.shortcuts import get_object_or_404, redirect, render
 from django.urls import reverse_lazy
+from django.utils.decorators import method_decorator
 from django.views.generic import CreateView, DetailView, ListView, UpdateView
-from utils import paginate_page, query_select_related, queryset_filter
+from utils import (KeysetPaginator, change_comment_count, feed_queryset,
+                   feed_state, paginate_page, post_state)
 
-from .constants import POSTS_ON_THE_PAGE
+from .caching import (cache_anonymous_page, conditional_page, feed_count_key,
+                      purge_commented_pages)
+from .constants import COMMENTS_ON_THE_PAGE, POSTS_ON_THE_PAGE
 from .forms import CommentForm, PostForm, UserForm
 from .models import Category, Comment, Post, User
+from .search import highlight, search_posts
 
 
-class PostListView(ListView):
+def check_post_visibility(post, user):
+    """
+    Снятые с публикации и отложенные публикации
+    видны только их автору.
+    """
+    if (
+        post.author_id != user.pk
+        and (
+            not post.is_published
+            or not post.category.is_published
+            or post.pub_date > datetime.now(timezone.utc)
+        )
+    ):
+        raise Http404('Публикация не существует.')
+
+
+def paginate_comments(post, after=None):
+    """
+    Страница комментариев к публикации
+    в порядке их добавления.
+    """
+    return KeysetPaginator(
+        post.comments.select_related('author'),
+        COMMENTS_ON_THE_PAGE,
+        field='created_at',
+        descending=False
+    ).get_page(after=after)
+
+
+class FeedPaginationMixin:
+    """
+    Миксин пагинации лент публикаций:
+    нумерованной или курсорной.
+    """
+    paginate_by = POSTS_ON_THE_PAGE
+
+    def get_count_key(self):
+        return None
+
+    def paginate_queryset(self, queryset, page_size):
+        page = paginate_page(
+            self.request, queryset, page_size, self.get_count_key()
+        )
+        return (
+            page.paginator, page, page.object_list, page.has_other_pages()
+        )
+
+
+@method_decorator(conditional_page('index', feed_state), name='dispatch')
+@method_decorator(cache_anonymous_page('index'), name='dispatch')
+class PostListView(FeedPaginationMixin, ListView):
     """
     Список публикаций пользователей
     на главной странице.
     """
-    paginate_by = POSTS_ON_THE_PAGE
     template_name = 'blog/index.html'
 
     def get_queryset(self):
-        return queryset_filter(query_select_related())
+        return feed_queryset()
+
+    def get_count_key(self):
+        return feed_count_key('global')
 
 
+@method_decorator(
+    conditional_page('post:{pk}', post_state), name='dispatch'
+)
+@method_decorator(cache_anonymous_page('post:{pk}'), name='dispatch')
 class PostDetailView(DetailView):
     """
     Cтраница отдельной публикации.
     """
-    model = Post
-    paginate_by = POSTS_ON_THE_PAGE
+    queryset = Post.objects.select_related('category', 'location', 'author')
     template_name = 'blog/detail.html'
 
     def get_context_data(self, **kwargs):
+        check_post_visibility(self.object, self.request.user)
         context = super().get_context_data(**kwargs)
         context['form'] = CommentForm()
-        context['comments'] = self.object.comments.select_related('author')
-        if (
-            self.object.author != self.request.user
-            and (
-                not self.object.is_published
-                or not self.object.category.is_published
-                or self.object.pub_date > datetime.now(timezone.utc)
-            )
-        ):
-            raise Http404('Публикация не существует.')
+        context['comments'] = paginate_comments(self.object)
         return context
 
 
+@conditional_page('post:{pk}', post_state)
+@cache_anonymous_page('post:{pk}')
+def post_comments(request: HttpRequest, pk: int) -> HttpResponse:
+    """
+    Следующая страница комментариев к публикации.
+    Отдаёт фрагмент HTML для подгрузки
+    на странице публикации.
+    """
+    post = get_object_or_404(Post.objects.select_related('category'), pk=pk)
+    check_post_visibility(post, request.user)
+    context = {
+        'post': post,
+        'comments': paginate_comments(post, request.GET.get('after')),
+    }
+    return render(request, 'includes/comment_list.html', context)
+
+
+@conditional_page('category:{category_slug}', feed_state)
+@cache_anonymous_page('category:{category_slug}')
 def category_posts(request: HttpRequest, category_slug: str) -> HttpResponse:
     """
     Страница публикаций по
@@ -60,37 +133,60 @@ def category_posts(request: HttpRequest, category_slug: str) -> HttpResponse:
         is_published=True,
         slug=category_slug
     )
-    post_list = queryset_filter(
-        category.posts
-    )
+    post_list = feed_queryset(category=category)
     context = {
         'category': category,
         'post_list': post_list,
-        'page_obj': paginate_page(request, post_list, POSTS_ON_THE_PAGE)
+        'page_obj': paginate_page(
+            request, post_list, POSTS_ON_THE_PAGE,
+            feed_count_key('category', category.pk)
+        )
     }
     return render(request, 'blog/category.html', context)
 
 
-class ProfileListView(ListView):
+def search(request: HttpRequest) -> HttpResponse:
+    """
+    Поиск по заголовкам и текстам
+    опубликованных записей.
+    """
+    query = request.GET.get('q', '').strip()
+    page_obj = Paginator(
+        search_posts(feed_queryset(), query), POSTS_ON_THE_PAGE
+    ).get_page(request.GET.get('page'))
+    for post in page_obj:
+        snippet = getattr(post, 'search_snippet', None)
+        post.search_snippet = highlight(snippet) if snippet else None
+    context = {
+        'query': query,
+        'page_obj': page_obj,
+        'page_query': f'{urlencode({"q": query})}&' if query else '',
+    }
+    return render(request, 'blog/search.html', context)
+
+
+@method_decorator(
+    conditional_page('profile:{username}', feed_state), name='dispatch'
+)
+class ProfileListView(FeedPaginationMixin, ListView):
     """
     Страница профиля пользователя.
     """
     template_name = 'blog/profile.html'
-    paginate_by = POSTS_ON_THE_PAGE
 
     def get_queryset(self):
         self.user = get_object_or_404(
             User, username=self.kwargs['username']
         )
-        if self.user == self.request.user:
-            return (
-                Post.objects.select_related(
-                    'category', 'location', 'author'
-                ).filter(author=self.user).annotate(
-                    comment_count=Count('comments')
-                ).order_by('-pub_date')
-            )
-        return queryset_filter(query_select_related())
+        return feed_queryset(
+            author=self.user,
+            published_only=self.user != self.request.user
+        )
+
+    def get_count_key(self):
+        return feed_count_key(
+            'author', self.user.pk, owner=self.user == self.request.user
+        )
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
@@ -179,7 +275,9 @@ def add_comment(request: HttpRequest, pk: int) -> HttpResponse:
         comment = form.save(commit=False)
         comment.author = request.user
         comment.post = post
-        comment.save()
+        with immediate_atomic():
+            comment.save()
+            change_comment_count(post.pk, 1)
     return redirect('blog:post_detail', pk=pk)
 
 
@@ -222,7 +320,11 @@ def delete_comment(
         return redirect('blog:post_detail', pk=pk)
     context = {'comment': comment}
     if request.method == 'POST':
-        comment.delete()
+        with immediate_atomic():
+            deleted, _ = comment.delete()
+            if deleted:
+                change_comment_count(comment.post_id, -1)
+                purge_commented_pages((comment.post_id,))
         return redirect('blog:post_detail', pk=pk)
     return render(
         request, 'blog/comment.html', context
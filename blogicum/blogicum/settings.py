@@ -25,6 +25,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'core.middleware.InstrumentationMiddleware',
+    'core.middleware.NPlusOneMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -58,11 +60,21 @@ WSGI_APPLICATION = 'blogicum.wsgi.application'
 
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
+        'ENGINE': 'core.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        'CONN_MAX_AGE': 60,
+        'CONN_HEALTH_CHECKS': True,
     }
 }
 
+SQLITE_PRAGMAS = {
+    'busy_timeout': 5000,
+    'journal_mode': 'wal',
+    'synchronous': 'normal',
+    'mmap_size': 128 * 1024 * 1024,
+    'cache_size': -20000,
+}
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
@@ -107,3 +119,41 @@ LOGIN_URL = 'login'
 LOGIN_REDIRECT_URL = 'blog:index'
 
 CSRF_FAILURE_VIEW = 'pages.views.csrf_failure'
+
+# Счётчики лент и кэш страниц сбрасываются сигналами в процессе,
+# изменившем данные: кэш должен быть общим для всех процессов
+# сайта и обработчиков фоновых задач.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': BASE_DIR / 'cache',
+    }
+}
+
+BLOG_PAGE_CACHE_TIMEOUT = 0
+
+JOBS_EAGER = False
+
+JOBS_MAX_ATTEMPTS = 3
+
+JOBS_RETRY_DELAY = 60
+
+JOBS_VISIBILITY_TIMEOUT = 300
+
+JOBS_EMAIL_BACKEND = EMAIL_BACKEND
+
+INSTRUMENTATION_ENABLED = False
+
+INSTRUMENTATION_LOG = BASE_DIR / 'instrumentation.jsonl'
+
+INSTRUMENTATION_SAMPLE_RATE = 1.0
+
+NPLUSONE_MODE = 'warn' if DEBUG else None
+
+NPLUSONE_THRESHOLD = 5
+
+BENCHMARK_RESULTS = BASE_DIR / 'benchmarks.jsonl'
+
+ASYNC_VIEWS = False
+
+ASYNC_VIEW_WORKERS = 8
@@ -0,0 +1,29 @@
+from django.contrib import admin
+from django.utils import timezone
+
+from .models import Job
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = (
+        'name',
+        'status',
+        'attempts',
+        'run_at',
+        'updated_at'
+    )
+    list_filter = ('status', 'name')
+    readonly_fields = ('last_error',)
+    actions = ('retry_jobs',)
+
+    @admin.action(description='Повторить выбранные задачи')
+    def retry_jobs(self, request, queryset):
+        now = timezone.now()
+        queryset.update(
+            status=Job.Status.PENDING,
+            run_at=now,
+            locked_until=None,
+            attempts=0,
+            updated_at=now
+        )
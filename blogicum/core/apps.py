@@ -1,6 +1,16 @@
 from django.apps import AppConfig
+from django.core.signals import request_started
+from django.db.backends.signals import connection_created
+from django.utils.module_loading import autodiscover_modules
 
 
 class CoreConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'core'
+
+    def ready(self):
+        from .db import checkout_connections, configure_sqlite
+
+        connection_created.connect(configure_sqlite)
+        request_started.connect(checkout_connections)
+        autodiscover_modules('tasks')
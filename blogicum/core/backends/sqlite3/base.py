@@ -0,0 +1,18 @@
+from django.db.backends.sqlite3 import base
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    """
+    SQLite с транзакциями BEGIN IMMEDIATE по запросу
+    (см. core.db.immediate_atomic). Такая транзакция сразу
+    берёт блокировку записи и ждёт её по busy_timeout.
+    Отложенная транзакция, которая прочитала базу до записи
+    (например, триггер FTS5), при конкурентной записи
+    в режиме WAL сразу получает «database is locked».
+    """
+    begin_immediate = False
+
+    def _start_transaction_under_autocommit(self):
+        self.cursor().execute(
+            'BEGIN IMMEDIATE' if self.begin_immediate else 'BEGIN'
+        )
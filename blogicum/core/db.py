@@ -0,0 +1,168 @@
+import time
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DatabaseError, connections, transaction
+
+_query_wrappers = ContextVar('query_wrappers', default=())
+_last_checkout = ContextVar('last_checkout', default=None)
+
+
+def configure_sqlite(sender, connection, **kwargs):
+    """
+    Применяет прагмы из настройки SQLITE_PRAGMAS
+    к каждому новому соединению с SQLite.
+    """
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        for name, value in settings.SQLITE_PRAGMAS.items():
+            cursor.execute(f'PRAGMA {name} = {value}')
+
+
+@contextmanager
+def immediate_atomic(using=None):
+    """
+    transaction.atomic() для путей записи, которые
+    читают базу до изменения. На SQLite внешняя
+    транзакция начинается с BEGIN IMMEDIATE; вложенный
+    блок работает как обычный atomic().
+    """
+    connection = transaction.get_connection(using)
+    connection.begin_immediate = True
+    try:
+        with transaction.atomic(using):
+            connection.begin_immediate = False
+            yield
+    finally:
+        connection.begin_immediate = False
+
+
+@contextmanager
+def wrap_queries(wrapper):
+    """
+    Подключает execute_wrapper ко всем базам текущего потока.
+    Обёртка запоминается в контексте: потоки, которым
+    передана работа запроса, подключают её к своим
+    соединениям через inherit_query_wrappers.
+    """
+    token = _query_wrappers.set(_query_wrappers.get() + (wrapper,))
+    try:
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(wrapper))
+            yield
+    finally:
+        _query_wrappers.reset(token)
+
+
+@contextmanager
+def inherit_query_wrappers():
+    """Подключает обёртки запросов из скопированного контекста."""
+    with ExitStack() as stack:
+        for wrapper in _query_wrappers.get():
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(wrapper))
+        yield
+
+
+def estimated_count(model, using='default'):
+    """
+    Оценка количества строк таблицы модели по статистике
+    планировщика: pg_class.reltuples для PostgreSQL,
+    sqlite_stat1 (заполняется ANALYZE) для SQLite.
+    None, если статистики нет.
+    """
+    connection = connections[using]
+    table = model._meta.db_table
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            cursor.execute(
+                'SELECT reltuples FROM pg_class WHERE relname = %s', [table]
+            )
+            row = cursor.fetchone()
+            return int(row[0]) if row and row[0] >= 0 else None
+        if connection.vendor != 'sqlite':
+            return None
+        try:
+            # Первое число stat — строки индекса; у частичных
+            # индексов их меньше, чем в таблице, поэтому берётся
+            # наибольшее.
+            cursor.execute(
+                'SELECT MAX(CAST(stat AS INTEGER)) FROM sqlite_stat1'
+                ' WHERE tbl = %s',
+                [table]
+            )
+        except DatabaseError:
+            # Таблицы sqlite_stat1 нет, пока не выполнен ANALYZE.
+            return None
+        row = cursor.fetchone()
+    return row[0] if row else None
+
+
+def analyze(using='default'):
+    """
+    Обновление статистики планировщика (ANALYZE):
+    по ней строятся планы запросов и оценка
+    количества строк в estimated_count.
+    """
+    connection = connections[using]
+    if connection.vendor not in ('sqlite', 'postgresql'):
+        return
+    with connection.cursor() as cursor:
+        cursor.execute('ANALYZE')
+
+
+class ConnectionPool:
+    """
+    Выдача соединений с базой обработчикам запросов.
+    Соединения Django живут в потоке обработчика до истечения
+    CONN_MAX_AGE; при выдаче пул проверяет уже открытые
+    соединения (is_usable: SELECT 1 для PostgreSQL) и закрывает
+    сломанные. Новые соединения не открываются: Django открывает
+    их при первом запросе к базе, и ответы без запросов
+    (из кэша, 304) обходятся без соединения.
+    Проверяются базы с включённым CONN_HEALTH_CHECKS.
+    """
+
+    def checkout(self):
+        """
+        Готовит соединения потока к обработке запроса.
+        Возвращает пару: все ли соединения переиспользованы
+        и время проверки в миллисекундах. Результат
+        доступен InstrumentationMiddleware через pop_checkout.
+        """
+        start = time.perf_counter()
+        reused = True
+        for connection in connections.all():
+            if not connection.settings_dict.get('CONN_HEALTH_CHECKS'):
+                continue
+            if connection.connection is None:
+                reused = False
+            elif not connection.is_usable():
+                connection.close()
+                reused = False
+        wait_ms = (time.perf_counter() - start) * 1000
+        _last_checkout.set((reused, wait_ms))
+        return reused, wait_ms
+
+    def adopt_checkout(self, context):
+        """
+        Переносит результат выдачи соединений из контекста,
+        в котором работал другой поток, в текущий.
+        """
+        _last_checkout.set(context.get(_last_checkout))
+
+    def pop_checkout(self):
+        """Результат последней выдачи соединений в текущем контексте."""
+        checkout = _last_checkout.get()
+        _last_checkout.set(None)
+        return checkout
+
+
+pool = ConnectionPool()
+
+
+def checkout_connections(sender, **kwargs):
+    pool.checkout()
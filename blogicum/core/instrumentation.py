@@ -0,0 +1,95 @@
+import json
+import math
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.template.backends.django import Template as BackendTemplate
+
+from .db import wrap_queries
+
+_current = ContextVar('instrumentation_timings', default=None)
+
+
+class Timings:
+    """Замеры одного запроса, миллисекунды."""
+
+    def __init__(self):
+        self.queries = 0
+        self.db_ms = 0.0
+        self.template_ms = 0.0
+        self._template_depth = 0
+
+
+def _record_query(execute, sql, params, many, context):
+    timings = _current.get()
+    if timings is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        timings.queries += 1
+        timings.db_ms += (time.perf_counter() - start) * 1000
+
+
+_backend_render = BackendTemplate.render
+
+
+def _timed_render(self, context=None, request=None):
+    timings = _current.get()
+    if timings is None:
+        return _backend_render(self, context, request)
+    timings._template_depth += 1
+    start = time.perf_counter()
+    try:
+        return _backend_render(self, context, request)
+    finally:
+        timings._template_depth -= 1
+        # Вложенный рендеринг (render_to_string в шаблонном
+        # теге) уже входит во время внешнего шаблона.
+        if not timings._template_depth:
+            timings.template_ms += (time.perf_counter() - start) * 1000
+
+
+def install_template_timer():
+    """
+    Подключает замер времени рендеринга шаблонов
+    Django-бэкенда. Без активного замера
+    рендеринг не изменяется.
+    """
+    BackendTemplate.render = _timed_render
+
+
+@contextmanager
+def collect_timings():
+    """
+    Контекст сбора замеров: запросы ко всем базам
+    и рендеринг шаблонов внутри него.
+    """
+    timings = Timings()
+    token = _current.set(timings)
+    try:
+        with wrap_queries(_record_query):
+            yield timings
+    finally:
+        _current.reset(token)
+
+
+def write_sample(path, sample):
+    with open(path, 'a', encoding='utf-8') as log:
+        log.write(json.dumps(sample, ensure_ascii=False) + '\n')
+
+
+def read_samples(path):
+    with open(path, encoding='utf-8') as log:
+        for line in log:
+            if line.strip():
+                yield json.loads(line)
+
+
+def percentile(values, percent):
+    """Перцентиль по методу ближайшего ранга."""
+    ordered = sorted(values)
+    rank = max(math.ceil(percent / 100 * len(ordered)), 1)
+    return ordered[rank - 1]
@@ -0,0 +1,204 @@
+import logging
+import multiprocessing
+import threading
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import close_old_connections, connections
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .models import Job
+
+logger = logging.getLogger(__name__)
+
+_tasks = {}
+
+
+class UnknownTask(LookupError):
+    """Задача не зарегистрирована декоратором @task."""
+
+
+def task(name):
+    """
+    Декоратор регистрации фоновой задачи под именем `name`.
+    Параметры задачи передаются именованными аргументами
+    и должны сериализоваться в JSON.
+    Добавляет функции метод enqueue(**kwargs).
+    Модули tasks.py приложений загружаются автоматически.
+    """
+    def decorator(func):
+        _tasks[name] = func
+        func.task_name = name
+        func.enqueue = lambda **kwargs: enqueue(name, kwargs)
+        return func
+    return decorator
+
+
+def get_task(name):
+    try:
+        return _tasks[name]
+    except KeyError:
+        raise UnknownTask(f'Задача {name} не зарегистрирована.')
+
+
+def enqueue(name, kwargs=None, delay=0, max_attempts=None):
+    """
+    Постановка задачи в очередь.
+    Задача сохраняется в той же транзакции, что и вызывающий
+    код, и становится видна обработчикам после её фиксации.
+    При JOBS_EAGER задача выполняется сразу.
+    """
+    kwargs = kwargs or {}
+    if settings.JOBS_EAGER:
+        get_task(name)(**kwargs)
+        return None
+    return Job.objects.create(
+        name=name,
+        kwargs=kwargs,
+        run_at=timezone.now() + timedelta(seconds=delay),
+        max_attempts=max_attempts or settings.JOBS_MAX_ATTEMPTS,
+    )
+
+
+def _available(now):
+    """
+    Задачи, готовые к выполнению: ожидающие своего времени
+    и захваченные обработчиком, который не уложился
+    в тайм-аут видимости.
+    """
+    return (
+        Q(status=Job.Status.PENDING, run_at__lte=now)
+        | Q(status=Job.Status.RUNNING, locked_until__lte=now)
+    )
+
+
+def claim_jobs(limit, visibility_timeout=None):
+    """
+    Захват до `limit` готовых задач.
+    Каждая задача захватывается условным UPDATE, поэтому
+    одну задачу не выполнят два обработчика одновременно.
+    Незавершённая за `visibility_timeout` секунд задача
+    снова становится доступной.
+    """
+    if visibility_timeout is None:
+        visibility_timeout = settings.JOBS_VISIBILITY_TIMEOUT
+    now = timezone.now()
+    locked_until = now + timedelta(seconds=visibility_timeout)
+    claimed = []
+    candidates = Job.objects.filter(_available(now)).order_by(
+        'run_at', 'id'
+    ).values_list('pk', flat=True)[:limit]
+    for pk in list(candidates):
+        if Job.objects.filter(_available(now), pk=pk).update(
+            status=Job.Status.RUNNING,
+            locked_until=locked_until,
+            attempts=F('attempts') + 1,
+            updated_at=now,
+        ):
+            claimed.append(pk)
+    return list(Job.objects.filter(pk__in=claimed).order_by('run_at', 'id'))
+
+
+def run_job(job):
+    """
+    Выполнение захваченной задачи.
+    Выполненная задача удаляется из очереди, упавшая —
+    откладывается с экспоненциальной задержкой, а после
+    max_attempts попыток остаётся со статусом «Ошибка».
+    Возвращает True, если задача выполнена и удалена этим
+    обработчиком: задачу, перехваченную после тайм-аута
+    видимости, завершает перехвативший её обработчик.
+    """
+    # Задача изменяется, только если её не перехватил другой
+    # обработчик после истечения тайм-аута видимости.
+    own = Job.objects.filter(pk=job.pk, locked_until=job.locked_until)
+    try:
+        if job.attempts > job.max_attempts:
+            raise RuntimeError('Превышено число попыток выполнения.')
+        get_task(job.name)(**job.kwargs)
+    except Exception:
+        logger.exception('Ошибка выполнения задачи %s', job)
+        now = timezone.now()
+        retry = job.attempts < job.max_attempts
+        own.update(
+            status=Job.Status.PENDING if retry else Job.Status.FAILED,
+            run_at=now + timedelta(
+                seconds=settings.JOBS_RETRY_DELAY * 2 ** (job.attempts - 1)
+            ),
+            locked_until=None,
+            last_error=traceback.format_exc(),
+            updated_at=now,
+        )
+        return False
+    deleted, _ = own.delete()
+    return bool(deleted)
+
+
+def work(stop=None, once=False, batch_size=1, poll_interval=1.0,
+         visibility_timeout=None):
+    """
+    Цикл обработчика очереди.
+    Работает до установки события `stop`, а при once=True —
+    до опустошения очереди.
+    Возвращает количество выполненных задач.
+    """
+    stop = stop or threading.Event()
+    processed = 0
+    while not stop.is_set():
+        close_old_connections()
+        jobs = claim_jobs(batch_size, visibility_timeout)
+        if not jobs:
+            if once:
+                break
+            stop.wait(poll_interval)
+            continue
+        for job in jobs:
+            processed += run_job(job)
+    return processed
+
+
+def _pool_work(stop, options):
+    """Обработчик пула; закрывает свои соединения с базой."""
+    try:
+        work(stop, **options)
+    finally:
+        connections.close_all()
+
+
+def run_workers(workers=1, processes=False, **options):
+    """
+    Запуск `workers` обработчиков в потоках
+    или процессах (processes=True).
+    Один обработчик в режиме потоков работает
+    в текущем потоке.
+    """
+    if workers == 1 and not processes:
+        return work(**options)
+    if processes:
+        # Дочерние процессы не должны наследовать
+        # открытые соединения с базой.
+        connections.close_all()
+        context = multiprocessing.get_context('fork')
+        stop = context.Event()
+        pool = [
+            context.Process(target=_pool_work, args=(stop, options))
+            for _ in range(workers)
+        ]
+    else:
+        stop = threading.Event()
+        pool = [
+            threading.Thread(target=_pool_work, args=(stop, options))
+            for _ in range(workers)
+        ]
+    for worker in pool:
+        worker.start()
+    try:
+        for worker in pool:
+            worker.join()
+    except KeyboardInterrupt:
+        stop.set()
+        for worker in pool:
+            worker.join()
+    return None
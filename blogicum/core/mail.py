@@ -0,0 +1,26 @@
+from django.core.mail.backends.base import BaseEmailBackend
+
+from .jobs import enqueue
+
+
+class QueuedEmailBackend(BaseEmailBackend):
+    """
+    Бэкенд отправки писем через очередь фоновых задач.
+    Письма отправляет обработчик очереди
+    бэкендом из настройки JOBS_EMAIL_BACKEND.
+    Вложения не поддерживаются.
+    """
+    def send_messages(self, email_messages):
+        for message in email_messages:
+            enqueue('core.send_email', {
+                'subject': message.subject,
+                'body': message.body,
+                'from_email': message.from_email,
+                'to': message.to,
+                'cc': message.cc,
+                'bcc': message.bcc,
+                'reply_to': message.reply_to,
+                'headers': message.extra_headers,
+                'alternatives': getattr(message, 'alternatives', []),
+            })
+        return len(email_messages)
@@ -0,0 +1,22 @@
+from core.db import analyze
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    """
+    Обновление статистики планировщика базы.
+    Запускается периодически и после массовой загрузки:
+    без статистики списки админки считают строки точно.
+    """
+    help = 'Выполняет ANALYZE базы данных.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--database',
+            default='default',
+            help='Псевдоним базы данных.'
+        )
+
+    def handle(self, *args, **options):
+        analyze(options['database'])
+        self.stdout.write(self.style.SUCCESS('Статистика базы обновлена.'))
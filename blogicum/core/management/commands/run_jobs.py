@@ -0,0 +1,60 @@
+from core.jobs import run_workers
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    """
+    Обработчик очереди фоновых задач.
+    """
+    help = 'Выполняет задачи из очереди core.Job.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=1,
+            help='Количество обработчиков.'
+        )
+        parser.add_argument(
+            '--processes',
+            action='store_true',
+            help='Запускать обработчики в процессах, а не в потоках.'
+        )
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Завершить работу, когда очередь опустеет.'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1,
+            help='Количество задач, захватываемых обработчиком за раз.'
+        )
+        parser.add_argument(
+            '--poll-interval',
+            type=float,
+            default=1.0,
+            help='Пауза между опросами пустой очереди, секунд.'
+        )
+        parser.add_argument(
+            '--visibility-timeout',
+            type=int,
+            default=None,
+            help='Время на выполнение задачи, после которого она'
+            ' возвращается в очередь, секунд.'
+        )
+
+    def handle(self, *args, **options):
+        processed = run_workers(
+            workers=options['workers'],
+            processes=options['processes'],
+            once=options['once'],
+            batch_size=options['batch_size'],
+            poll_interval=options['poll_interval'],
+            visibility_timeout=options['visibility_timeout'],
+        )
+        if processed is not None:
+            self.stdout.write(
+                self.style.SUCCESS(f'Выполнено задач: {processed}')
+            )
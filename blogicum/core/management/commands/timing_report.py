@@ -0,0 +1,89 @@
+from collections import defaultdict
+
+from core.instrumentation import percentile, read_samples
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+METRICS = ('total_ms', 'db_ms', 'template_ms', 'queries', 'conn_ms')
+
+
+def parse_percentiles(value):
+    """Перцентили из списка целых чисел от 1 до 100 через запятую."""
+    try:
+        percents = [int(part) for part in value.split(',')]
+    except ValueError:
+        percents = []
+    if not percents or not all(0 < percent <= 100 for percent in percents):
+        raise CommandError(
+            'Укажите --percentiles целыми числами от 1 до 100'
+            ' через запятую, например 50,90,99.'
+        )
+    return percents
+
+
+class Command(BaseCommand):
+    """
+    Отчёт по замерам InstrumentationMiddleware:
+    перцентили времени ответа, времени запросов к базе,
+    рендеринга шаблонов, числа запросов и проверки
+    соединения с базой по именам URL, а также доля
+    запросов с переиспользованным соединением.
+    """
+    help = 'Выводит перцентили замеров запросов по именам URL.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--path',
+            default=None,
+            help='Файл замеров, по умолчанию INSTRUMENTATION_LOG.'
+        )
+        parser.add_argument(
+            '--percentiles',
+            default='50,90,99',
+            help='Перцентили через запятую.'
+        )
+        parser.add_argument(
+            '--sort',
+            choices=METRICS,
+            default='total_ms',
+            help='Метрика, по старшему перцентилю которой'
+            ' сортируются URL.'
+        )
+
+    def handle(self, *args, **options):
+        path = options['path'] or settings.INSTRUMENTATION_LOG
+        percents = parse_percentiles(options['percentiles'])
+        samples = defaultdict(list)
+        try:
+            for sample in read_samples(path):
+                samples[sample['view']].append(sample)
+        except (OSError, TypeError) as error:
+            raise CommandError(f'Не удалось прочитать замеры: {error}')
+
+        rows = []
+        for view, view_samples in samples.items():
+            row = {'view': view, 'count': len(view_samples)}
+            for metric in METRICS:
+                values = [sample.get(metric, 0) for sample in view_samples]
+                for percent in percents:
+                    row[f'{metric}_p{percent}'] = percentile(values, percent)
+            row['conn_reuse'] = sum(
+                bool(sample.get('conn_reused')) for sample in view_samples
+            ) / len(view_samples)
+            rows.append(row)
+        rows.sort(
+            key=lambda row: row[f'{options["sort"]}_p{percents[-1]}'],
+            reverse=True
+        )
+
+        columns = ['view', 'count'] + [
+            f'{metric}_p{percent}'
+            for metric in METRICS for percent in percents
+        ] + ['conn_reuse']
+        self.stdout.write('\t'.join(columns))
+        for row in rows:
+            self.stdout.write('\t'.join(
+                f'{row[column]:.1f}' if isinstance(row[column], float)
+                else str(row[column])
+                for column in columns
+            ))
@@ -0,0 +1,128 @@
+import asyncio
+import random
+import time
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.utils import timezone
+
+from .db import pool
+from .instrumentation import (collect_timings, install_template_timer,
+                              write_sample)
+from .nplusone import detect_n_plus_one
+
+
+class HybridMiddleware:
+    """
+    Основа middleware для WSGI и ASGI: под ASGI вызов
+    возвращает корутину __acall__, и Django не переводит
+    обработку запроса в отдельный поток.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if asyncio.iscoroutinefunction(get_response):
+            self._is_coroutine = asyncio.coroutines._is_coroutine
+
+    def __call__(self, request):
+        if asyncio.iscoroutinefunction(self):
+            return self.__acall__(request)
+        return self.handle(request)
+
+
+class InstrumentationMiddleware(HybridMiddleware):
+    """
+    Замер количества и времени запросов к базе, времени
+    рендеринга шаблонов, проверки соединения с базой
+    и общего времени ответа. Замеры отдаются в заголовке
+    Server-Timing и пишутся в INSTRUMENTATION_LOG
+    для отчёта timing_report.
+    Включается настройкой INSTRUMENTATION_ENABLED.
+    """
+    def __init__(self, get_response):
+        if not settings.INSTRUMENTATION_ENABLED:
+            raise MiddlewareNotUsed
+        install_template_timer()
+        super().__init__(get_response)
+
+    def handle(self, request):
+        start = time.perf_counter()
+        with collect_timings() as timings:
+            response = self.get_response(request)
+        sample = self.finish(request, response, timings, start)
+        if sample is not None:
+            write_sample(settings.INSTRUMENTATION_LOG, sample)
+        return response
+
+    async def __acall__(self, request):
+        start = time.perf_counter()
+        with collect_timings() as timings:
+            response = await self.get_response(request)
+        sample = self.finish(request, response, timings, start)
+        if sample is not None:
+            await sync_to_async(write_sample, thread_sensitive=False)(
+                settings.INSTRUMENTATION_LOG, sample
+            )
+        return response
+
+    def finish(self, request, response, timings, start):
+        """
+        Добавляет заголовок Server-Timing.
+        Возвращает замер для журнала или None,
+        если замер не пишется.
+        """
+        total_ms = (time.perf_counter() - start) * 1000
+        conn_reused, conn_ms = pool.pop_checkout() or (None, 0.0)
+        server_timing = [
+            f'db;dur={timings.db_ms:.1f};desc="{timings.queries} queries"',
+            f'tpl;dur={timings.template_ms:.1f}',
+            f'total;dur={total_ms:.1f}',
+        ]
+        if conn_reused is not None:
+            server_timing.append(
+                f'conn;dur={conn_ms:.1f};'
+                f'desc="{"reused" if conn_reused else "new"}"'
+            )
+        response['Server-Timing'] = ', '.join(server_timing)
+        if not (
+            settings.INSTRUMENTATION_LOG
+            and request.resolver_match
+            and random.random() < settings.INSTRUMENTATION_SAMPLE_RATE
+        ):
+            return None
+        return {
+            'time': timezone.now().isoformat(),
+            'view': request.resolver_match.view_name,
+            'method': request.method,
+            'status': response.status_code,
+            'queries': timings.queries,
+            'db_ms': round(timings.db_ms, 3),
+            'template_ms': round(timings.template_ms, 3),
+            'total_ms': round(total_ms, 3),
+            'conn_ms': round(conn_ms, 3),
+            'conn_reused': conn_reused,
+        }
+
+
+class NPlusOneMiddleware(HybridMiddleware):
+    """
+    Поиск N+1 запросов в обработке запроса.
+    Режим задаётся настройкой NPLUSONE_MODE:
+    'warn' — предупреждение, 'raise' — исключение,
+    None — проверка отключена.
+    """
+    def __init__(self, get_response):
+        if not settings.NPLUSONE_MODE:
+            raise MiddlewareNotUsed
+        super().__init__(get_response)
+
+    def handle(self, request):
+        with detect_n_plus_one(f'{request.method} {request.path}'):
+            return self.get_response(request)
+
+    async def __acall__(self, request):
+        with detect_n_plus_one(f'{request.method} {request.path}'):
+            return await self.get_response(request)
@@ -4,13 +4,24 @@ from django.db import models
 class DateTimeModel(models.Model):
     """
     Абстрактная модель.
-    Добавляет к модели дату создания.
+    Добавляет к модели даты создания и изменения.
     """
     created_at = models.DateTimeField('Добавлено', auto_now_add=True)
+    updated_at = models.DateTimeField(
+        'Изменено', auto_now=True, db_index=True
+    )
 
     class Meta:
         abstract = True
 
+    @property
+    def version(self):
+        """
+        Версия объекта для кэширования, ETag и выгрузок:
+        время последнего изменения в микросекундах.
+        """
+        return int(self.updated_at.timestamp() * 1_000_000)
+
 
 class PublishedModel(models.Model):
     """
@@ -25,3 +36,44 @@ class PublishedModel(models.Model):
 
     class Meta:
         abstract = True
+
+
+class Job(DateTimeModel):
+    """
+    Модель "Задачи".
+    Очередь фоновых задач в базе данных,
+    выполняемых командой run_jobs.
+    """
+    class Status(models.TextChoices):
+        PENDING = 'pending', 'В очереди'
+        RUNNING = 'running', 'Выполняется'
+        FAILED = 'failed', 'Ошибка'
+
+    name = models.CharField('Задача', max_length=128)
+    kwargs = models.JSONField('Параметры', default=dict, blank=True)
+    status = models.CharField(
+        'Статус',
+        max_length=16,
+        choices=Status.choices,
+        default=Status.PENDING
+    )
+    run_at = models.DateTimeField('Выполнить после')
+    locked_until = models.DateTimeField(
+        'Заблокирована до', null=True, blank=True
+    )
+    attempts = models.PositiveSmallIntegerField('Попыток', default=0)
+    max_attempts = models.PositiveSmallIntegerField('Максимум попыток')
+    last_error = models.TextField('Последняя ошибка', blank=True)
+
+    class Meta:
+        ordering = ('run_at', 'id')
+        verbose_name = 'задача'
+        verbose_name_plural = 'Фоновые задачи'
+        indexes = (
+            models.Index(
+                fields=('status', 'run_at', 'id'), name='job_queue_idx'
+            ),
+        )
+
+    def __str__(self):
+        return f'{self.name} #{self.pk}'
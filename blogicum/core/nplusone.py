@@ -0,0 +1,136 @@
+import re
+import sys
+import warnings
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+
+from django.conf import settings
+
+from .db import wrap_queries
+
+_current = ContextVar('nplusone_queries', default=None)
+
+# Списки параметров IN разной длины — один и тот же запрос.
+_IN_LIST = re.compile(r'IN \((?:%s, )*%s\)')
+# Модули замеров оборачивают рендеринг и запросы,
+# их строки не указывают на источник запроса.
+_SKIPPED_FILES = {
+    Path(__file__).resolve(),
+    Path(__file__).resolve().with_name('instrumentation.py'),
+}
+
+
+class NPlusOneWarning(UserWarning):
+    """Повторяющиеся однотипные запросы к базе."""
+
+
+class NPlusOneError(Exception):
+    """Повторяющиеся однотипные запросы к базе в режиме raise."""
+
+
+def fingerprint(sql):
+    """Форма запроса без значений параметров."""
+    return _IN_LIST.sub('IN (...)', sql)
+
+
+def _template_location(frame):
+    while frame is not None:
+        if frame.f_code.co_name == 'render_annotated':
+            node = frame.f_locals.get('self')
+            token = getattr(node, 'token', None)
+            origin = getattr(node, 'origin', None)
+            if token is not None and origin is not None:
+                return f'{origin.template_name}:{token.lineno}'
+        frame = frame.f_back
+    return None
+
+
+def _code_location(frame):
+    base_dir = Path(settings.BASE_DIR).resolve()
+    while frame is not None:
+        filename = Path(frame.f_code.co_filename).resolve()
+        if (
+            filename not in _SKIPPED_FILES
+            and base_dir in filename.parents
+            and 'site-packages' not in filename.parts
+        ):
+            return f'{filename.relative_to(base_dir)}:{frame.f_lineno}'
+        frame = frame.f_back
+    return None
+
+
+class QueryLog:
+    """
+    Формы запросов, количество их выполнений
+    и место первого выполнения: строка шаблона
+    и строка кода проекта.
+    """
+    def __init__(self):
+        self.counts = Counter()
+        self.locations = {}
+
+    def add(self, sql, frame):
+        key = fingerprint(sql)
+        self.counts[key] += 1
+        if key not in self.locations:
+            self.locations[key] = (
+                _template_location(frame), _code_location(frame)
+            )
+
+    def repeated(self, threshold):
+        return [
+            (sql, count, *self.locations[sql])
+            for sql, count in self.counts.most_common()
+            if count >= threshold
+        ]
+
+
+def _record_query(execute, sql, params, many, context):
+    log = _current.get()
+    if log is not None:
+        log.add(sql, sys._getframe(1))
+    return execute(sql, params, many, context)
+
+
+@contextmanager
+def track_queries():
+    """Контекст записи форм запросов ко всем базам."""
+    log = QueryLog()
+    token = _current.set(log)
+    try:
+        with wrap_queries(_record_query):
+            yield log
+    finally:
+        _current.reset(token)
+
+
+def report(repeated, title):
+    lines = [f'N+1 запросы: {title}']
+    for sql, count, template, code in repeated:
+        where = ', '.join(filter(None, (template, code))) or 'неизвестно'
+        lines.append(f'{count}× [{where}] {sql}')
+    return '\n'.join(lines)
+
+
+@contextmanager
+def detect_n_plus_one(title='', mode=None, threshold=None):
+    """
+    Проверка N+1 запросов: однотипные запросы,
+    выполненные не менее `threshold` раз, приводят
+    к предупреждению (mode='warn') или исключению
+    NPlusOneError (mode='raise').
+    По умолчанию — настройки NPLUSONE_MODE и NPLUSONE_THRESHOLD.
+    """
+    mode = mode or settings.NPLUSONE_MODE
+    threshold = threshold or settings.NPLUSONE_THRESHOLD
+    with track_queries() as log:
+        yield log
+    repeated = log.repeated(threshold)
+    if not repeated:
+        return
+    message = report(repeated, title)
+    if mode == 'raise':
+        raise NPlusOneError(message)
+    warnings.warn(message, NPlusOneWarning, stacklevel=3)
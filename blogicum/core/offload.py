@@ -0,0 +1,68 @@
+import asyncio
+import contextvars
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import wraps
+
+from django.conf import settings
+from django.db import close_old_connections
+
+from .db import inherit_query_wrappers, pool
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor():
+    """
+    Пул потоков представлений, выполняемых под ASGI.
+    Размер пула (ASYNC_VIEW_WORKERS) ограничивает число
+    одновременных обращений к базе: у каждого потока
+    своё постоянное соединение.
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.ASYNC_VIEW_WORKERS,
+                thread_name_prefix='offload',
+            )
+    return _executor
+
+
+def _run_view(view, request, args, kwargs):
+    close_old_connections()
+    # Проверяется соединение потока пула: представление
+    # работает с ним, а не с соединением потока обработчика.
+    pool.checkout()
+    try:
+        with inherit_query_wrappers():
+            response = view(request, *args, **kwargs)
+            # Отложенный рендеринг шаблона обращается к базе,
+            # поэтому тоже выполняется в потоке пула.
+            if hasattr(response, 'render') and not response.is_rendered:
+                response.render()
+        return response
+    finally:
+        close_old_connections()
+
+
+def offload(view):
+    """
+    Асинхронный вариант синхронного представления:
+    оно выполняется в пуле потоков get_executor(), и пока
+    представление ждёт базу, цикл событий обслуживает
+    другие запросы. Контекст запроса (замеры, поиск N+1)
+    передаётся в поток пула, а результат проверки
+    соединения потока пула — обратно в замеры.
+    """
+    @wraps(view)
+    async def async_view(request, *args, **kwargs):
+        context = contextvars.copy_context()
+        response = await asyncio.get_running_loop().run_in_executor(
+            get_executor(), context.run,
+            _run_view, view, request, args, kwargs
+        )
+        pool.adopt_checkout(context)
+        return response
+    return async_view
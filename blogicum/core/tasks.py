@@ -0,0 +1,16 @@
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+
+from .jobs import task
+
+
+@task('core.send_email')
+def send_email(subject, body, from_email, to, cc=(), bcc=(),
+               reply_to=(), headers=None, alternatives=()):
+    """Отправка письма настроенным в JOBS_EMAIL_BACKEND бэкендом."""
+    message = EmailMultiAlternatives(
+        subject, body, from_email, to, bcc=bcc, cc=cc, reply_to=reply_to,
+        headers=headers, alternatives=[tuple(item) for item in alternatives],
+        connection=get_connection(settings.JOBS_EMAIL_BACKEND),
+    )
+    message.send()
@@ -1,35 +1,327 @@
-from datetime import datetime, timezone
+import base64
+from collections.abc import Sequence
 
-from blog.models import Post
+from blog.caching import feed_count_timeout
+from blog.constants import ESTIMATED_COUNT_THRESHOLD, NUMBERED_PAGES_LIMIT
+from blog.models import Comment, Post
+from core.db import estimated_count
+from django.core.cache import cache
 from django.core.paginator import Paginator
-from django.db.models import Count
+from django.db.models import Count, F, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from django.utils.functional import cached_property
 
 
-def paginate_page(request, object_list, objects_on_page):
-    """Пагинатор."""
-    paginator = Paginator(object_list, objects_on_page)
-    page_number = request.GET.get('page')
-    return paginator.get_page(page_number)
+class KeysetPage(Sequence):
+    """
+    Страница курсорной пагинации.
+    Вместо номера страницы хранит
+    курсоры соседних страниц.
+    """
+    is_cursor = True
+
+    def __init__(self, object_list, paginator, has_next, has_previous):
+        self.object_list = object_list
+        self.paginator = paginator
+        self._has_next = has_next
+        self._has_previous = has_previous
+
+    def __repr__(self):
+        return f'<Cursor page of {len(self)} objects>'
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self._has_next
+
+    def has_previous(self):
+        return self._has_previous
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+    @property
+    def next_cursor(self):
+        if not self.has_next():
+            return None
+        return self.paginator.encode_cursor(self.object_list[-1])
+
+    @property
+    def previous_cursor(self):
+        if not self.has_previous():
+            return None
+        return self.paginator.encode_cursor(self.object_list[0])
+
+
+class KeysetPaginator:
+    """
+    Курсорный пагинатор.
+    Выбирает страницу условием по паре (field, id)
+    вместо OFFSET, поэтому стоимость запроса
+    не зависит от глубины страницы.
+    По умолчанию — публикации «от новых к старым».
+    """
+    def __init__(
+        self, object_list, per_page, field='pub_date', descending=True
+    ):
+        self.object_list = object_list
+        self.per_page = int(per_page)
+        self.field = field
+        self.descending = descending
+
+    def encode_cursor(self, obj):
+        value = f'{getattr(obj, self.field).isoformat()}|{obj.pk}'
+        return base64.urlsafe_b64encode(value.encode()).decode().rstrip('=')
+
+    @staticmethod
+    def decode_cursor(cursor):
+        """
+        Возвращает пару (дата, id)
+        или вызывает ValueError для
+        некорректного курсора.
+        """
+        try:
+            value = base64.urlsafe_b64decode(
+                cursor + '=' * (-len(cursor) % 4)
+            ).decode()
+            date, pk = value.split('|')
+            date = parse_datetime(date)
+            pk = int(pk)
+        except (TypeError, ValueError, UnicodeDecodeError):
+            raise ValueError('Некорректный курсор страницы.')
+        if date is None:
+            raise ValueError('Некорректный курсор страницы.')
+        return date, pk
+
+    def get_page(self, after=None, before=None):
+        """
+        Страница записей, следующих за курсором `after`
+        или предшествующих курсору `before`.
+        Некорректный курсор приводит к первой странице.
+        """
+        try:
+            if after:
+                return self._page_after(*self.decode_cursor(after))
+            if before:
+                return self._page_before(*self.decode_cursor(before))
+        except ValueError:
+            pass
+        return self._page_after()
+
+    def _ordered(self, forward):
+        """
+        Выборка в порядке пагинации (forward=True)
+        или в обратном ему порядке.
+        """
+        prefix = '-' if self.descending == forward else ''
+        return self.object_list.order_by(
+            f'{prefix}{self.field}', f'{prefix}id'
+        )
+
+    def _beyond(self, date, pk, forward):
+        """Условие «строго дальше курсора» в заданном направлении."""
+        lookup = 'lt' if self.descending == forward else 'gt'
+        return (
+            Q(**{f'{self.field}__{lookup}': date})
+            | Q(**{self.field: date, f'id__{lookup}': pk})
+        )
 
+    def _page_after(self, date=None, pk=None):
+        queryset = self._ordered(forward=True)
+        if date is not None:
+            queryset = queryset.filter(self._beyond(date, pk, forward=True))
+        object_list = list(queryset[:self.per_page + 1])
+        return KeysetPage(
+            object_list[:self.per_page],
+            self,
+            has_next=len(object_list) > self.per_page,
+            has_previous=date is not None,
+        )
 
-def queryset_filter(query):
+    def _page_before(self, date, pk):
+        queryset = self._ordered(forward=False).filter(
+            self._beyond(date, pk, forward=False)
+        )
+        object_list = list(queryset[:self.per_page + 1])
+        if len(object_list) <= self.per_page:
+            return self._page_after()
+        return KeysetPage(
+            object_list[self.per_page - 1::-1],
+            self,
+            has_next=True,
+            has_previous=True,
+        )
+
+
+class CachedCountPaginator(Paginator):
     """
-    Фильтрация запросов к моделям
-    приложения "blog".
+    Пагинатор, хранящий количество
+    объектов в кэше под ключом ленты.
     """
-    return query.filter(
-        pub_date__date__lt=datetime.now(timezone.utc),
-        is_published=True,
-    ).annotate(
-        comment_count=Count('comments')
-    ).order_by('-pub_date')
+    def __init__(self, *args, cache_key=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.cache_key = cache_key
+
+    @cached_property
+    def count(self):
+        if self.cache_key is None:
+            return super().count
+        count = cache.get(self.cache_key)
+        if count is None:
+            count = super().count
+            cache.set(self.cache_key, count, feed_count_timeout())
+        return count
 
 
-def query_select_related():
+class EstimatedCountPaginator(Paginator):
     """
-    Запрос к связанным моделям приложения "blog"
-    с фильтрацией по статусу категории.
+    Пагинатор списков админки для больших таблиц.
+    Количество объектов неотфильтрованного списка
+    берётся из статистики базы, если она не меньше
+    ESTIMATED_COUNT_THRESHOLD строк; иначе считается точно.
+    """
+    @cached_property
+    def count(self):
+        query = getattr(self.object_list, 'query', None)
+        if query is not None and not query.where:
+            estimate = estimated_count(self.object_list.model)
+            if estimate is not None and estimate >= ESTIMATED_COUNT_THRESHOLD:
+                return estimate
+        return super().count
+
+
+def paginate_page(request, object_list, objects_on_page, count_key=None):
     """
-    return Post.objects.select_related(
+    Пагинатор.
+    Для небольших выборок возвращает нумерованную страницу,
+    для больших и при наличии курсора в запросе — курсорную.
+    """
+    after = request.GET.get('after')
+    before = request.GET.get('before')
+    paginator = CachedCountPaginator(
+        object_list, objects_on_page, cache_key=count_key
+    )
+    if after or before:
+        return KeysetPaginator(object_list, objects_on_page).get_page(
+            after=after, before=before
+        )
+    if (
+        'page' not in request.GET
+        and paginator.num_pages > NUMBERED_PAGES_LIMIT
+    ):
+        return KeysetPaginator(object_list, objects_on_page).get_page()
+    return paginator.get_page(request.GET.get('page'))
+
+
+"""Поля публикации и связанных моделей, выводимые в карточке ленты."""
+FEED_CARD_FIELDS = (
+    'title', 'excerpt', 'pub_date', 'is_published', 'image',
+    'image_renditions', 'comment_count', 'updated_at', 'author__username',
+    'category__title', 'category__slug', 'category__is_published',
+    'category__updated_at',
+    'location__name', 'location__is_published', 'location__updated_at',
+)
+
+
+def feed_queryset(category=None, author=None, published_only=True):
+    """
+    Лента публикаций для вывода карточками:
+    общая, категории или автора.
+    Выбирает только поля карточки: вместо полного
+    текста — сохранённый анонс.
+    published_only=False — все публикации,
+    включая снятые и отложенные (для автора).
+    """
+    queryset = Post.objects.select_related(
         'category', 'location', 'author'
-    ).filter(category__is_published=True)
+    ).only(*FEED_CARD_FIELDS)
+    if category is not None:
+        queryset = queryset.filter(category=category)
+    if author is not None:
+        queryset = queryset.filter(author=author)
+    if published_only:
+        queryset = queryset.filter(
+            pub_date__lte=timezone.now(),
+            is_published=True,
+            category__is_published=True,
+        )
+    return queryset.order_by('-pub_date', '-id')
+
+
+def feed_state(request, **kwargs):
+    """
+    Состояние ленты для условных GET-запросов сверх
+    версий её страниц: последняя наступившая дата
+    публикации. Отложенная публикация появляется
+    в ленте без изменения данных и сигналов.
+    Одна строка по индексу post_feed_idx.
+    """
+    return {
+        'pub_date': Post.objects.filter(
+            is_published=True, pub_date__lte=timezone.now()
+        ).order_by('-pub_date').values_list('pub_date', flat=True).first()
+    }
+
+
+def post_state(request, pk):
+    """
+    Состояние страницы публикации для условных GET-запросов:
+    время изменения и сохранённый счётчик комментариев
+    (изменения комментариев сдвигают updated_at публикации)
+    и наступила ли дата публикации. None — публикации нет.
+    """
+    post = Post.objects.filter(pk=pk).values(
+        'updated_at', 'comment_count', 'pub_date'
+    ).first()
+    if post is None:
+        return None
+    post['pub_date'] = post['pub_date'] <= timezone.now()
+    return post
+
+
+def change_comment_count(post_id, delta):
+    """
+    Изменение счётчика комментариев публикации.
+    Вызывается в той же транзакции,
+    что и сохранение/удаление комментария.
+    """
+    posts = Post.objects.filter(pk=post_id)
+    if delta < 0:
+        posts = posts.filter(comment_count__gte=-delta)
+    return posts.update(
+        comment_count=F('comment_count') + delta,
+        updated_at=timezone.now()
+    )
+
+
+def actual_comment_count():
+    """Выражение фактического количества комментариев публикации."""
+    return Coalesce(
+        Subquery(
+            Comment.objects.filter(post=OuterRef('pk')).order_by().values(
+                'post'
+            ).annotate(total=Count('pk')).values('total')
+        ),
+        0
+    )
+
+
+def recount_comments(posts):
+    """
+    Пересчёт счётчика комментариев
+    для выбранных публикаций.
+    Возвращает количество исправленных публикаций.
+    """
+    actual = actual_comment_count()
+    drifted = posts.annotate(actual=actual).exclude(
+        comment_count=F('actual')
+    ).values_list('pk', flat=True)
+    return Post.objects.filter(pk__in=list(drifted)).update(
+        comment_count=actual, updated_at=timezone.now()
+    )
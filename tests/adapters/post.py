@@ -28,6 +28,8 @@ class PostModelAdapter(StudentModelAdapter):
             "is_published",
             "title",
             "text",
+            "excerpt",
+            "text_html",
             "pub_date",
             "author",
             "category",
@@ -10,6 +10,8 @@ from typing import (Any, Iterable, List, NamedTuple, Optional, Tuple, Type,
 import pytest
 from django.apps import apps
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
 from django.db.models import Field, Model
 from django.forms import BaseForm
 from django.http import HttpResponse
@@ -32,6 +34,19 @@ def enable_debug_false():
         yield
 
 
+@pytest.fixture(autouse=True)
+def fail_on_n_plus_one():
+    with override_settings(NPLUSONE_MODE="raise"):
+        yield
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
 class SafeImportFromContextManager:
     def __init__(
             self,
@@ -124,6 +139,27 @@ def another_user_client(another_user):
     return client
 
 
+def page_urls(post, profile: bool = True) -> Tuple[str, ...]:
+    """
+    Страницы, на которых показывается публикация.
+    Профиль автора не кэшируется в кэше страниц,
+    поэтому его можно исключить.
+    """
+    urls = ["/", f"/category/{post.category.slug}/"]
+    if profile:
+        urls.append(f"/profile/{post.author.username}/")
+    urls.append(f"/posts/{post.id}/")
+    return tuple(urls)
+
+
+def explain(queryset) -> str:
+    """План выполнения запроса SQLite."""
+    sql, params = queryset.query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN QUERY PLAN {sql}", params)
+        return "\n".join(row[-1] for row in cursor.fetchall())
+
+
 def get_post_list_context_key(
         user_client, page_url, page_load_err_msg, key_missing_msg
 ):
@@ -0,0 +1,96 @@
+import io
+
+import pytest
+import utils
+from blog.models import Post
+from core.db import estimated_count
+from django.core.management import call_command
+from django.db import connection
+from django.test.client import Client
+from django.test.utils import CaptureQueriesContext
+from mixer.backend.django import Mixer
+
+pytestmark = [pytest.mark.django_db]
+
+
+def changelist_queries(admin_client, url):
+    with CaptureQueriesContext(connection) as queries:
+        response = admin_client.get(url)
+    assert response.status_code == 200
+    return len(queries)
+
+
+@pytest.mark.parametrize("url", ("/admin/blog/post/", "/admin/blog/comment/"))
+def test_changelist_queries_constant(
+    url, admin_client: Client, mixer: Mixer, post_with_published_location
+):
+    post = post_with_published_location
+    mixer.blend("blog.Comment", post=post)
+    count = changelist_queries(admin_client, url)
+
+    posts = mixer.cycle(10).blend(
+        "blog.Post", category=post.category, location=post.location
+    )
+    for other_post in posts:
+        mixer.blend("blog.Comment", post=other_post)
+    assert changelist_queries(admin_client, url) == count, (
+        f"Убедитесь, что количество запросов списка `{url}` в админке"
+        " не зависит от количества строк."
+    )
+
+
+def test_estimated_count(monkeypatch, mixer: Mixer, user):
+    mixer.cycle(3).blend("blog.Post", author=user)
+    call_command("analyze_db", stdout=io.StringIO())
+    mixer.cycle(2).blend("blog.Post", author=user)
+    monkeypatch.setattr(utils, "ESTIMATED_COUNT_THRESHOLD", 1)
+
+    paginator = utils.EstimatedCountPaginator(Post.objects.all(), 10)
+    assert paginator.count == 3, (
+        "Убедитесь, что количество строк большой таблицы в админке"
+        " берётся из статистики базы."
+    )
+    filtered = utils.EstimatedCountPaginator(
+        Post.objects.filter(author=user), 10
+    )
+    assert filtered.count == 5
+
+    monkeypatch.setattr(utils, "ESTIMATED_COUNT_THRESHOLD", 100)
+    assert utils.EstimatedCountPaginator(Post.objects.all(), 10).count == 5
+
+
+def test_estimated_count_ignores_partial_indexes(mixer: Mixer, user):
+    mixer.cycle(3).blend("blog.Post", author=user, is_published=False)
+    mixer.blend("blog.Post", author=user, is_published=True)
+    call_command("analyze_db", stdout=io.StringIO())
+    assert estimated_count(Post) == 4, (
+        "Убедитесь, что оценка количества строк не берётся"
+        " из статистики частичного индекса."
+    )
+
+
+def test_estimated_count_without_stats(mixer: Mixer, user):
+    mixer.cycle(2).blend("blog.Post", author=user)
+    with connection.cursor() as cursor:
+        cursor.execute("DROP TABLE IF EXISTS sqlite_stat1")
+    with CaptureQueriesContext(connection) as queries:
+        assert estimated_count(Post) is None
+    assert len(queries) == 1, (
+        "Убедитесь, что без статистики оценка количества строк"
+        " выполняет не больше одного запроса."
+    )
+
+
+def test_category_page_without_post_forms(
+    admin_client: Client, post_with_published_location
+):
+    category = post_with_published_location.category
+    response = admin_client.get(
+        f"/admin/blog/category/{category.id}/change/"
+    )
+    content = response.content.decode("utf-8")
+    assert post_with_published_location.title not in content, (
+        "Убедитесь, что страница категории в админке не выводит"
+        " формы всех её публикаций."
+    )
+    assert f"category__id__exact={category.id}" in content
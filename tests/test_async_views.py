@@ -0,0 +1,111 @@
+import asyncio
+import threading
+
+import pytest
+from blog.models import Comment
+from blog.views import PostListView
+from core import instrumentation, middleware
+from core.db import pool
+from core.instrumentation import collect_timings
+from core.nplusone import NPlusOneError, detect_n_plus_one
+from core.offload import offload
+from django.contrib.auth.models import AnonymousUser
+from django.http import HttpResponse
+from django.test import AsyncClient, RequestFactory
+from mixer.backend.django import Mixer
+
+pytestmark = [pytest.mark.django_db(transaction=True)]
+
+
+def anonymous_request(path="/"):
+    request = RequestFactory().get(path)
+    request.user = AnonymousUser()
+    return request
+
+
+def test_offloaded_view_rendered_in_pool(post_with_published_location):
+    view = offload(PostListView.as_view())
+    assert asyncio.iscoroutinefunction(view), (
+        "Убедитесь, что `offload` возвращает асинхронное представление."
+    )
+    with collect_timings() as timings:
+        response = asyncio.run(view(anonymous_request()))
+    assert response.status_code == 200
+    assert response.is_rendered, (
+        "Убедитесь, что шаблон асинхронного представления рендерится"
+        " в потоке пула, а не в потоке обработчика."
+    )
+    assert post_with_published_location.title in response.content.decode()
+    assert timings.queries > 0, (
+        "Убедитесь, что запросы к базе из потока пула"
+        " попадают в замеры запроса."
+    )
+
+
+def test_connection_checked_in_pool(
+    monkeypatch, post_with_published_location
+):
+    threads = []
+    checkout = pool.checkout
+
+    def record_checkout():
+        threads.append(threading.current_thread().name)
+        return checkout()
+
+    monkeypatch.setattr(pool, "checkout", record_checkout)
+
+    async def get():
+        response = await offload(PostListView.as_view())(anonymous_request())
+        return response, pool.pop_checkout()
+
+    response, last_checkout = asyncio.run(get())
+    assert response.status_code == 200
+    assert len(threads) == 1 and threads[0].startswith("offload"), (
+        "Убедитесь, что соединение проверяется в потоке пула,"
+        " в котором выполняется представление."
+    )
+    assert last_checkout is not None, (
+        "Убедитесь, что результат проверки соединения потока пула"
+        " попадает в замеры запроса."
+    )
+
+
+def test_n_plus_one_detected_in_pool(
+    mixer: Mixer, post_with_published_location
+):
+    mixer.cycle(6).blend("blog.Comment", post=post_with_published_location)
+
+    def comment_authors(request):
+        return HttpResponse(
+            ", ".join(c.author.username for c in Comment.objects.all())
+        )
+
+    with pytest.raises(NPlusOneError):
+        with detect_n_plus_one(mode="raise"):
+            asyncio.run(offload(comment_authors)(anonymous_request()))
+
+
+def test_asgi_request(
+    settings, tmp_path, monkeypatch, post_with_published_location
+):
+    settings.INSTRUMENTATION_ENABLED = True
+    settings.INSTRUMENTATION_LOG = tmp_path / "timings.jsonl"
+    loops = []
+
+    def write_sample(path, sample):
+        try:
+            loops.append(asyncio.get_running_loop())
+        except RuntimeError:
+            loops.append(None)
+        instrumentation.write_sample(path, sample)
+
+    monkeypatch.setattr(middleware, "write_sample", write_sample)
+    response = asyncio.run(AsyncClient().get("/"))
+    assert response.status_code == 200
+    assert "db;dur=" in response["Server-Timing"], (
+        "Убедитесь, что замеры запросов работают под ASGI."
+    )
+    assert loops == [None], (
+        "Убедитесь, что замер пишется в файл не в потоке цикла событий."
+    )
+    assert settings.INSTRUMENTATION_LOG.read_text().strip()
@@ -0,0 +1,52 @@
+import json
+
+import pytest
+from blog.models import Comment, Post
+from django.core.management import call_command
+from utils import recount_comments
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def generated_data():
+    call_command(
+        "generate_data", users=5, categories=3, locations=4, posts=60,
+        comments=300, batch_size=25, seed=1, scheduled=0.1, unpublished=0.1,
+    )
+
+
+@pytest.mark.usefixtures("generated_data")
+def test_generate_data():
+    assert Post.objects.count() == 60
+    assert Comment.objects.count() == 300
+    assert Post.objects.filter(is_published=False).exists(), (
+        "Убедитесь, что генератор создаёт снятые с публикации записи."
+    )
+    assert recount_comments(Post.objects.all()) == 0, (
+        "Убедитесь, что генератор заполняет счётчики комментариев."
+    )
+    counts = sorted(
+        Post.objects.values_list("comment_count", flat=True), reverse=True
+    )
+    assert counts[0] > 5 * counts[len(counts) // 2], (
+        "Убедитесь, что комментарии распределены неравномерно."
+    )
+    assert all(Post.objects.values_list("excerpt", flat=True))
+
+
+@pytest.mark.usefixtures("generated_data")
+def test_benchmark_stores_results(tmp_path, capsys):
+    output = tmp_path / "bench.jsonl"
+    call_command("benchmark", requests=2, warmup=0, output=str(output))
+    results = [json.loads(line) for line in output.read_text().splitlines()]
+    assert {result["url_name"] for result in results} >= {
+        "index", "post_detail", "category_posts", "profile", "search"
+    }, "Убедитесь, что замеряются все адреса приложения blog."
+    assert {result["status"] for result in results} <= {200, 302}
+    commit = results[0]["commit"]
+
+    call_command(
+        "benchmark", requests=2, warmup=0, output=str(output), compare=commit
+    )
+    assert f"Сравнение p50 с {commit}" in capsys.readouterr().out
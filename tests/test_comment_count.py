@@ -0,0 +1,105 @@
+import pytest
+from blog.models import Comment, Post
+from django.core.management import call_command
+from django.db.models.signals import pre_delete
+from django.test.client import Client
+from mixer.backend.django import Mixer
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_comment_views_maintain_counter(
+    user_client: Client, post_with_published_location
+):
+    post = post_with_published_location
+    url = f"/posts/{post.id}/comment/"
+    for i in range(3):
+        user_client.post(url, {"text": f"Комментарий {i}"})
+    post.refresh_from_db()
+    assert post.comment_count == 3, (
+        "Убедитесь, что при добавлении комментария увеличивается"
+        " счётчик комментариев публикации."
+    )
+
+    comment = post.comments.first()
+    user_client.post(f"/posts/{post.id}/delete_comment/{comment.id}/")
+    post.refresh_from_db()
+    assert post.comment_count == 2, (
+        "Убедитесь, что при удалении комментария уменьшается"
+        " счётчик комментариев публикации."
+    )
+
+
+def test_recount_comments_command(
+    mixer: Mixer, post_with_published_location
+):
+    post = post_with_published_location
+    mixer.cycle(4).blend(Comment, post=post)
+    Post.objects.filter(pk=post.pk).update(comment_count=42)
+
+    call_command("recount_comments", chunk_size=1)
+
+    post.refresh_from_db()
+    assert post.comment_count == 4, (
+        "Убедитесь, что команда `recount_comments` исправляет"
+        " расхождение счётчика комментариев."
+    )
+
+
+def test_concurrent_delete_decrements_once(
+    user_client: Client, post_with_published_location
+):
+    post = post_with_published_location
+    user_client.post(f"/posts/{post.id}/comment/", {"text": "Комментарий"})
+    comment = post.comments.get()
+
+    def delete_concurrently(sender, instance, **kwargs):
+        Comment.objects.filter(pk=instance.pk)._raw_delete("default")
+
+    pre_delete.connect(delete_concurrently, sender=Comment)
+    try:
+        user_client.post(f"/posts/{post.id}/delete_comment/{comment.id}/")
+    finally:
+        pre_delete.disconnect(delete_concurrently, sender=Comment)
+    post.refresh_from_db()
+    assert post.comment_count == 1, (
+        "Убедитесь, что счётчик уменьшается, только если комментарий"
+        " действительно удалён этим запросом."
+    )
+
+
+def test_user_deletion_recounts_comments(
+    mixer: Mixer, another_user, post_with_published_location
+):
+    post = post_with_published_location
+    mixer.blend(Comment, post=post, author=another_user)
+    mixer.blend(Comment, post=post)
+    call_command("recount_comments")
+
+    another_user.delete()
+
+    post.refresh_from_db()
+    assert post.comment_count == 1, (
+        "Убедитесь, что счётчик комментариев пересчитывается, когда"
+        " комментарии удаляются вместе с пользователем."
+    )
+
+
+def test_admin_bulk_delete_recounts_comments(
+    admin_client: Client, mixer: Mixer, post_with_published_location
+):
+    post = post_with_published_location
+    comments = mixer.cycle(3).blend(Comment, post=post)
+    call_command("recount_comments")
+
+    admin_client.post("/admin/blog/comment/", {
+        "action": "delete_selected",
+        "_selected_action": [comment.id for comment in comments[:2]],
+        "post": "yes",
+    })
+
+    post.refresh_from_db()
+    assert post.comment_count == 1, (
+        "Убедитесь, что удаление комментариев из админки"
+        " сразу пересчитывает счётчик комментариев."
+    )
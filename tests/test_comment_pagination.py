@@ -0,0 +1,66 @@
+import pytest
+from blog.constants import COMMENTS_ON_THE_PAGE
+from django.test.client import Client
+from mixer.backend.django import Mixer
+
+pytestmark = [pytest.mark.django_db]
+
+N_COMMENTS = COMMENTS_ON_THE_PAGE * 2 + 3
+
+
+@pytest.fixture
+def many_comments(mixer: Mixer, post_with_published_location):
+    return mixer.cycle(N_COMMENTS).blend(
+        "blog.Comment", post=post_with_published_location
+    )
+
+
+def test_detail_page_shows_first_comments(
+    client: Client, post_with_published_location, many_comments
+):
+    post = post_with_published_location
+    response = client.get(f"/posts/{post.id}/")
+    comments = response.context["comments"]
+    assert [comment.id for comment in comments] == [
+        comment.id for comment in many_comments[:COMMENTS_ON_THE_PAGE]
+    ], (
+        "Убедитесь, что на странице публикации выводятся только первые"
+        f" {COMMENTS_ON_THE_PAGE} комментариев в порядке добавления."
+    )
+    assert "Показать ещё комментарии" in response.content.decode("utf-8")
+
+
+def test_comment_fragments_load_the_rest(
+    client: Client, post_with_published_location, many_comments
+):
+    post = post_with_published_location
+    comments = client.get(f"/posts/{post.id}/").context["comments"]
+    loaded_ids = [comment.id for comment in comments]
+    while comments.has_next():
+        response = client.get(
+            f"/posts/{post.id}/comments/",
+            {"after": comments.next_cursor},
+        )
+        assert "<html" not in response.content.decode("utf-8"), (
+            "Убедитесь, что страница комментариев отдаётся фрагментом"
+            " без базового шаблона."
+        )
+        comments = response.context["comments"]
+        loaded_ids.extend(comment.id for comment in comments)
+    assert loaded_ids == [comment.id for comment in many_comments], (
+        "Убедитесь, что подгрузка комментариев выводит каждый"
+        " комментарий ровно один раз."
+    )
+
+
+def test_comment_fragment_respects_visibility(
+    client: Client, post_with_published_location, many_comments
+):
+    post = post_with_published_location
+    post.is_published = False
+    post.save()
+    response = client.get(f"/posts/{post.id}/comments/")
+    assert response.status_code == 404, (
+        "Убедитесь, что комментарии к снятой с публикации записи"
+        " недоступны другим пользователям."
+    )
@@ -0,0 +1,69 @@
+import pytest
+from blog.models import Comment
+from blog.search import match_comments
+from conftest import explain
+from django.db import connection
+from django.test.client import Client
+from django.utils import timezone
+from mixer.backend.django import Mixer
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def comments(mixer: Mixer, user, another_user, post_with_published_location):
+    post = post_with_published_location
+    return {
+        "by_user": mixer.blend(
+            "blog.Comment", post=post, author=user, text="Первый отзыв"
+        ),
+        "by_another": mixer.blend(
+            "blog.Comment", post=post, author=another_user,
+            text="Прогулка по набережной"
+        ),
+    }
+
+
+def admin_search(admin_client, term):
+    response = admin_client.get("/admin/blog/comment/", {"q": term})
+    assert response.status_code == 200
+    return {comment.id for comment in response.context["cl"].result_list}
+
+
+def test_admin_search_by_author(admin_client: Client, user, comments):
+    assert admin_search(admin_client, user.username) == {
+        comments["by_user"].id
+    }, "Убедитесь, что комментарии в админке ищутся по имени автора."
+
+
+def test_admin_search_by_text(admin_client: Client, comments):
+    assert admin_search(admin_client, "прогул") == {
+        comments["by_another"].id
+    }, "Убедитесь, что комментарии в админке ищутся по тексту."
+
+
+def test_date_hierarchy(admin_client: Client, comments):
+    year = timezone.now().year
+    response = admin_client.get(
+        "/admin/blog/comment/", {"created_at__year": year}
+    )
+    assert response.status_code == 200
+    assert len(response.context["cl"].result_list) == 2
+
+
+@pytest.mark.skipif(
+    connection.vendor != "sqlite", reason="EXPLAIN QUERY PLAN из SQLite"
+)
+def test_search_uses_indexes(user):
+    plan = explain(match_comments(Comment.objects.all(), "отзыв"))
+    assert "SCAN blog_comment" not in plan.replace(
+        "SCAN blog_comment_search", ""
+    ), (
+        "Убедитесь, что поиск комментариев не просматривает"
+        f" всю таблицу. План запроса:\n{plan}"
+    )
+    now = timezone.now()
+    plan = explain(Comment.objects.filter(
+        created_at__gte=now.replace(month=1, day=1), created_at__lt=now
+    ))
+    assert "comment_created_idx" in plan, plan
@@ -0,0 +1,226 @@
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from blog import caching
+from blog.models import Comment, Post
+from conftest import page_urls
+from django.core.cache import cache
+from django.db import connection
+from django.test.client import Client
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from mixer.backend.django import Mixer
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def settled_pages(monkeypatch):
+    """
+    Данные и версии страниц, изменённые час назад:
+    Last-Modified текущей секунды не отдаётся.
+    """
+    hour_ago = timezone.now() - timedelta(hours=1)
+    Post.objects.update(updated_at=hour_ago)
+    monkeypatch.setattr(
+        caching, "_page_version_token",
+        lambda: f"{hour_ago.timestamp():.6f}"
+    )
+    cache.clear()
+    return monkeypatch
+
+
+def test_not_modified_without_rendering(
+    client: Client, django_assert_max_num_queries,
+    post_with_published_location, settled_pages
+):
+    for url in page_urls(post_with_published_location):
+        response = client.get(url)
+        assert response.has_header("ETag"), (
+            f"Убедитесь, что страница `{url}` отдаёт заголовок ETag."
+        )
+        assert response.has_header("Last-Modified")
+
+        with django_assert_max_num_queries(1):
+            response_304 = client.get(
+                url, HTTP_IF_NONE_MATCH=response["ETag"]
+            )
+        assert response_304.status_code == HTTPStatus.NOT_MODIFIED, (
+            f"Убедитесь, что страница `{url}` отвечает 304 Not Modified"
+            " на запрос с актуальным ETag."
+        )
+        response_304 = client.get(
+            url, HTTP_IF_MODIFIED_SINCE=response["Last-Modified"]
+        )
+        assert response_304.status_code == HTTPStatus.NOT_MODIFIED
+
+
+def test_validators_change_with_content(
+    client: Client, user_client: Client, post_with_published_location
+):
+    post = post_with_published_location
+    etags = {url: client.get(url)["ETag"] for url in page_urls(post)}
+
+    post.title = "Новый заголовок"
+    post.save()
+    for url, etag in etags.items():
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            f"Убедитесь, что ETag страницы `{url}` меняется"
+            " при изменении публикации."
+        )
+
+    detail_url = f"/posts/{post.id}/"
+    etag = client.get(detail_url)["ETag"]
+    user_client.post(f"/posts/{post.id}/comment/", {"text": "Комментарий"})
+    response = client.get(detail_url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.OK, (
+        "Убедитесь, что ETag страницы публикации меняется"
+        " при добавлении комментария."
+    )
+
+
+def test_validators_depend_on_user(
+    client: Client, user_client: Client, post_with_published_location
+):
+    url = f"/posts/{post_with_published_location.id}/"
+    anonymous_etag = client.get(url)["ETag"]
+    response = user_client.get(url, HTTP_IF_NONE_MATCH=anonymous_etag)
+    assert response.status_code == HTTPStatus.OK, (
+        "Убедитесь, что ETag страницы зависит от пользователя."
+    )
+    assert not response.has_header("Last-Modified")
+
+
+def test_validators_cost_constant(
+    client: Client, mixer: Mixer, post_with_published_location
+):
+    post = post_with_published_location
+
+    def validator_sql():
+        queries = {}
+        for url in page_urls(post):
+            etag = client.get(url)["ETag"]
+            with CaptureQueriesContext(connection) as captured:
+                response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+            assert response.status_code == HTTPStatus.NOT_MODIFIED
+            queries[url] = [query["sql"] for query in captured]
+        return queries
+
+    queries = validator_sql()
+    mixer.cycle(5).blend(
+        Post, category=post.category, author=post.author,
+        location=post.location, is_published=True,
+    )
+    mixer.cycle(5).blend(Comment, post=post)
+    assert {url: len(sql) for url, sql in validator_sql().items()} == {
+        url: len(sql) for url, sql in queries.items()
+    }, (
+        "Убедитесь, что проверка ETag выполняет одни и те же запросы"
+        " независимо от количества публикаций и комментариев."
+    )
+    for url, sql in queries.items():
+        assert len(sql) <= 1 and not any(
+            "COUNT(" in query or "MAX(" in query for query in sql
+        ), (
+            f"Убедитесь, что валидаторы страницы `{url}` не считают"
+            " строки ленты или комментариев."
+        )
+
+
+def test_post_validators_follow_stored_data(
+    client: Client, post_with_published_location
+):
+    post = post_with_published_location
+    url = f"/posts/{post.id}/"
+    etag = client.get(url)["ETag"]
+    Post.objects.filter(pk=post.pk).update(
+        title="Изменено в обход сигналов", updated_at=timezone.now()
+    )
+    response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.OK, (
+        "Убедитесь, что ETag страницы публикации меняется при изменении"
+        " публикации в другом процессе."
+    )
+
+
+def test_comment_edit_changes_post_validators(
+    client: Client, mixer: Mixer, post_with_published_location
+):
+    post = post_with_published_location
+    comment = mixer.blend(Comment, post=post, text="Было")
+    Post.objects.filter(pk=post.pk).update(
+        updated_at=timezone.now() - timedelta(hours=1)
+    )
+    comment.text = "Стало"
+    comment.save()
+    post.refresh_from_db()
+    assert post.updated_at > timezone.now() - timedelta(minutes=1), (
+        "Убедитесь, что правка комментария сдвигает"
+        " `updated_at` публикации."
+    )
+
+
+def test_last_modified_not_moving_back(
+    client: Client, mixer: Mixer, post_with_published_location,
+    settled_pages
+):
+    post = post_with_published_location
+    newest = mixer.blend(
+        Post, category=post.category, author=post.author,
+        location=post.location, is_published=True,
+        pub_date=post.pub_date - timedelta(days=1),
+    )
+    Post.objects.filter(pk=newest.pk).update(
+        updated_at=timezone.now() - timedelta(minutes=30)
+    )
+    cache.clear()
+    last_modified = client.get("/")["Last-Modified"]
+    settled_pages.undo()
+
+    newest.delete()
+    response = client.get("/", HTTP_IF_MODIFIED_SINCE=last_modified)
+    assert response.status_code == HTTPStatus.OK, (
+        "Убедитесь, что Last-Modified ленты не уменьшается"
+        " при удалении публикации."
+    )
+
+
+def test_deleted_post_changes_feed_validators(
+    client: Client, mixer: Mixer, post_with_published_location
+):
+    post = post_with_published_location
+    other = mixer.blend(
+        Post, category=post.category, author=post.author,
+        location=post.location, is_published=True,
+        pub_date=post.pub_date - timedelta(days=1),
+    )
+    etag = client.get("/")["ETag"]
+    Post.objects.filter(pk=other.pk).delete()
+    response = client.get("/", HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.OK, (
+        "Убедитесь, что ETag ленты меняется при удалении публикации."
+    )
+
+
+def test_validators_follow_csrf_token(
+    user, post_with_published_location
+):
+    url = f"/posts/{post_with_published_location.id}/"
+    client = Client()
+    client.force_login(user)
+    client.get(url)
+    etag = client.get(url)["ETag"]
+    assert client.get(
+        url, HTTP_IF_NONE_MATCH=etag
+    ).status_code == HTTPStatus.NOT_MODIFIED
+
+    client.logout()
+    client.force_login(user)
+    client.get(url)
+    response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.OK, (
+        "Убедитесь, что ETag страниц с формами меняется после повторного"
+        " входа: иначе в браузере останется устаревший CSRF-токен."
+    )
@@ -0,0 +1,70 @@
+import json
+import re
+
+import pytest
+from core.db import ConnectionPool
+from django.db import connection
+from django.test.client import Client
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_checkout_reuses_connection():
+    pool = ConnectionPool()
+    connection.ensure_connection()
+    reused, wait_ms = pool.checkout()
+    assert reused, (
+        "Убедитесь, что открытое работоспособное соединение"
+        " переиспользуется при следующей выдаче."
+    )
+    assert wait_ms >= 0
+    assert pool.pop_checkout() == (reused, wait_ms)
+    assert pool.pop_checkout() is None
+
+
+def test_unusable_connection_discarded(monkeypatch):
+    pool = ConnectionPool()
+    connection.ensure_connection()
+    monkeypatch.setattr(connection, "is_usable", lambda: False)
+    closed = []
+    monkeypatch.setattr(connection, "close", lambda: closed.append(True))
+    reused, _ = pool.checkout()
+    assert not reused
+    assert closed, (
+        "Убедитесь, что соединение, не прошедшее проверку,"
+        " закрывается при выдаче."
+    )
+
+
+def test_checkout_does_not_connect(monkeypatch):
+    def ensure_connection():
+        raise AssertionError(
+            "Убедитесь, что при выдаче не открываются новые соединения:"
+            " Django откроет их при первом запросе к базе."
+        )
+
+    monkeypatch.setattr(connection, "connection", None)
+    monkeypatch.setattr(connection, "ensure_connection", ensure_connection)
+    reused, _ = ConnectionPool().checkout()
+    assert not reused
+    assert connection.connection is None
+
+
+def test_connection_metrics_in_instrumentation(
+    client: Client, settings, tmp_path
+):
+    settings.INSTRUMENTATION_ENABLED = True
+    settings.INSTRUMENTATION_LOG = tmp_path / "timings.jsonl"
+    response = client.get("/")
+    assert re.search(
+        r'conn;dur=[\d.]+;desc="(reused|new)"', response["Server-Timing"]
+    ), (
+        "Убедитесь, что заголовок Server-Timing содержит время"
+        " ожидания соединения с базой."
+    )
+    (sample,) = [
+        json.loads(line)
+        for line in settings.INSTRUMENTATION_LOG.read_text().splitlines()
+    ]
+    assert sample["conn_reused"] is True
+    assert sample["conn_ms"] >= 0
@@ -0,0 +1,125 @@
+import csv
+import io
+import json
+from datetime import timedelta
+from urllib.parse import urlencode
+
+import pytest
+from blog.models import Comment, Post
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.http import StreamingHttpResponse
+from django.test.client import Client
+from django.utils import timezone
+from mixer.backend.django import Mixer
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_admin_export_csv(admin_client: Client, post_with_published_location):
+    post = post_with_published_location
+    response = admin_client.post("/admin/blog/post/", {
+        "action": "export_csv",
+        "_selected_action": [post.id],
+    })
+    assert isinstance(response, StreamingHttpResponse), (
+        "Убедитесь, что выгрузка из админки отдаётся потоковым ответом."
+    )
+    assert "attachment" in response["Content-Disposition"]
+    content = b"".join(response.streaming_content).decode("utf-8")
+    (row,) = csv.DictReader(io.StringIO(content))
+    assert row["title"] == post.title
+    assert row["author"] == post.author.username, (
+        "Убедитесь, что выгрузка содержит имя автора, а не его id."
+    )
+    assert row["category"] == post.category.title
+    assert row["location"] == post.location.name
+
+
+def test_admin_export_comments_jsonl(
+    admin_client: Client, mixer: Mixer, post_with_published_location
+):
+    comments = mixer.cycle(3).blend(
+        "blog.Comment", post=post_with_published_location
+    )
+    response = admin_client.post("/admin/blog/comment/", {
+        "action": "export_jsonl",
+        "_selected_action": [comment.id for comment in comments],
+    })
+    rows = [
+        json.loads(line)
+        for line in b"".join(response.streaming_content).splitlines()
+    ]
+    assert [row["id"] for row in rows] == [c.id for c in comments]
+    assert rows[0]["post"] == post_with_published_location.title
+    assert rows[0]["author"] == comments[0].author.username
+
+
+def test_admin_export_changed_since(
+    admin_client: Client, mixer: Mixer, post_with_published_location
+):
+    old_comment, new_comment = mixer.cycle(2).blend(
+        "blog.Comment", post=post_with_published_location
+    )
+    Comment.objects.filter(pk=old_comment.pk).update(
+        updated_at=timezone.now() - timedelta(days=30)
+    )
+    since = urlencode(
+        {"updated_at__gte": timezone.now() - timedelta(days=7)}
+    )
+    response = admin_client.post(
+        f"/admin/blog/comment/?{since}",
+        {
+            "action": "export_jsonl",
+            "select_across": "1",
+            "_selected_action": [new_comment.id],
+        },
+    )
+    rows = [
+        json.loads(line)
+        for line in b"".join(response.streaming_content).splitlines()
+    ]
+    assert [row["id"] for row in rows] == [new_comment.id], (
+        "Убедитесь, что выгрузка из админки учитывает фильтр"
+        " по дате изменения `updated_at`."
+    )
+
+
+def test_export_command_since(
+    capsys, mixer: Mixer, post_with_published_location
+):
+    old_comments = mixer.cycle(2).blend(
+        "blog.Comment", post=post_with_published_location
+    )
+    Comment.objects.filter(pk__in=[c.pk for c in old_comments]).update(
+        updated_at=timezone.now() - timedelta(days=2)
+    )
+    new_comment = mixer.blend(
+        "blog.Comment", post=post_with_published_location
+    )
+    since = (timezone.now() - timedelta(days=1)).isoformat()
+    call_command("export_data", "comments", format="jsonl", since=since)
+    rows = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert [row["id"] for row in rows] == [new_comment.id], (
+        "Убедитесь, что с параметром `--since` выгружаются только"
+        " изменённые с указанного момента объекты."
+    )
+
+
+@pytest.mark.parametrize(
+    "since", ("вчера", "2024-13-01", "2024-01-31T25:00:00")
+)
+def test_export_command_invalid_since(since):
+    with pytest.raises(CommandError):
+        call_command("export_data", "comments", since=since)
+
+
+def test_export_command_to_file(tmp_path, mixer: Mixer, user):
+    mixer.cycle(5).blend("blog.Post", author=user)
+    path = tmp_path / "posts.csv"
+    call_command("export_data", "posts", output=str(path), chunk_size=2)
+    with open(path, encoding="utf-8", newline="") as export:
+        rows = list(csv.DictReader(export))
+    assert sorted(int(row["id"]) for row in rows) == sorted(
+        Post.objects.values_list("id", flat=True)
+    )
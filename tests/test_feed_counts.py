@@ -0,0 +1,83 @@
+from datetime import timedelta
+
+import pytest
+from blog.caching import feed_count_key, feed_count_timeout
+from blog.constants import FEED_COUNT_TIMEOUT
+from django.core.cache import cache
+from django.db import connection
+from django.test.client import Client
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from mixer.backend.django import Mixer
+
+pytestmark = [pytest.mark.django_db]
+
+
+def count_queries(client: Client, url: str) -> int:
+    with CaptureQueriesContext(connection) as ctx:
+        client.get(url)
+    return sum("COUNT(" in query["sql"] for query in ctx.captured_queries)
+
+
+def test_feed_count_is_cached(client: Client, post_with_published_location):
+    category = post_with_published_location.category
+    author = post_with_published_location.author
+    for url in (
+        "/", f"/category/{category.slug}/", f"/profile/{author.username}/"
+    ):
+        assert count_queries(client, url) == 1
+        assert count_queries(client, url) == 0, (
+            "Убедитесь, что количество публикаций ленты берётся из кэша"
+            f" при повторном запросе страницы `{url}`."
+        )
+
+
+def test_post_changes_reset_feed_counts(
+    client: Client, mixer: Mixer, post_with_published_location
+):
+    post = post_with_published_location
+    client.get("/")
+    client.get(f"/category/{post.category.slug}/")
+    assert cache.get(feed_count_key("global")) == 1
+
+    mixer.blend(
+        "blog.Post",
+        category=post.category,
+        pub_date=timezone.now() - timedelta(days=1),
+    )
+    assert cache.get(feed_count_key("global")) is None
+    assert cache.get(feed_count_key("category", post.category.pk)) is None
+
+    client.get("/")
+    assert cache.get(feed_count_key("global")) == 2
+    post.delete()
+    assert cache.get(feed_count_key("global")) is None
+
+
+def test_category_toggle_resets_feed_counts(
+    client: Client, post_with_published_location
+):
+    category = post_with_published_location.category
+    client.get("/")
+    assert cache.get(feed_count_key("global")) == 1
+
+    category.is_published = False
+    category.save()
+    assert cache.get(feed_count_key("global")) is None
+    assert len(client.get("/").context["page_obj"]) == 0
+
+
+def test_count_expires_at_scheduled_publication(
+    mixer: Mixer, published_category
+):
+    assert feed_count_timeout() == FEED_COUNT_TIMEOUT
+    mixer.blend(
+        "blog.Post",
+        category=published_category,
+        is_published=True,
+        pub_date=timezone.now() + timedelta(minutes=1),
+    )
+    assert feed_count_timeout() <= 61, (
+        "Убедитесь, что счётчик ленты в кэше не переживает"
+        " ближайшую отложенную публикацию."
+    )
@@ -0,0 +1,43 @@
+import pytest
+from conftest import page_urls
+from django.core.cache import cache
+from django.db import connection
+from django.test.client import Client
+from django.test.utils import CaptureQueriesContext
+from mixer.backend.django import Mixer
+from utils import feed_queryset
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.mark.parametrize("client_name", ["client", "user_client"])
+def test_queries_do_not_grow_with_posts(
+    request, client_name, mixer: Mixer, django_assert_num_queries,
+    post_with_published_location
+):
+    client: Client = request.getfixturevalue(client_name)
+    post = post_with_published_location
+    for url in page_urls(post):
+        cache.clear()
+        with CaptureQueriesContext(connection) as queries:
+            client.get(url)
+
+        mixer.cycle(5).blend(
+            "blog.Post",
+            category=post.category,
+            author=post.author,
+            location=mixer.SELECT,
+            is_published=True,
+            pub_date=post.pub_date,
+        )
+        cache.clear()
+        with django_assert_num_queries(len(queries)):
+            client.get(url)
+
+
+def test_feed_defers_full_text(post_with_published_location):
+    post = feed_queryset().get()
+    assert "text" in post.get_deferred_fields(), (
+        "Убедитесь, что лента не выбирает полный текст публикаций."
+    )
+    assert post.excerpt == post_with_published_location.excerpt
@@ -0,0 +1,158 @@
+from io import BytesIO
+
+import pytest
+from blog.models import Post
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test.client import Client
+from PIL import Image
+
+pytestmark = [
+    pytest.mark.django_db,
+    pytest.mark.usefixtures("media_root"),
+]
+
+
+@pytest.fixture
+def media_root(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    return tmp_path
+
+
+def image_upload(width=1600, height=1200):
+    image_data = BytesIO()
+    Image.new("RGB", (width, height), "teal").save(image_data, "JPEG")
+    return SimpleUploadedFile(
+        "photo.jpg", image_data.getvalue(), content_type="image/jpeg"
+    )
+
+
+def test_renditions_generated_on_upload(
+    media_root, post_with_published_location
+):
+    post = post_with_published_location
+    post.image = image_upload()
+    post.save()
+    call_command("run_jobs", once=True)
+    post.refresh_from_db()
+    assert post.image_renditions == [320, 640, 1280], (
+        "Убедитесь, что при загрузке изображения создаются его копии"
+        " всех ширин."
+    )
+    renditions = media_root / "post_images" / "renditions"
+    stem = post.image.name.rsplit("/", 1)[-1].rsplit(".", 1)[0]
+    for width in post.image_renditions:
+        for extension in ("webp", "jpg"):
+            with Image.open(renditions / f"{stem}-{width}.{extension}") as copy:
+                assert copy.width == width
+    assert post.image_card_url.endswith(f"{stem}-640.jpg")
+    assert f"{stem}-1280.webp 1280w" in post.image_webp_srcset
+
+
+def test_small_image_not_upscaled(post_with_published_location):
+    post = post_with_published_location
+    post.image = image_upload(500, 300)
+    post.save()
+    call_command("run_jobs", once=True)
+    post.refresh_from_db()
+    assert post.image_renditions == [320, 500], (
+        "Убедитесь, что для изображения меньше наибольшей ширины"
+        " создаётся копия исходной ширины."
+    )
+    assert post.image_card_url.endswith("-500.jpg"), (
+        "Убедитесь, что в карточке не выводится копия меньше оригинала."
+    )
+    assert "500w" in post.image_jpeg_srcset
+
+
+def test_original_width_between_steps(post_with_published_location):
+    post = post_with_published_location
+    post.image = image_upload(1000, 750)
+    post.save()
+    call_command("run_jobs", once=True)
+    post.refresh_from_db()
+    assert post.image_renditions == [320, 640, 1000]
+    assert "1000w" in post.image_webp_srcset, (
+        "Убедитесь, что srcset предлагает копию исходной ширины"
+        " для экранов с высокой плотностью пикселей."
+    )
+
+
+def test_feed_markup(client: Client, post_with_published_location):
+    post = post_with_published_location
+    post.image = image_upload()
+    post.save()
+    call_command("run_jobs", once=True)
+    content = client.get("/").content.decode("utf-8")
+    assert 'loading="lazy"' in content, (
+        "Убедитесь, что изображения в ленте загружаются лениво."
+    )
+    assert 'type="image/webp"' in content
+    assert "srcset=" in content
+    assert post.image.url not in content.replace(
+        f'href="{post.image.url}"', ""
+    ), "Убедитесь, что в ленте выводятся копии, а не исходное изображение."
+
+
+def test_generate_image_renditions_command(post_with_published_location):
+    post = post_with_published_location
+    post.image = image_upload()
+    post.save()
+    call_command("run_jobs", once=True)
+    Post.objects.filter(pk=post.pk).update(image_renditions=[])
+    call_command("generate_image_renditions", missing=True)
+    post.refresh_from_db()
+    assert post.image_renditions == [320, 640, 1280], (
+        "Убедитесь, что команда `generate_image_renditions` создаёт"
+        " копии изображений."
+    )
+
+
+def test_replaced_image_renditions_deleted(
+    media_root, django_capture_on_commit_callbacks,
+    post_with_published_location
+):
+    post = post_with_published_location
+    post.image = image_upload()
+    post.save()
+    call_command("run_jobs", once=True)
+    post.refresh_from_db()
+    renditions = media_root / "post_images" / "renditions"
+    old_copies = set(renditions.iterdir())
+    assert old_copies
+
+    post.image = image_upload(800, 600)
+    with django_capture_on_commit_callbacks(execute=True):
+        post.save()
+    assert post.image_renditions == [], (
+        "Убедитесь, что копии старого изображения не выводятся"
+        " для нового до создания его копий."
+    )
+    assert not old_copies & set(renditions.iterdir()), (
+        "Убедитесь, что копии заменённого изображения удаляются."
+    )
+
+    call_command("run_jobs", once=True)
+    post.refresh_from_db()
+    assert post.image_renditions == [320, 640, 800]
+    new_copies = set(renditions.iterdir())
+    assert new_copies
+    post.image = None
+    with django_capture_on_commit_callbacks(execute=True):
+        post.save()
+    assert not set(renditions.iterdir()), (
+        "Убедитесь, что копии удалённого изображения удаляются."
+    )
+
+
+def test_generate_command_bumps_version(post_with_published_location):
+    post = post_with_published_location
+    post.image = image_upload()
+    post.save()
+    version = Post.objects.get(pk=post.pk).version
+    call_command("generate_image_renditions", missing=True)
+    post.refresh_from_db()
+    assert post.version > version, (
+        "Убедитесь, что команда `generate_image_renditions` обновляет"
+        " `updated_at`: иначе в кэше остаются карточки без копий."
+    )
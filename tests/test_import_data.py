@@ -0,0 +1,222 @@
+import gc
+import io
+import json
+import weakref
+from pathlib import Path
+
+import pytest
+from blog.imports import (IMPORT_MODELS, disabled_indexes, iter_json_array,
+                          muted_signals)
+from blog.models import Comment, Post, User
+from blog.search import match_posts
+from core.db import estimated_count
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+from django.db.models.signals import post_init, post_save
+from django.utils.dateparse import parse_datetime
+
+pytestmark = [pytest.mark.django_db]
+
+DUMP = Path(__file__).resolve().parent.parent / "db.json"
+
+
+@pytest.fixture
+def dump_path(tmp_path):
+    """
+    db.json с комментариями в начале массива:
+    публикация, на которую они ссылаются, идёт позже.
+    """
+    items = json.loads(DUMP.read_text(encoding="utf-8"))
+    comments = [
+        {
+            "model": "blog.comment",
+            "pk": pk,
+            "fields": {
+                "text": f"Комментарий {pk}",
+                "post": 1,
+                "author": 1,
+                "created_at": "2023-01-01T00:00:00Z",
+            },
+        }
+        for pk in range(1, 4)
+    ]
+    path = tmp_path / "db.json"
+    path.write_text(
+        json.dumps(comments + items, ensure_ascii=False, indent=1),
+        encoding="utf-8",
+    )
+    return path
+
+
+def import_dump(path, *args):
+    out = io.StringIO()
+    call_command(
+        "import_data", str(path), "--batch-size", "2", *args, stdout=out
+    )
+    return out.getvalue()
+
+
+def assert_dump_loaded():
+    assert Post.objects.count() == 39
+    assert User.objects.count() == 4
+    assert Comment.objects.count() == 3
+    post = Post.objects.get(pk=1)
+    assert post.created_at == parse_datetime("2022-12-18T23:06:18.993Z"), (
+        "Убедитесь, что при загрузке сохраняются даты из выгрузки."
+    )
+    assert post.excerpt, (
+        "Убедитесь, что при загрузке заполняется анонс публикации."
+    )
+    assert post.comment_count == 3, (
+        "Убедитесь, что после загрузки пересчитываются"
+        " счётчики комментариев."
+    )
+    assert post in match_posts(Post.objects.all(), "Обед Морозовой"), (
+        "Убедитесь, что загруженные публикации попадают в поисковый индекс."
+    )
+
+
+def test_import_dump(dump_path):
+    output = import_dump(dump_path)
+    assert_dump_loaded()
+    assert "blog.post: 39" in output
+    assert "строк/с" in output, (
+        "Убедитесь, что команда сообщает скорость загрузки."
+    )
+    assert "Пропущено admin.logentry: 75" in output
+    assert estimated_count(Post) == 39, (
+        "Убедитесь, что после загрузки обновляется статистика базы."
+    )
+
+    post = Post.objects.create(
+        title="Новая", text="Текст", pub_date=parse_datetime(
+            "2023-01-01T00:00:00Z"
+        ), author_id=1
+    )
+    assert post.pk == 40, (
+        "Убедитесь, что после загрузки сдвигаются последовательности"
+        " первичных ключей."
+    )
+
+
+def live_receivers(signal):
+    """Ключи обработчиков сигнала, объекты которых ещё существуют."""
+    gc.collect()
+    return {
+        key for key, receiver in signal.receivers
+        if not isinstance(receiver, weakref.ReferenceType)
+        or receiver() is not None
+    }
+
+
+def table_indexes():
+    """Имена индексов таблиц загружаемых моделей."""
+    with connection.cursor() as cursor:
+        return {
+            name
+            for model in IMPORT_MODELS
+            for name, constraint in connection.introspection.get_constraints(
+                cursor, model._meta.db_table
+            ).items()
+            if constraint["index"]
+        }
+
+
+@pytest.mark.django_db(transaction=True)
+def test_import_without_indexes_and_signals(dump_path):
+    receivers = live_receivers(post_init)
+    indexes = table_indexes()
+    import_dump(dump_path, "--disable-indexes", "--disable-signals")
+    assert_dump_loaded()
+    assert live_receivers(post_init) == receivers, (
+        "Убедитесь, что обработчики сигналов восстанавливаются"
+        " после загрузки."
+    )
+    assert table_indexes() == indexes, (
+        "Убедитесь, что индексы создаются заново после загрузки."
+    )
+
+    Post.objects.filter(pk=1).update(title="Ужин")
+    assert list(match_posts(Post.objects.all(), "Ужин")), (
+        "Убедитесь, что триггеры поискового индекса восстанавливаются"
+        " после загрузки."
+    )
+
+
+def test_broken_dump_rolls_back(dump_path):
+    content = dump_path.read_text(encoding="utf-8")
+    dump_path.write_text(content.rstrip().rstrip("]"), encoding="utf-8")
+    with pytest.raises(CommandError):
+        import_dump(dump_path)
+    assert not Post.objects.exists(), (
+        "Убедитесь, что при ошибке в выгрузке загрузка откатывается целиком."
+    )
+
+
+@pytest.mark.django_db(transaction=True)
+def test_broken_dump_without_indexes_rolls_back(dump_path):
+    indexes = table_indexes()
+    content = dump_path.read_text(encoding="utf-8")
+    dump_path.write_text(content.rstrip().rstrip("]"), encoding="utf-8")
+    with pytest.raises(CommandError):
+        import_dump(dump_path, "--disable-indexes")
+    assert not Post.objects.exists(), (
+        "Убедитесь, что при ошибке в выгрузке загрузка откатывается целиком."
+    )
+    assert table_indexes() == indexes, (
+        "Убедитесь, что при ошибке загрузки индексы остаются на месте."
+    )
+
+
+@pytest.mark.django_db(transaction=True)
+def test_disabled_indexes_drop_field_indexes():
+    indexes = table_indexes()
+    with connection.schema_editor() as schema_editor:
+        with disabled_indexes(IMPORT_MODELS, schema_editor):
+            remaining = table_indexes()
+    assert not {
+        "post_feed_idx",
+        "blog_comment_author_id_4f11e2e0",
+        "blog_post_updated_at_f2143844",
+    } & remaining, (
+        "Убедитесь, что на время загрузки удаляются индексы Meta.indexes,"
+        " внешних ключей и полей с `db_index`."
+    )
+    assert table_indexes() == indexes
+
+
+def test_muted_signals_keep_other_receivers(user):
+    saved = []
+
+    def remember(sender, instance, **kwargs):
+        saved.append(instance.pk)
+
+    post_save.connect(remember, sender=Post)
+    try:
+        with muted_signals():
+            assert not hasattr(Post(), "_initial_feeds"), (
+                "Убедитесь, что при загрузке отключаются"
+                " обработчики сигналов блога."
+            )
+            post = Post.objects.create(
+                title="Пост", text="Текст", author=user,
+                pub_date=parse_datetime("2023-01-01T00:00:00Z"),
+            )
+    finally:
+        post_save.disconnect(remember, sender=Post)
+    assert saved == [post.pk], (
+        "Убедитесь, что обработчики других приложений"
+        " при загрузке не отключаются."
+    )
+    assert hasattr(Post(), "_initial_feeds")
+
+
+def test_malformed_item_fails_fast():
+    stream = io.StringIO('[{"model": "blog.post", "pk": 1' + " " * 1000)
+    with pytest.raises(ValueError):
+        list(iter_json_array(stream, chunk_size=10, max_item_size=100))
+    assert stream.tell() < 200, (
+        "Убедитесь, что повреждённый элемент выгрузки не дочитывает"
+        " в память весь файл."
+    )
@@ -0,0 +1,65 @@
+import pytest
+from conftest import explain
+from django.db import connection
+from utils import feed_queryset
+
+pytestmark = [
+    pytest.mark.django_db,
+    pytest.mark.skipif(
+        connection.vendor != "sqlite", reason="EXPLAIN QUERY PLAN из SQLite"
+    ),
+]
+
+
+@pytest.mark.parametrize(
+    ("feed", "index_name"),
+    [
+        (lambda user, category: feed_queryset(), "post_feed_idx"),
+        (
+            lambda user, category: feed_queryset(category=category),
+            "post_category_feed_idx",
+        ),
+        (
+            lambda user, category: feed_queryset(author=user),
+            "post_author_feed_idx",
+        ),
+    ],
+    ids=["global feed", "category feed", "author feed"],
+)
+def test_feed_uses_index(feed, index_name, user, published_category):
+    plan = explain(feed(user, published_category)[:10])
+    assert f"USING INDEX {index_name}" in plan, (
+        f"Убедитесь, что лента публикаций использует индекс `{index_name}`."
+        f" План запроса:\n{plan}"
+    )
+    assert "TEMP B-TREE" not in plan, (
+        "Убедитесь, что сортировка ленты выполняется по индексу,"
+        f" без временного B-дерева. План запроса:\n{plan}"
+    )
+
+
+def test_owner_profile_feed_uses_index(user):
+    plan = explain(feed_queryset(author=user, published_only=False)[:10])
+    assert "USING INDEX post_author_feed_idx" in plan, plan
+    assert "TEMP B-TREE" not in plan, plan
+
+
+def test_publication_filter_is_sargable():
+    sql = str(feed_queryset().query)
+    assert "django_datetime_cast_date" not in sql, (
+        "Убедитесь, что фильтр по дате публикации сравнивает"
+        " столбец `pub_date` без приведения к дате."
+    )
+
+
+def test_post_comments_use_index(post_with_published_location):
+    plan = explain(
+        post_with_published_location.comments.order_by(
+            "created_at", "id"
+        )[:10]
+    )
+    assert "USING INDEX comment_post_created_idx" in plan, (
+        "Убедитесь, что комментарии публикации выбираются"
+        f" по индексу `comment_post_created_idx`. План запроса:\n{plan}"
+    )
+    assert "TEMP B-TREE" not in plan, plan
@@ -0,0 +1,77 @@
+import json
+import re
+
+import pytest
+from core.instrumentation import percentile
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+from django.test.client import Client
+from django.test.utils import CaptureQueriesContext
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def timing_log(settings, tmp_path):
+    settings.INSTRUMENTATION_ENABLED = True
+    settings.INSTRUMENTATION_LOG = tmp_path / "timings.jsonl"
+    return settings.INSTRUMENTATION_LOG
+
+
+def test_server_timing_header(
+    client: Client, timing_log, post_with_published_location
+):
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get("/")
+    header = response.get("Server-Timing", "")
+    match = re.search(r'db;dur=[\d.]+;desc="(\d+) queries"', header)
+    assert match, (
+        "Убедитесь, что ответ содержит заголовок Server-Timing"
+        " со временем и количеством запросов к базе."
+    )
+    assert int(match.group(1)) == len(queries)
+    assert re.search(r"tpl;dur=[\d.]+", header)
+    assert re.search(r"total;dur=[\d.]+", header)
+
+    (sample,) = [
+        json.loads(line) for line in timing_log.read_text().splitlines()
+    ]
+    assert sample["view"] == "blog:index", (
+        "Убедитесь, что замеры сохраняются с именем URL."
+    )
+    assert sample["queries"] == len(queries)
+    assert sample["template_ms"] > 0
+
+
+def test_instrumentation_disabled_by_default(client: Client):
+    assert not client.get("/").has_header("Server-Timing")
+
+
+def test_timing_report(
+    client: Client, capsys, timing_log, post_with_published_location
+):
+    for _ in range(3):
+        client.get("/")
+    client.get(f"/posts/{post_with_published_location.id}/")
+    call_command("timing_report", percentiles="50,95")
+    lines = capsys.readouterr().out.splitlines()
+    assert lines[0].startswith("view\tcount\ttotal_ms_p50\ttotal_ms_p95")
+    counts = dict(line.split("\t")[:2] for line in lines[1:])
+    assert counts == {"blog:index": "3", "blog:post_detail": "1"}, (
+        "Убедитесь, что команда `timing_report` группирует замеры"
+        " по именам URL."
+    )
+
+
+@pytest.mark.parametrize("percentiles", ["50,x", "", "0,50", "50,101"])
+def test_timing_report_rejects_bad_percentiles(timing_log, percentiles):
+    with pytest.raises(CommandError):
+        call_command("timing_report", percentiles=percentiles)
+
+
+def test_percentile():
+    values = list(range(1, 101))
+    assert percentile(values, 50) == 50
+    assert percentile(values, 99) == 99
+    assert percentile([7], 90) == 7
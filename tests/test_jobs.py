@@ -0,0 +1,119 @@
+from datetime import timedelta
+
+import pytest
+from core.jobs import claim_jobs, enqueue, run_job, task, work
+from core.models import Job
+from django.core import mail
+from django.core.management import call_command
+from django.test import override_settings
+from django.utils import timezone
+
+pytestmark = [pytest.mark.django_db]
+
+calls = []
+
+
+@task("tests.record")
+def record(value):
+    calls.append(value)
+
+
+@task("tests.fail")
+def fail():
+    raise ValueError("Ошибка задачи")
+
+
+@pytest.fixture(autouse=True)
+def clear_calls():
+    calls.clear()
+
+
+def test_jobs_run_by_worker():
+    record.enqueue(value=1)
+    enqueue("tests.record", {"value": 2})
+    assert calls == [], "Убедитесь, что задачи ставятся в очередь."
+
+    call_command("run_jobs", once=True)
+    assert calls == [1, 2], (
+        "Убедитесь, что команда `run_jobs` выполняет задачи в порядке"
+        " постановки в очередь."
+    )
+    assert not Job.objects.exists(), (
+        "Убедитесь, что выполненные задачи удаляются из очереди."
+    )
+
+
+def test_delayed_job_waits():
+    enqueue("tests.record", {"value": 1}, delay=60)
+    assert work(once=True) == 0
+    assert calls == []
+
+
+def test_failed_job_retried_then_failed(settings):
+    settings.JOBS_MAX_ATTEMPTS = 2
+    job = enqueue("tests.fail")
+
+    assert work(once=True) == 0
+    job.refresh_from_db()
+    assert job.status == Job.Status.PENDING, (
+        "Убедитесь, что упавшая задача возвращается в очередь."
+    )
+    assert job.run_at > timezone.now()
+    assert "Ошибка задачи" in job.last_error
+
+    Job.objects.filter(pk=job.pk).update(run_at=timezone.now())
+    work(once=True)
+    job.refresh_from_db()
+    assert job.status == Job.Status.FAILED, (
+        "Убедитесь, что после исчерпания попыток задача получает"
+        " статус «Ошибка»."
+    )
+    assert job.attempts == 2
+
+
+def test_visibility_timeout_returns_job():
+    enqueue("tests.record", {"value": 1})
+    (job,) = claim_jobs(10, visibility_timeout=60)
+    assert claim_jobs(10) == [], (
+        "Убедитесь, что захваченная задача не выдаётся другим"
+        " обработчикам."
+    )
+
+    Job.objects.filter(pk=job.pk).update(
+        locked_until=timezone.now() - timedelta(seconds=1)
+    )
+    (reclaimed,) = claim_jobs(10)
+    assert reclaimed.pk == job.pk, (
+        "Убедитесь, что задача возвращается в очередь по истечении"
+        " тайм-аута видимости."
+    )
+    assert reclaimed.attempts == 2
+
+    assert not run_job(job), (
+        "Убедитесь, что обработчик, не уложившийся в тайм-аут,"
+        " не завершает перехваченную задачу."
+    )
+    assert Job.objects.filter(pk=job.pk).exists()
+    assert run_job(reclaimed)
+    assert calls == [1, 1]
+    assert not Job.objects.exists()
+
+
+def test_eager_mode(settings):
+    settings.JOBS_EAGER = True
+    assert enqueue("tests.record", {"value": 1}) is None
+    assert calls == [1]
+    assert not Job.objects.exists()
+
+
+@override_settings(
+    EMAIL_BACKEND="core.mail.QueuedEmailBackend",
+    JOBS_EMAIL_BACKEND="django.core.mail.backends.locmem.EmailBackend",
+)
+def test_queued_email_backend():
+    mail.send_mail("Тема", "Текст", "from@example.com", ["to@example.com"])
+    assert mail.outbox == [], (
+        "Убедитесь, что письма отправляются через очередь задач."
+    )
+    work(once=True)
+    assert [message.subject for message in mail.outbox] == ["Тема"]
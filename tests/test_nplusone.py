@@ -0,0 +1,60 @@
+import pytest
+from blog import views
+from blog.models import Post
+from core.nplusone import (NPlusOneError, NPlusOneWarning, detect_n_plus_one,
+                           fingerprint)
+from django.test.client import Client
+from mixer.backend.django import Mixer
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def feed_without_joins(monkeypatch):
+    def feed_queryset(category=None, **kwargs):
+        return Post.objects.filter(category=category).order_by("-pub_date")
+
+    monkeypatch.setattr(views, "feed_queryset", feed_queryset)
+
+
+@pytest.fixture
+def category_posts(mixer: Mixer, published_category, published_location):
+    return mixer.cycle(6).blend(
+        "blog.Post", category=published_category, location=published_location
+    )
+
+
+@pytest.mark.usefixtures("feed_without_joins", "category_posts")
+def test_n_plus_one_in_view_raises(client: Client, published_category):
+    with pytest.raises(NPlusOneError) as error:
+        client.get(f"/category/{published_category.slug}/")
+    message = str(error.value)
+    assert "includes/post_card.html:" in message, (
+        "Убедитесь, что N+1 запросы связываются со строкой шаблона."
+    )
+    assert "blog/views.py:" in message, (
+        "Убедитесь, что N+1 запросы связываются со строкой кода"
+        " представления."
+    )
+
+
+@pytest.mark.usefixtures("category_posts")
+def test_warn_mode(published_category):
+    with pytest.warns(NPlusOneWarning):
+        with detect_n_plus_one("посты", mode="warn", threshold=3):
+            for post in Post.objects.all():
+                post.author.username
+
+
+@pytest.mark.usefixtures("category_posts")
+def test_below_threshold_passes(published_category):
+    with detect_n_plus_one(mode="raise", threshold=10) as log:
+        for post in Post.objects.all():
+            post.author.username
+    assert max(log.counts.values()) == 6
+
+
+def test_fingerprint_ignores_in_list_length():
+    assert fingerprint("SELECT * FROM t WHERE id IN (%s, %s)") == (
+        fingerprint("SELECT * FROM t WHERE id IN (%s)")
+    )
@@ -0,0 +1,148 @@
+import pytest
+from conftest import page_urls
+from blog.checks import check_shared_cache
+from blog.models import Comment
+from django.db import connection
+from django.test import override_settings
+from django.test.client import Client
+from django.test.utils import CaptureQueriesContext
+from mixer.backend.django import Mixer
+
+pytestmark = [
+    pytest.mark.django_db,
+    pytest.mark.usefixtures("page_cache_enabled"),
+]
+
+
+@pytest.fixture
+def page_cache_enabled():
+    with override_settings(BLOG_PAGE_CACHE_TIMEOUT=60):
+        yield
+
+
+def test_anonymous_pages_cached(
+    client: Client, django_assert_num_queries, post_with_published_location
+):
+    post = post_with_published_location
+    for url in page_urls(post, profile=False):
+        response = client.get(url)
+        assert "Cookie" in response["Vary"]
+        assert "public" in response["Cache-Control"], (
+            "Убедитесь, что кэшируемые страницы разрешают кэширование"
+            " промежуточным прокси."
+        )
+        # Единственный запрос — валидаторы условного GET-запроса.
+        with django_assert_num_queries(1):
+            cached_response = client.get(url)
+        assert cached_response.content == response.content, (
+            f"Убедитесь, что страница `{url}` для анонимных пользователей"
+            " отдаётся из кэша."
+        )
+
+
+def test_authenticated_pages_not_cached(
+    client: Client, user_client: Client, post_with_published_location
+):
+    post = post_with_published_location
+    for url in page_urls(post, profile=False):
+        client.get(url)
+        response = user_client.get(url)
+        assert "Выйти" in response.content.decode("utf-8"), (
+            "Убедитесь, что авторизованным пользователям не отдаются"
+            " страницы из кэша анонимных пользователей."
+        )
+        assert "private" in response["Cache-Control"]
+
+
+def test_content_changes_purge_pages(
+    client: Client, user_client: Client, post_with_published_location
+):
+    post = post_with_published_location
+    for url in page_urls(post, profile=False):
+        client.get(url)
+
+    post.title = "Новый заголовок"
+    post.save()
+    for url in page_urls(post, profile=False):
+        assert "Новый заголовок" in client.get(url).content.decode("utf-8"), (
+            f"Убедитесь, что кэш страницы `{url}` сбрасывается"
+            " при изменении публикации."
+        )
+
+    user_client.post(f"/posts/{post.id}/comment/", {"text": "Новый отзыв"})
+    assert "Новый отзыв" in client.get(
+        f"/posts/{post.id}/"
+    ).content.decode("utf-8"), (
+        "Убедитесь, что кэш страницы публикации сбрасывается"
+        " при добавлении комментария."
+    )
+    assert "Комментарии (1)" in client.get("/").content.decode("utf-8")
+
+    comment = Comment.objects.get(post=post)
+    user_client.post(f"/posts/{post.id}/delete_comment/{comment.id}/")
+    assert "Новый отзыв" not in client.get(
+        f"/posts/{post.id}/"
+    ).content.decode("utf-8"), (
+        "Убедитесь, что кэш страницы публикации сбрасывается"
+        " при удалении комментария."
+    )
+
+
+def test_admin_comment_delete_purges_pages(
+    client: Client, admin_client: Client, mixer: Mixer,
+    post_with_published_location
+):
+    post = post_with_published_location
+    comment = mixer.blend("blog.Comment", post=post, text="Старый отзыв")
+    client.get(f"/posts/{post.id}/")
+    admin_client.post("/admin/blog/comment/", {
+        "action": "delete_selected",
+        "_selected_action": [comment.id],
+        "post": "yes",
+    })
+    assert "Старый отзыв" not in client.get(
+        f"/posts/{post.id}/"
+    ).content.decode("utf-8"), (
+        "Убедитесь, что удаление комментариев из админки"
+        " сбрасывает кэш страницы публикации."
+    )
+
+
+def test_post_delete_queries_constant(mixer: Mixer, user):
+    def delete_queries(comments):
+        post = mixer.blend("blog.Post", author=user)
+        mixer.cycle(comments).blend("blog.Comment", post=post)
+        with CaptureQueriesContext(connection) as queries:
+            post.delete()
+        return len(queries)
+
+    assert delete_queries(10) == delete_queries(1), (
+        "Убедитесь, что количество запросов при удалении публикации"
+        " не зависит от количества её комментариев."
+    )
+
+
+def test_page_params_in_cache_key(
+    client: Client, many_posts_with_published_locations
+):
+    first_page = client.get("/").content
+    second_page = client.get("/?page=2").content
+    assert first_page != second_page
+    assert client.get("/?page=2&utm=1").content == second_page
+
+
+def test_page_cache_requires_shared_cache():
+    assert check_shared_cache(None) == [], (
+        "Убедитесь, что в настройках указан общий для процессов кэш."
+    )
+    local = {"default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    }}
+    with override_settings(CACHES=local):
+        errors = check_shared_cache(None)
+        assert [error.id for error in errors] == ["blog.E001"], (
+            "Убедитесь, что кэш страниц с кэшем процесса"
+            " отклоняется проверкой настроек."
+        )
+        with override_settings(BLOG_PAGE_CACHE_TIMEOUT=0):
+            assert [w.id for w in check_shared_cache(None)] == ["blog.W001"]
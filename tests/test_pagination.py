@@ -0,0 +1,80 @@
+from datetime import datetime, timedelta
+
+import pytest
+import pytz
+from blog.constants import NUMBERED_PAGES_LIMIT
+from conftest import N_PER_PAGE
+from django.test.client import Client
+from mixer.backend.django import Mixer
+
+pytestmark = [pytest.mark.django_db]
+
+N_POSTS = N_PER_PAGE * NUMBERED_PAGES_LIMIT + 5
+
+
+@pytest.fixture
+def lots_of_posts(mixer: Mixer, user, published_category):
+    pub_dates = (
+        datetime.now(tz=pytz.UTC) - timedelta(days=1, minutes=i // 2)
+        for i in range(1, N_POSTS + 1)
+    )
+    return mixer.cycle(N_POSTS).blend(
+        "blog.Post",
+        author=user,
+        category=published_category,
+        is_published=True,
+        pub_date=pub_dates,
+    )
+
+
+def test_cursor_pagination_walks_feed(client: Client, lots_of_posts):
+    expected_ids = [
+        post.id for post in sorted(
+            lots_of_posts, key=lambda p: (p.pub_date, p.id), reverse=True
+        )
+    ]
+    page_obj = client.get("/").context["page_obj"]
+    assert getattr(page_obj, "is_cursor", False), (
+        "Убедитесь, что для больших лент используется курсорная пагинация."
+    )
+    assert not page_obj.has_previous()
+
+    seen_ids = [post.id for post in page_obj]
+    pages = [page_obj]
+    while page_obj.has_next():
+        page_obj = client.get(
+            f"/?after={page_obj.next_cursor}"
+        ).context["page_obj"]
+        seen_ids.extend(post.id for post in page_obj)
+        pages.append(page_obj)
+    assert seen_ids == expected_ids, (
+        "Убедитесь, что курсорная пагинация выдаёт все публикации"
+        " без пропусков и повторов, «от новых к старым»."
+    )
+
+    previous_page = client.get(
+        f"/?before={pages[-1].previous_cursor}"
+    ).context["page_obj"]
+    assert [post.id for post in previous_page] == [
+        post.id for post in pages[-2]
+    ], "Убедитесь, что курсор `before` возвращает предыдущую страницу."
+
+
+def test_invalid_cursor_falls_back_to_first_page(
+    client: Client, lots_of_posts
+):
+    response = client.get("/?after=not-a-cursor")
+    assert response.status_code == 200
+    first_page = client.get("/").context["page_obj"]
+    assert [post.id for post in response.context["page_obj"]] == [
+        post.id for post in first_page
+    ]
+
+
+def test_numbered_pagination_kept_for_small_feeds(
+    client: Client, many_posts_with_published_locations
+):
+    page_obj = client.get("/").context["page_obj"]
+    assert not getattr(page_obj, "is_cursor", False)
+    assert page_obj.paginator.num_pages == 2
+    assert len(client.get("/?page=2").context["page_obj"]) == N_PER_PAGE
@@ -0,0 +1,70 @@
+import pytest
+from blog.models import Post
+from django.test.client import Client
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_post_card_fragment_is_cached(
+    client: Client, post_with_published_location
+):
+    post = post_with_published_location
+    assert post.title in client.get("/").content.decode("utf-8")
+
+    Post.objects.filter(pk=post.pk).update(title="Заголовок в обход кэша")
+    assert "Заголовок в обход кэша" not in (
+        client.get("/").content.decode("utf-8")
+    ), "Убедитесь, что карточка публикации берётся из кэша фрагментов."
+
+    post.title = "Новый заголовок"
+    post.save()
+    assert "Новый заголовок" in client.get("/").content.decode("utf-8"), (
+        "Убедитесь, что кэш карточки сбрасывается при изменении публикации."
+    )
+
+
+def test_post_card_reset_by_related_changes(
+    client: Client, user_client: Client, post_with_published_location
+):
+    post = post_with_published_location
+    client.get("/")
+
+    user_client.post(f"/posts/{post.id}/comment/", {"text": "Комментарий"})
+    assert "Комментарии (1)" in client.get("/").content.decode("utf-8"), (
+        "Убедитесь, что кэш карточки сбрасывается при добавлении"
+        " комментария."
+    )
+
+    post.category.title = "Переименованная категория"
+    post.category.save()
+    post.location.name = "Переименованное место"
+    post.location.save()
+    content = client.get("/").content.decode("utf-8")
+    assert "Переименованная категория" in content, (
+        "Убедитесь, что кэш карточки сбрасывается при изменении категории."
+    )
+    assert "Переименованное место" in content, (
+        "Убедитесь, что кэш карточки сбрасывается при изменении"
+        " местоположения."
+    )
+
+
+def test_post_version_follows_changes(
+    user_client: Client, post_with_published_location
+):
+    post = post_with_published_location
+    version = post.version
+    assert post.updated_at >= post.created_at
+
+    user_client.post(f"/posts/{post.id}/comment/", {"text": "Комментарий"})
+    post.refresh_from_db()
+    assert post.version > version, (
+        "Убедитесь, что добавление комментария обновляет"
+        " `updated_at` публикации."
+    )
+
+    version = post.version
+    post.save()
+    assert post.version > version, (
+        "Убедитесь, что сохранение публикации обновляет `updated_at`."
+    )
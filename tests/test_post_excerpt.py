@@ -0,0 +1,85 @@
+from importlib import import_module
+
+import pytest
+from blog.models import Post
+from django.apps import apps
+from django.core.management import call_command
+from django.test.client import Client
+
+pytestmark = [pytest.mark.django_db]
+
+TEXT = "Первая строка <b>текста</b>\nвторая строка " + "слово " * 20
+
+
+def test_excerpt_and_html_rendered_on_save(post_with_published_location):
+    post = post_with_published_location
+    post.text = TEXT
+    post.save()
+    assert post.excerpt == (
+        "Первая строка <b>текста</b> вторая строка слово слово"
+        " слово слово слово …"
+    ), "Убедитесь, что при сохранении публикации заполняется анонс."
+    assert post.text_html.startswith(
+        "Первая строка &lt;b&gt;текста&lt;/b&gt;<br>вторая строка"
+    ), "Убедитесь, что при сохранении публикации заполняется её HTML."
+
+    post.text = "Новый текст"
+    post.save(update_fields=["text"])
+    post.refresh_from_db()
+    assert post.excerpt == "Новый текст"
+    assert post.text_html == "Новый текст"
+
+
+def test_pages_output_stored_text(
+    client: Client, post_with_published_location
+):
+    post = post_with_published_location
+    Post.objects.filter(pk=post.pk).update(
+        excerpt="Сохранённый анонс", text_html="<p>Сохранённый HTML</p>"
+    )
+    assert "Сохранённый анонс" in client.get("/").content.decode("utf-8")
+    assert "<p>Сохранённый HTML</p>" in client.get(
+        f"/posts/{post.id}/"
+    ).content.decode("utf-8")
+
+
+def test_render_post_texts_command(post_with_published_location):
+    post = post_with_published_location
+    Post.objects.filter(pk=post.pk).update(
+        text=TEXT, excerpt="", text_html=""
+    )
+    call_command("render_post_texts", chunk_size=1, missing=True)
+    post.refresh_from_db()
+    assert post.excerpt.startswith("Первая строка"), (
+        "Убедитесь, что команда `render_post_texts` заполняет анонсы"
+        " публикаций."
+    )
+    assert "<br>" in post.text_html
+
+
+def test_render_post_texts_bumps_version(post_with_published_location):
+    post = post_with_published_location
+    version = post.version
+    Post.objects.filter(pk=post.pk).update(excerpt="", text_html="")
+    call_command("render_post_texts")
+    post.refresh_from_db()
+    assert post.version > version, (
+        "Убедитесь, что команда `render_post_texts` обновляет `updated_at`:"
+        " иначе в кэше остаются карточки со старым анонсом."
+    )
+
+
+def test_migration_fills_existing_posts(
+    client: Client, django_assert_max_num_queries,
+    many_posts_with_published_locations
+):
+    Post.objects.update(text=TEXT, excerpt="", text_html="")
+    migration = import_module("blog.migrations.0009_post_excerpt_text_html")
+    migration.fill_post_texts(apps, None)
+    assert not Post.objects.filter(excerpt="").exists(), (
+        "Убедитесь, что миграция заполняет анонсы существующих публикаций."
+    )
+    assert not Post.objects.filter(text_html="").exists()
+    with django_assert_max_num_queries(6):
+        content = client.get("/").content.decode("utf-8")
+    assert "Первая строка" in content
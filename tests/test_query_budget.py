@@ -0,0 +1,105 @@
+import pytest
+from blog.models import Post
+from django.core.cache import cache
+from django.db import connection
+from django.test.client import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from mixer.backend.django import Mixer
+
+pytestmark = [pytest.mark.django_db]
+
+# Размеры данных, на которых проверяется бюджет: количество публикаций
+# автора в категории и количество комментариев к публикации.
+FIXTURE_SIZES = (1, 12, 40)
+SEARCH_WORD = "Бюджет"
+
+# Бюджет запросов к базе на страницу при пустом кэше:
+# (имя URL, роль) — максимальное количество запросов.
+# Количество запросов не должно расти вместе с данными.
+# Страницы с условными GET-запросами тратят один запрос
+# на валидаторы ETag и Last-Modified (одна строка по индексу).
+QUERY_BUDGETS = {
+    ("blog:index", "anonymous"): 5,
+    ("blog:index", "author"): 7,
+    ("blog:category_posts", "anonymous"): 6,
+    ("blog:category_posts", "author"): 8,
+    ("blog:profile", "anonymous"): 6,
+    ("blog:profile", "author"): 8,
+    ("blog:post_detail", "anonymous"): 3,
+    ("blog:post_detail", "author"): 5,
+    ("blog:post_comments", "anonymous"): 3,
+    ("blog:post_comments", "author"): 5,
+    ("blog:search", "anonymous"): 2,
+    ("blog:search", "author"): 4,
+    ("blog:create_post", "author"): 4,
+    ("blog:edit_post", "author"): 7,
+    ("blog:delete_post", "author"): 4,
+    ("blog:edit_comment", "author"): 4,
+    ("blog:delete_comment", "author"): 4,
+    ("blog:edit_profile", "author"): 2,
+}
+
+
+def page_url(name, post, comment):
+    if name in ("blog:index", "blog:create_post"):
+        return reverse(name)
+    if name == "blog:search":
+        return f"{reverse(name)}?q={SEARCH_WORD}"
+    if name == "blog:category_posts":
+        return reverse(name, args=(post.category.slug,))
+    if name in ("blog:profile", "blog:edit_profile"):
+        return reverse(name, args=(post.author.username,))
+    if name in ("blog:edit_comment", "blog:delete_comment"):
+        return reverse(name, args=(post.pk, comment.pk))
+    return reverse(name, args=(post.pk,))
+
+
+def grow_fixture(mixer: Mixer, post, size):
+    """
+    Доводит количество публикаций автора в категории
+    и количество комментариев к публикации до `size`.
+    """
+    posts = Post.objects.filter(author=post.author).count()
+    mixer.cycle(max(size - posts, 0)).blend(
+        "blog.Post",
+        title=(f"{SEARCH_WORD} {number}" for number in range(posts, size)),
+        category=post.category,
+        author=post.author,
+        location=post.location,
+        pub_date=post.pub_date,
+    )
+    comments = post.comments.count()
+    mixer.cycle(max(size - comments, 0)).blend("blog.Comment", post=post)
+
+
+@pytest.mark.parametrize(("name", "role"), QUERY_BUDGETS)
+def test_query_budget(
+    name, role, mixer: Mixer, client: Client, user_client: Client,
+    post_with_published_location
+):
+    post = post_with_published_location
+    post.title = SEARCH_WORD
+    post.save()
+    comment = mixer.blend("blog.Comment", post=post, author=post.author)
+    url = page_url(name, post, comment)
+    request_client = user_client if role == "author" else client
+    budget = QUERY_BUDGETS[name, role]
+
+    counts = []
+    for size in FIXTURE_SIZES:
+        grow_fixture(mixer, post, size)
+        cache.clear()
+        with CaptureQueriesContext(connection) as queries:
+            response = request_client.get(url)
+        assert response.status_code == 200
+        assert len(queries) <= budget, (
+            f"Страница `{url}` ({role}) выполняет {len(queries)} запросов"
+            f" к базе при бюджете {budget}:\n"
+            + "\n".join(query["sql"] for query in queries.captured_queries)
+        )
+        counts.append(len(queries))
+    assert len(set(counts)) == 1, (
+        f"Убедитесь, что количество запросов страницы `{url}` ({role})"
+        f" не зависит от количества данных: {counts}."
+    )
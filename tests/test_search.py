@@ -0,0 +1,107 @@
+from datetime import timedelta
+
+import pytest
+from blog.models import Post
+from django.core.management import call_command
+from django.db import connection
+from django.test.client import Client
+from django.utils import timezone
+from mixer.backend.django import Mixer
+
+pytestmark = [
+    pytest.mark.django_db,
+    pytest.mark.skipif(connection.vendor != "sqlite", reason="SQLite FTS5"),
+]
+
+
+@pytest.fixture
+def searchable_posts(mixer: Mixer, user, published_category):
+    def blend(title, text, **kwargs):
+        return mixer.blend(
+            "blog.Post",
+            title=title,
+            text=text,
+            author=user,
+            category=published_category,
+            is_published=kwargs.pop("is_published", True),
+            pub_date=kwargs.pop("pub_date", timezone.now()),
+            **kwargs,
+        )
+
+    return {
+        "in_text": blend("Прогулка", "Мы видели <b>ёжиков</b> в лесу."),
+        "in_title": blend("Ёжики в тумане", "Рассказ о прогулке."),
+        "hidden": blend("Скрытые ёжики", "Текст", is_published=False),
+        "delayed": blend(
+            "Ёжики завтра", "Текст",
+            pub_date=timezone.now() + timedelta(days=1),
+        ),
+        "other": blend("Про котов", "Ни слова о нужном."),
+    }
+
+
+def search(client: Client, query: str):
+    response = client.get("/search/", {"q": query})
+    return response, [post.id for post in response.context["page_obj"]]
+
+
+def test_search_ranks_visible_posts(client: Client, searchable_posts):
+    response, found = search(client, "ЁЖИК")
+    assert found == [
+        searchable_posts["in_title"].id, searchable_posts["in_text"].id
+    ], (
+        "Убедитесь, что поиск находит опубликованные записи по префиксу"
+        " слова без учёта регистра, а совпадения в"
+        " заголовке ранжируются выше."
+    )
+    content = response.content.decode("utf-8")
+    assert "&lt;b&gt;<mark>ёжиков</mark>&lt;/b&gt;" in content, (
+        "Убедитесь, что в результатах выводится экранированный фрагмент"
+        " текста с выделенным совпадением."
+    )
+
+
+def test_search_index_follows_changes(client: Client, searchable_posts):
+    post = searchable_posts["other"]
+    post.text = "Теперь и про ёжиков."
+    post.save()
+    assert post.id in search(client, "ёжиков")[1], (
+        "Убедитесь, что поисковый индекс обновляется при изменении"
+        " публикации."
+    )
+    post.delete()
+    assert post.id not in search(client, "ёжиков")[1]
+
+
+def test_search_query_syntax_is_not_interpreted(
+    client: Client, searchable_posts
+):
+    response, found = search(client, '"ёжик*" (^: -')
+    assert response.status_code == 200
+    assert found == [
+        searchable_posts["in_title"].id, searchable_posts["in_text"].id
+    ]
+    assert search(client, "   ")[1] == []
+
+
+def test_rebuild_search_index(client: Client, searchable_posts):
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "INSERT INTO blog_post_search(blog_post_search)"
+            " VALUES ('delete-all')"
+        )
+    assert search(client, "ЁЖИК")[1] == []
+    call_command("rebuild_search_index")
+    assert len(search(client, "ЁЖИК")[1]) == 2, (
+        "Убедитесь, что команда `rebuild_search_index` перестраивает"
+        " поисковый индекс."
+    )
+    assert Post.objects.count() == 5
+
+
+def test_admin_search_uses_index(admin_client: Client, searchable_posts):
+    response = admin_client.get("/admin/blog/post/", {"q": "прогулк"})
+    found = {post.id for post in response.context["cl"].result_list}
+    assert found == {
+        searchable_posts["in_text"].id, searchable_posts["in_title"].id
+    }, "Убедитесь, что поиск в админке ищет по заголовку и тексту."
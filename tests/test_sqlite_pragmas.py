@@ -0,0 +1,131 @@
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+import pytest
+from core.db import immediate_atomic
+from django.contrib.auth import get_user_model
+from django.db import connection, connections, transaction
+from django.test.client import Client
+from mixer.backend.django import Mixer
+
+pytestmark = [pytest.mark.django_db(transaction=True)]
+
+N_WRITERS = 8
+N_COMMENTS_PER_WRITER = 10
+
+
+@contextmanager
+def file_database(path):
+    """
+    Копия тестовой базы в файле: журнал WAL и блокировки
+    работают только для файловой базы. Новые соединения,
+    в том числе из других потоков, открываются к копии.
+    """
+    connection.ensure_connection()
+    target = sqlite3.connect(path)
+    connection.connection.backup(target)
+    target.close()
+    settings_dict = connections.databases["default"]
+    name = settings_dict["NAME"]
+    settings_dict["NAME"] = str(path)
+    try:
+        yield
+    finally:
+        settings_dict["NAME"] = name
+
+
+def own_connection(func):
+    """Закрывает соединения потока после выполнения `func`."""
+    def wrapper(*args):
+        try:
+            return func(*args)
+        finally:
+            connections.close_all()
+    return wrapper
+
+
+def test_pragmas_applied():
+    with connection.cursor() as cursor:
+        cursor.execute("PRAGMA busy_timeout")
+        assert cursor.fetchone()[0] == 5000, (
+            "Убедитесь, что при подключении к SQLite"
+            " выполняются прагмы из настройки `SQLITE_PRAGMAS`."
+        )
+
+
+def test_immediate_atomic_takes_write_lock(tmp_path):
+    path = tmp_path / "db.sqlite3"
+
+    def write_locked():
+        other = sqlite3.connect(path, timeout=0)
+        try:
+            other.execute("BEGIN IMMEDIATE")
+        except sqlite3.OperationalError:
+            return True
+        finally:
+            other.close()
+        return False
+
+    @own_connection
+    def locked_inside(atomic):
+        with atomic():
+            connection.cursor().execute("SELECT 1")
+            return write_locked()
+
+    with file_database(path), ThreadPoolExecutor(max_workers=1) as executor:
+        assert executor.submit(locked_inside, immediate_atomic).result(), (
+            "Убедитесь, что immediate_atomic начинает транзакцию SQLite"
+            " с блокировкой записи (BEGIN IMMEDIATE)."
+        )
+        assert not executor.submit(
+            locked_inside, transaction.atomic
+        ).result(), (
+            "Убедитесь, что обычные транзакции остаются отложенными"
+            " и не берут блокировку записи."
+        )
+
+
+def test_concurrent_comments(
+    tmp_path, mixer: Mixer, post_with_published_location
+):
+    post = post_with_published_location
+    clients = []
+    for user in mixer.cycle(N_WRITERS).blend(get_user_model()):
+        client = Client()
+        client.force_login(user)
+        clients.append(client)
+    url = f"/posts/{post.id}/comment/"
+
+    @own_connection
+    def journal_mode():
+        with connection.cursor() as cursor:
+            cursor.execute("PRAGMA journal_mode")
+            return cursor.fetchone()[0]
+
+    @own_connection
+    def write_comments(client):
+        for number in range(N_COMMENTS_PER_WRITER):
+            client.post(url, {"text": f"Комментарий {number}"})
+
+    @own_connection
+    def written():
+        post.refresh_from_db()
+        return post.comments.count(), post.comment_count
+
+    with file_database(tmp_path / "db.sqlite3"), ThreadPoolExecutor(
+        max_workers=N_WRITERS
+    ) as executor:
+        assert executor.submit(journal_mode).result() == "wal", (
+            "Убедитесь, что для базы SQLite включается режим журнала WAL."
+        )
+        futures = [
+            executor.submit(write_comments, client) for client in clients
+        ]
+        for future in futures:
+            future.result()
+        expected = N_WRITERS * N_COMMENTS_PER_WRITER
+        assert executor.submit(written).result() == (expected, expected), (
+            "Убедитесь, что одновременная запись комментариев"
+            " из нескольких потоков не теряет изменения."
+        )